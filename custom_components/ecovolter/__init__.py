@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.const import Platform
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.loader import async_get_loaded_integration
 
-from .api import EcovolterApiClient
+from .api import EcovolterApiClient, EcovolterApiClientError
 from .const import (
     DOMAIN,
     LOGGER,
@@ -17,17 +19,48 @@ from .const import (
     CONF_SERIAL_NUMBER,
     CONF_BASE_URI,
     CONF_UPDATE_INTERVAL,
+    CONF_SURPLUS_ENTITY,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_TIMEOUT,
+    CONF_STATISTICS_MODE,
+    CONF_SUPPLY_GROUP,
+    CONF_SUPPLY_LIMIT,
+    CONF_TELEMETRY,
+    CONF_IO_WORKER,
     DEFAULT_UPDATE_INTERVAL_SECONDS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_TIMEOUT_SECONDS,
     MIN_UPDATE_INTERVAL_SECONDS,
 )
 from .coordinator import EcovolterDataUpdateCoordinator
 from .data import EcovolterData
+from .fleet import async_join_supply_group
+from .io_worker import async_acquire_io_worker
+from .replay import async_create_replay_client, is_replay_uri
+from .rollup import RollupStore
+from .services import async_setup_services
+from .session import ChargingSessionTracker
+from .statistics import StatisticsAggregator
+from .surplus import SurplusController
 from .utils import as_int
+from .websocket_api import async_setup_websocket_api
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
     from .data import EcovolterConfigEntry
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Options whose change needs the entry to be set up again
+RELOAD_OPTIONS = (
+    CONF_IO_WORKER,
+    CONF_STATISTICS_MODE,
+    CONF_SUPPLY_GROUP,
+    CONF_SURPLUS_ENTITY,
+    CONF_TELEMETRY,
+)
+
 PLATFORMS: list[Platform] = [
     Platform.SWITCH,
     Platform.NUMBER,
@@ -37,14 +70,15 @@ PLATFORMS: list[Platform] = [
 ]
 
 
-# https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
-async def async_setup_entry(
-    hass: HomeAssistant,
-    entry: EcovolterConfigEntry,
-) -> bool:
-    """Set up this integration using UI."""
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the domain services and websocket commands shared by all chargers."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
 
-    # 1) Resolve the polling interval (options > data > default)
+
+def _update_interval(entry: EcovolterConfigEntry) -> timedelta:
+    """Resolve the polling interval (options > data > default)."""
     raw_interval = entry.options.get(
         CONF_UPDATE_INTERVAL,
         entry.data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL_SECONDS),
@@ -53,36 +87,95 @@ async def async_setup_entry(
 
     # Clamp to a sensible minimum
     interval_seconds = max(interval_seconds, MIN_UPDATE_INTERVAL_SECONDS)
+    return timedelta(seconds=int(interval_seconds))
+
+
+def _client_options(entry: EcovolterConfigEntry) -> dict[str, Any]:
+    """Return the client settings that can change at runtime."""
+    return {
+        "max_concurrent_requests": int(
+            entry.options.get(
+                CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+            )
+        ),
+        "timeout": float(
+            entry.options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT_SECONDS)
+        ),
+    }
+
+
+# https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: EcovolterConfigEntry,
+) -> bool:
+    """Set up this integration using UI."""
 
+    # 1) Create the coordinator with the resolved polling interval
     coordinator = EcovolterDataUpdateCoordinator(
         hass=hass,
         logger=LOGGER,
+        config_entry=entry,
         name=DOMAIN,
-        update_interval=timedelta(seconds=int(interval_seconds)),
+        update_interval=_update_interval(entry),
     )
 
-    # 2) Build the API client (base_uri is optional → .get)
-    client = EcovolterApiClient(
-        serial_number=entry.data[CONF_SERIAL_NUMBER],
-        secret_key=entry.data[CONF_SECRET_KEY],
-        base_uri=entry.data.get(CONF_BASE_URI),
-        session=async_get_clientsession(hass),
-    )
+    # 2) Build the API client (base_uri is optional → .get); a replay URI
+    # serves recorded telemetry instead of a charger, the I/O worker (if
+    # enabled) polls the charger from its own thread
+    base_uri = entry.data.get(CONF_BASE_URI)
+    client: EcovolterApiClient
+    if is_replay_uri(base_uri):
+        try:
+            client = await async_create_replay_client(
+                hass,
+                entry.data[CONF_SERIAL_NUMBER],
+                base_uri,
+                session=async_get_clientsession(hass),
+                **_client_options(entry),
+            )
+        except EcovolterApiClientError as exception:
+            raise ConfigEntryNotReady(exception) from exception
+    else:
+        client = EcovolterApiClient(
+            serial_number=entry.data[CONF_SERIAL_NUMBER],
+            secret_key=entry.data[CONF_SECRET_KEY],
+            base_uri=base_uri,
+            session=async_get_clientsession(hass),
+            worker=async_acquire_io_worker(hass, entry)
+            if entry.options.get(CONF_IO_WORKER)
+            else None,
+            **_client_options(entry),
+        )
 
     # 3) Stash runtime objects for platforms
     entry.runtime_data = EcovolterData(
         client=client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        applied_data=dict(entry.data),
+        applied_options=dict(entry.options),
     )
 
-    # 4) First refresh, then set up platforms
+    # 4) Restore charging sessions and the running hour, start the telemetry
+    # log, first refresh, then set up platforms
+    await coordinator.sessions.async_load()
+    await coordinator.rollup.async_load()
+    if coordinator.statistics is not None:
+        await coordinator.statistics.async_load()
+    if coordinator.telemetry is not None:
+        coordinator.telemetry.async_start(entry)
     # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
     await coordinator.async_config_entry_first_refresh()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # 5) Reload the entry if options change (eg. user tweaks interval)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    # 5) Start the shared supply and surplus control loops (if configured)
+    async_join_supply_group(hass, entry)
+    if entry.options.get(CONF_SURPLUS_ENTITY):
+        SurplusController(hass, entry).async_start()
+
+    # 6) Apply option changes live, reload only when needed
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
@@ -92,12 +185,57 @@ async def async_unload_entry(
     entry: EcovolterConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
+    coordinator = entry.runtime_data.coordinator
+    await coordinator.sessions.async_flush()
+    await coordinator.rollup.async_flush()
+    if coordinator.statistics is not None:
+        await coordinator.statistics.async_flush()
+    if coordinator.telemetry is not None:
+        await coordinator.telemetry.async_flush()
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
-async def async_reload_entry(
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: EcovolterConfigEntry,
+) -> None:
+    """Delete the stored sessions, statistics and hourly rollups of an entry."""
+    await ChargingSessionTracker(hass, entry.entry_id).async_remove()
+    await StatisticsAggregator(
+        hass, entry.entry_id, entry.data[CONF_SERIAL_NUMBER]
+    ).async_remove()
+    await RollupStore(hass, entry.entry_id).async_remove()
+
+
+def _needs_reload(
+    entry: EcovolterConfigEntry, data: dict[str, Any], options: dict[str, Any]
+) -> bool:
+    """Return whether a config change cannot be applied to the running entry."""
+    if dict(entry.data) != data:
+        return True  # connection details (eg. base URI, secret key)
+    # Unset, empty and false are the same (eg. statistics mode saved as off)
+    if any(
+        (options.get(key) or None) != (entry.options.get(key) or None)
+        for key in RELOAD_OPTIONS
+    ):
+        return True
+    # Joining or leaving a supply group needs a reload, a new limit does not
+    return bool(options.get(CONF_SUPPLY_LIMIT)) != bool(
+        entry.options.get(CONF_SUPPLY_LIMIT)
+    )
+
+
+async def async_update_options(
     hass: HomeAssistant,
     entry: EcovolterConfigEntry,
 ) -> None:
-    """Reload config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Apply changed options to the running entry, or reload it."""
+    runtime = entry.runtime_data
+    if _needs_reload(entry, runtime.applied_data, runtime.applied_options):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    runtime.applied_options = dict(entry.options)
+    runtime.client.configure(**_client_options(entry))
+    runtime.coordinator.async_apply_options(_update_interval(entry))
+    LOGGER.debug("Applied options of %s without reload", entry.title)
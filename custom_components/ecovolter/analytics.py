@@ -0,0 +1,131 @@
+"""Power-quality analytics over the ecovolter sample window."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .const import (
+    CHARGING_CURRENT_THRESHOLD,
+    CURRENT_LIMIT_MARGIN,
+    NOMINAL_VOLTAGE,
+    VOLTAGE_PRESENT_THRESHOLD,
+    VOLTAGE_SAG_RATIO,
+    VOLTAGE_SWELL_RATIO,
+)
+from .samples import COL, SampleWindow
+
+CURRENTS = [COL["currentL1"], COL["currentL2"], COL["currentL3"]]
+VOLTAGES = [COL["voltageL1"], COL["voltageL2"], COL["voltageL3"]]
+
+# Per-row metrics kept next to the window so evicted rows can be subtracted
+_CHARGING = 0  # 1 when any phase carries current
+_THREE_PHASE = 1  # 1 when all phases carry current
+_IMBALANCE = 2  # (max - min) / mean phase current, three-phase rows only
+_AT_LIMIT = 3  # 1 when the highest phase current reached the limit
+_SAGS = 4  # phases that entered a sag on this row
+_SWELLS = 5  # phases that entered a swell on this row
+_METRICS = 6
+
+
+class PowerQualityAnalyzer:
+    """Phase imbalance, voltage sag/swell events and current-limit share.
+
+    Each batch of new rows is evaluated with array operations and its
+    contribution is added to running window totals, while the rows it
+    evicts from the window are subtracted. The cost of an update therefore
+    depends on the batch size only, not on the size of the window.
+    """
+
+    def __init__(self, window: SampleWindow) -> None:
+        """Initialize the analyzer."""
+        self._window = window
+        # float32 halves the per-charger footprint; the totals stay float64
+        self._metrics = np.zeros((window.capacity, _METRICS), dtype=np.float32)
+        self._totals = np.zeros(_METRICS)
+        self._last_sag = np.zeros(3, dtype=bool)
+        self._last_swell = np.zeros(3, dtype=bool)
+        self._appended = 0
+
+    def append(self, rows: np.ndarray) -> None:
+        """Append rows to the window and update the analytics."""
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        # The whole batch is evaluated, as transitions depend on the row before
+        metrics = self._evaluate(rows).astype(np.float32)
+        rows = rows[-self._window.capacity :]
+        metrics = metrics[-self._window.capacity :]
+
+        evicted = self._window.positions_to_overwrite(len(rows))
+        self._totals -= self._metrics[evicted].sum(axis=0, dtype=np.float64)
+
+        positions = self._window.append(rows)
+        self._metrics[positions] = metrics
+        self._totals += metrics.sum(axis=0, dtype=np.float64)
+
+        # Re-sum once per window turnover so float drift cannot build up
+        self._appended += len(rows)
+        if self._appended >= self._window.capacity:
+            self._totals = self._metrics.sum(axis=0, dtype=np.float64)
+            self._appended = 0
+
+    def _evaluate(self, rows: np.ndarray) -> np.ndarray:
+        """Compute the per-row metrics of a batch."""
+        currents = np.nan_to_num(rows[:, CURRENTS])
+        voltages = rows[:, VOLTAGES]
+        metrics = np.zeros((len(rows), _METRICS))
+
+        carrying = currents > CHARGING_CURRENT_THRESHOLD
+        charging = carrying.any(axis=1)
+        three_phase = carrying.all(axis=1)
+        metrics[:, _CHARGING] = charging
+        metrics[:, _THREE_PHASE] = three_phase
+
+        mean = currents.mean(axis=1)
+        spread = currents.max(axis=1) - currents.min(axis=1)
+        metrics[:, _IMBALANCE] = np.divide(
+            spread, mean, out=np.zeros_like(mean), where=three_phase
+        )
+
+        limit = rows[:, COL["currentLimit"]]
+        with np.errstate(invalid="ignore"):
+            at_limit = currents.max(axis=1) >= limit - CURRENT_LIMIT_MARGIN
+        metrics[:, _AT_LIMIT] = charging & at_limit
+
+        # Count transitions into sag/swell, continuing from the previous batch;
+        # a phase without any voltage is not measured rather than sagging
+        with np.errstate(invalid="ignore"):
+            sag = (voltages < NOMINAL_VOLTAGE * VOLTAGE_SAG_RATIO) & (
+                voltages > VOLTAGE_PRESENT_THRESHOLD
+            )
+            swell = voltages > NOMINAL_VOLTAGE * VOLTAGE_SWELL_RATIO
+        prev_sag = np.vstack((self._last_sag, sag[:-1]))
+        prev_swell = np.vstack((self._last_swell, swell[:-1]))
+        metrics[:, _SAGS] = (sag & ~prev_sag).sum(axis=1)
+        metrics[:, _SWELLS] = (swell & ~prev_swell).sum(axis=1)
+        self._last_sag = sag[-1]
+        self._last_swell = swell[-1]
+
+        return metrics
+
+    @property
+    def phase_imbalance(self) -> float | None:
+        """Return the mean three-phase current imbalance in %."""
+        if not self._totals[_THREE_PHASE]:
+            return None
+        return 100.0 * self._totals[_IMBALANCE] / self._totals[_THREE_PHASE]
+
+    @property
+    def current_limit_share(self) -> float | None:
+        """Return the share of charging samples at the current limit in %."""
+        if not self._totals[_CHARGING]:
+            return None
+        return 100.0 * self._totals[_AT_LIMIT] / self._totals[_CHARGING]
+
+    @property
+    def voltage_sags(self) -> int:
+        """Return the number of voltage sag events in the window."""
+        return round(self._totals[_SAGS])
+
+    @property
+    def voltage_swells(self) -> int:
+        """Return the number of voltage swell events in the window."""
+        return round(self._totals[_SWELLS])
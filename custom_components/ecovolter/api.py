@@ -7,11 +7,30 @@ import hashlib
 import hmac
 import json
 import socket
-from time import time
-from typing import Any
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
 
+from .const import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_TIMEOUT_SECONDS,
+    SETTINGS_WRITE_BURST,
+    SETTINGS_WRITE_REFILL_SECONDS,
+)
+from .governor import WriteGovernor
+from .scheduler import (
+    LANE_BACKGROUND,
+    LANE_SETTINGS,
+    LANE_STATUS,
+    LANE_WRITE,
+    RequestPreemptedError,
+    RequestScheduler,
+)
+
+if TYPE_CHECKING:
+    from .io_worker import IoWorker
+
 
 class EcovolterApiClientError(Exception):
     """Exception to indicate a general API error."""
@@ -29,6 +48,12 @@ class EcovolterApiClientAuthenticationError(
     """Exception to indicate an authentication error."""
 
 
+class EcovolterApiClientPreemptedError(
+    EcovolterApiClientError,
+):
+    """Exception to indicate a queued request was dropped for a more urgent one."""
+
+
 def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
     """Verify that the response is valid."""
     if response.status in (401, 403):
@@ -48,40 +73,81 @@ class EcovolterApiClient:
         secret_key: str,
         base_uri: str | None,
         session: aiohttp.ClientSession,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT_SECONDS,
+        worker: IoWorker | None = None,
     ) -> None:
         """Sample API Client."""
         self._serial_number = serial_number
         self._secret_key = secret_key.encode("utf-8")  # bytes type
         self._base_uri = base_uri.rstrip("/") if base_uri else None
         self._session = session
+        self.governor = WriteGovernor(SETTINGS_WRITE_BURST, SETTINGS_WRITE_REFILL_SECONDS)
+        self.scheduler = RequestScheduler(max_concurrent_requests)
+        self.timeout = timeout
+        self.worker = worker
 
-    async def _async_get_data(self, path) -> Any:
-        return await self._api_wrapper(
-            method="get",
-            path=path,
-        )
+    def configure(self, max_concurrent_requests: int, timeout: float) -> None:
+        """Apply new request settings to the running client."""
+        self.scheduler.set_max_concurrency(max_concurrent_requests)
+        self.timeout = timeout
+
+    async def _async_get_data(self, path, lane: int) -> Any:
+        try:
+            async with self.scheduler.async_slot(lane):
+                return await self._api_wrapper(
+                    method="get",
+                    path=path,
+                )
+        except RequestPreemptedError as exception:
+            msg = f"Request for {path} preempted by a more urgent one"
+            raise EcovolterApiClientPreemptedError(
+                msg,
+            ) from exception
 
     async def async_get_status(self) -> Any:
         """Get settings data from Ecovolter."""
-        return await self._async_get_data(path="/status")
+        return await self._async_get_data(path="/status", lane=LANE_STATUS)
 
     async def async_get_settings(self) -> Any:
         """Get settings data from Ecovolter."""
-        return await self._async_get_data(path="/settings")
+        settings = await self._async_get_data(path="/settings", lane=LANE_SETTINGS)
+        if isinstance(settings, dict):
+            self.governor.settings = dict(settings)
+        return settings
 
     async def async_get_diagnostics(self) -> Any:
         """Get settings data from Ecovolter."""
-        return await self._async_get_data(path="/diagnostic")
+        return await self._async_get_data(path="/diagnostic", lane=LANE_BACKGROUND)
 
     async def async_get_type(self) -> Any:
         """Get settings data from Ecovolter."""
-        return await self._async_get_data(path="/type")
-
-    async def async_set_settings(self, data: dict) -> Any:
-        """Get settings data from Ecovolter."""
-        timestamp_miliseconds = int(time() * 1000)
-        data["timestamp"] = timestamp_miliseconds
-        return await self._api_wrapper(method="patch", path="/settings", data=data)
+        return await self._async_get_data(path="/type", lane=LANE_BACKGROUND)
+
+    async def async_set_settings(
+        self, data: dict, *, user: bool = False, urgent: bool = False
+    ) -> bool:
+        """Write the changed settings to Ecovolter.
+
+        Returns False when the write changes nothing and was dropped. Writes
+        by a user (``user=True``) are neither dropped nor delayed by the rate
+        limit. Urgent automation writes (``urgent=True``), e.g. lowering the
+        current to protect a fuse, are dropped but never delayed.
+        """
+        changes = self.governor.changes(data, user)
+        if not changes:
+            return False
+        await self.governor.async_acquire(user or urgent)
+        async with self.scheduler.async_slot(LANE_WRITE, preemptible=False):
+            timestamp_miliseconds = int(time() * 1000)
+            await self._api_wrapper(
+                method="patch",
+                path="/settings",
+                data={**changes, "timestamp": timestamp_miliseconds},
+            )
+        self.governor.settings.update(changes)
+        self.governor.written_at = monotonic()
+        return True
 
     async def _api_wrapper(
         self,
@@ -90,7 +156,16 @@ class EcovolterApiClient:
         data: dict | None = None,
         headers: dict | None = None,
     ) -> Any:
-        """Get information from the API."""
+        """Get information from the API, on the I/O worker if there is one."""
+        if self.worker is not None:
+            return await self.worker.async_run(self._async_request(method, path, data))
+        return await self._async_request(method, path, data)
+
+    async def _async_request(
+        self, method: str, path: str, data: dict | None = None
+    ) -> Any:
+        """Sign and send a request and decode the response."""
+        session = self._session if self.worker is None else self.worker.client_session()
         timestamp_seconds = str(int(time()))
         base = self._base_uri or f"http://{self._serial_number}.local"
         url = f"{base}/api/v1/charger{path}"
@@ -108,13 +183,13 @@ class EcovolterApiClient:
 
         try:
             response = await asyncio.wait_for(
-                self._session.request(
+                session.request(
                     method=method,
                     url=url,
                     headers=headers,
                     json=data,
                 ),
-                timeout=10.0,
+                timeout=self.timeout,
             )
             _verify_response_or_raise(response)
             return await response.json()
@@ -7,6 +7,8 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.const import UnitOfElectricCurrent
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
@@ -24,10 +26,37 @@ from .const import (
     CONF_SERIAL_NUMBER,
     CONF_BASE_URI,
     CONF_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_TARIFF_SCHEDULE,
+    CONF_PRICE_ENTITY,
+    CONF_STATISTICS_MODE,
+    CONF_TELEMETRY,
+    CONF_ENTITY_TIMING,
+    CONF_IO_WORKER,
+    CONF_SUPPLY_GROUP,
+    CONF_SUPPLY_LIMIT,
+    CONF_ALLOCATION_PRIORITY,
+    CONF_SURPLUS_ENTITY,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SETTINGS_INTERVAL,
+    CONF_DIAGNOSTICS_INTERVAL,
+    CONF_GRACE_FAILURES,
+    CONF_GRACE_MAX_AGE,
+    DEFAULT_GRACE_FAILURES,
+    DEFAULT_GRACE_MAX_AGE_SECONDS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_TIMEOUT_SECONDS,
+    MAX_CONCURRENT_REQUESTS,
+    MIN_REQUEST_TIMEOUT_SECONDS,
+    MAX_REQUEST_TIMEOUT_SECONDS,
+    MIN_CURRENT,
     DEFAULT_UPDATE_INTERVAL_SECONDS,
     MIN_UPDATE_INTERVAL_SECONDS,
 )
-
+from .probe import ProbeResult, async_probe
+from .replay import async_create_replay_client, is_replay_uri
+from .tariff import InvalidTariffSchedule, TariffSchedule
 from .utils import as_int
 
 
@@ -36,6 +65,17 @@ class EcovolterFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    _data: dict[str, Any]
+    _probe: ProbeResult
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> EcovolterOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return EcovolterOptionsFlowHandler()
+
     async def async_step_user(
         self,
         user_input: dict[str, Any] | None = None,
@@ -59,9 +99,9 @@ class EcovolterFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             if interval < MIN_UPDATE_INTERVAL_SECONDS:
                 interval = MIN_UPDATE_INTERVAL_SECONDS
 
-            # Validate credentials by calling API
+            # Validate credentials by calling API, then probe the latency
             try:
-                await self._test_credentials(
+                probe = await self._test_credentials(
                     serial_number=serial,
                     secret_key=secret,
                     base_uri=base_uri,
@@ -89,10 +129,13 @@ class EcovolterFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 if base_uri:
                     data[CONF_BASE_URI] = base_uri
 
-                return self.async_create_entry(
-                    title=serial,
-                    data=data,
-                )
+                if probe is None:  # a replay has no latency to probe
+                    return self.async_create_entry(
+                        title=serial,
+                        data=data,
+                    )
+                self._data, self._probe = data, probe
+                return await self.async_step_probe()
 
         defaults = user_input or {}
 
@@ -142,14 +185,351 @@ class EcovolterFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=_errors,
         )
 
+    async def async_step_probe(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Show the probed latency; confirm the interval and timeout."""
+        _errors: dict[str, str] = {}
+        probe = self._probe
+        if user_input is not None:
+            interval = as_int(user_input.get(CONF_UPDATE_INTERVAL)) or 0
+            if interval < probe.min_interval:
+                _errors[CONF_UPDATE_INTERVAL] = "interval_too_short"
+            else:
+                return self.async_create_entry(
+                    title=self._data[CONF_SERIAL_NUMBER],
+                    data={
+                        **self._data,
+                        CONF_UPDATE_INTERVAL: interval,
+                        CONF_MIN_UPDATE_INTERVAL: probe.min_interval,
+                    },
+                    options={
+                        CONF_REQUEST_TIMEOUT: int(
+                            user_input.get(CONF_REQUEST_TIMEOUT, probe.timeout)
+                        )
+                    },
+                )
+
+        # The requested interval, unless the charger cannot serve it
+        interval = max(self._data[CONF_UPDATE_INTERVAL], probe.min_interval)
+
+        return self.async_show_form(
+            step_id="probe",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_UPDATE_INTERVAL, default=interval
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=MIN_UPDATE_INTERVAL_SECONDS,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        )
+                    ),
+                    vol.Required(
+                        CONF_REQUEST_TIMEOUT, default=probe.timeout
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=MIN_REQUEST_TIMEOUT_SECONDS,
+                            max=MAX_REQUEST_TIMEOUT_SECONDS,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        )
+                    ),
+                },
+            ),
+            description_placeholders=probe.placeholders(),
+            errors=_errors,
+        )
+
     async def _test_credentials(
         self, serial_number: str, secret_key: str, base_uri: str | None = None
-    ) -> None:
-        """Validate credentials."""
+    ) -> ProbeResult | None:
+        """Validate credentials and probe the latency of all endpoints."""
+        session = async_create_clientsession(self.hass)
+        if is_replay_uri(base_uri):
+            await async_create_replay_client(self.hass, serial_number, base_uri, session)
+            return None
         client = EcovolterApiClient(
             serial_number=serial_number,
             secret_key=secret_key,
             base_uri=base_uri,
-            session=async_create_clientsession(self.hass),
+            session=session,
         )
         await client.async_get_status()
+        return await async_probe(client)
+
+
+class EcovolterOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for Ecovolter."""
+
+    @property
+    def _min_interval(self) -> int:
+        """Return the shortest interval the charger served in the setup probe."""
+        return int(
+            self.config_entry.data.get(
+                CONF_MIN_UPDATE_INTERVAL, MIN_UPDATE_INTERVAL_SECONDS
+            )
+        )
+
+    async def async_step_init(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the options."""
+        _errors: dict[str, str] = {}
+        if user_input is not None:
+            options = dict(self.config_entry.options)
+
+            # Polling; applied to the running entry without a reload
+            interval = max(
+                as_int(user_input.get(CONF_UPDATE_INTERVAL))
+                or DEFAULT_UPDATE_INTERVAL_SECONDS,
+                MIN_UPDATE_INTERVAL_SECONDS,
+            )
+            if interval < self._min_interval:
+                _errors[CONF_UPDATE_INTERVAL] = "interval_too_short"
+            options[CONF_UPDATE_INTERVAL] = interval
+            options[CONF_REQUEST_TIMEOUT] = int(
+                user_input.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT_SECONDS)
+            )
+            for key in (CONF_SETTINGS_INTERVAL, CONF_DIAGNOSTICS_INTERVAL):
+                options[key] = int(user_input.get(key, 0))
+            options[CONF_GRACE_FAILURES] = int(
+                user_input.get(CONF_GRACE_FAILURES, DEFAULT_GRACE_FAILURES)
+            )
+            options[CONF_GRACE_MAX_AGE] = int(
+                user_input.get(CONF_GRACE_MAX_AGE, DEFAULT_GRACE_MAX_AGE_SECONDS)
+            )
+
+            # Tariff (optional); validate the schedule by building its index
+            schedule = str(user_input.get(CONF_TARIFF_SCHEDULE, "")).strip()
+            if schedule:
+                try:
+                    TariffSchedule(schedule)
+                except InvalidTariffSchedule as exception:
+                    LOGGER.warning(exception)
+                    _errors[CONF_TARIFF_SCHEDULE] = "invalid_schedule"
+                else:
+                    options[CONF_TARIFF_SCHEDULE] = schedule
+            else:
+                options.pop(CONF_TARIFF_SCHEDULE, None)
+
+            if price_entity := user_input.get(CONF_PRICE_ENTITY):
+                options[CONF_PRICE_ENTITY] = price_entity
+            else:
+                options.pop(CONF_PRICE_ENTITY, None)
+
+            options[CONF_STATISTICS_MODE] = bool(
+                user_input.get(CONF_STATISTICS_MODE, False)
+            )
+            options[CONF_TELEMETRY] = bool(user_input.get(CONF_TELEMETRY, False))
+            options[CONF_ENTITY_TIMING] = bool(
+                user_input.get(CONF_ENTITY_TIMING, False)
+            )
+            options[CONF_IO_WORKER] = bool(user_input.get(CONF_IO_WORKER, False))
+
+            # Supply group (optional); a group needs a per-phase limit
+            group = str(user_input.get(CONF_SUPPLY_GROUP, "")).strip()
+            if group:
+                if not user_input.get(CONF_SUPPLY_LIMIT):
+                    _errors[CONF_SUPPLY_LIMIT] = "supply_limit_required"
+                else:
+                    options[CONF_SUPPLY_GROUP] = group
+                    options[CONF_SUPPLY_LIMIT] = int(user_input[CONF_SUPPLY_LIMIT])
+            else:
+                options.pop(CONF_SUPPLY_GROUP, None)
+                options.pop(CONF_SUPPLY_LIMIT, None)
+            options[CONF_ALLOCATION_PRIORITY] = int(
+                user_input.get(CONF_ALLOCATION_PRIORITY, 0)
+            )
+
+            options[CONF_MAX_CONCURRENT_REQUESTS] = int(
+                user_input.get(
+                    CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                )
+            )
+
+            if surplus_entity := user_input.get(CONF_SURPLUS_ENTITY):
+                options[CONF_SURPLUS_ENTITY] = surplus_entity
+            else:
+                options.pop(CONF_SURPLUS_ENTITY, None)
+
+            if not _errors:
+                return self.async_create_entry(data=options)
+
+        defaults = user_input or self.config_entry.options
+        interval = defaults.get(
+            CONF_UPDATE_INTERVAL,
+            self.config_entry.data.get(
+                CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL_SECONDS
+            ),
+        )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_UPDATE_INTERVAL, default=interval
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=MIN_UPDATE_INTERVAL_SECONDS,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_REQUEST_TIMEOUT,
+                        default=defaults.get(
+                            CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT_SECONDS
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=MIN_REQUEST_TIMEOUT_SECONDS,
+                            max=MAX_REQUEST_TIMEOUT_SECONDS,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_SETTINGS_INTERVAL,
+                        default=defaults.get(CONF_SETTINGS_INTERVAL, 0),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_DIAGNOSTICS_INTERVAL,
+                        default=defaults.get(CONF_DIAGNOSTICS_INTERVAL, 0),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_GRACE_FAILURES,
+                        default=defaults.get(CONF_GRACE_FAILURES, DEFAULT_GRACE_FAILURES),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=20,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_GRACE_MAX_AGE,
+                        default=defaults.get(
+                            CONF_GRACE_MAX_AGE, DEFAULT_GRACE_MAX_AGE_SECONDS
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="s",
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_TARIFF_SCHEDULE,
+                        description={
+                            "suggested_value": defaults.get(CONF_TARIFF_SCHEDULE)
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                            multiline=True,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_PRICE_ENTITY,
+                        description={"suggested_value": defaults.get(CONF_PRICE_ENTITY)},
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(
+                            domain=["sensor", "input_number"],
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_STATISTICS_MODE,
+                        default=defaults.get(CONF_STATISTICS_MODE, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_TELEMETRY,
+                        default=defaults.get(CONF_TELEMETRY, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_ENTITY_TIMING,
+                        default=defaults.get(CONF_ENTITY_TIMING, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_IO_WORKER,
+                        default=defaults.get(CONF_IO_WORKER, False),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_SUPPLY_GROUP,
+                        description={"suggested_value": defaults.get(CONF_SUPPLY_GROUP)},
+                    ): selector.TextSelector(),
+                    vol.Optional(
+                        CONF_SUPPLY_LIMIT,
+                        description={"suggested_value": defaults.get(CONF_SUPPLY_LIMIT)},
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=MIN_CURRENT,
+                            max=250,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_ALLOCATION_PRIORITY,
+                        default=defaults.get(CONF_ALLOCATION_PRIORITY, 0),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=10,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_SURPLUS_ENTITY,
+                        description={
+                            "suggested_value": defaults.get(CONF_SURPLUS_ENTITY)
+                        },
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(
+                            domain="sensor",
+                            device_class="power",
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=defaults.get(
+                            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=MAX_CONCURRENT_REQUESTS,
+                            step=1,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                },
+            ),
+            errors=_errors,
+        )
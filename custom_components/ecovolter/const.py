@@ -1,7 +1,17 @@
 """Constants for ecovolter."""
 
+from __future__ import annotations
+
 from logging import Logger, getLogger
-from typing import Final
+from typing import TYPE_CHECKING, Final
+
+from homeassistant.util.hass_dict import HassKey
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .fleet import SupplyGroup
+    from .io_worker import IoWorker
 
 LOGGER: Logger = getLogger(__package__)
 
@@ -12,9 +22,125 @@ CONF_SERIAL_NUMBER = "serial_number"
 CONF_SECRET_KEY = "secret_key"
 CONF_BASE_URI = "base_uri"
 CONF_UPDATE_INTERVAL = "update_interval"
+CONF_MIN_UPDATE_INTERVAL = "min_update_interval"  # measured by the setup probe
+CONF_TARIFF_SCHEDULE = "tariff_schedule"
+CONF_PRICE_ENTITY = "price_entity"
+CONF_STATISTICS_MODE = "statistics_mode"
+CONF_SUPPLY_GROUP = "supply_group"
+CONF_SUPPLY_LIMIT = "supply_limit"
+CONF_ALLOCATION_PRIORITY = "allocation_priority"
+CONF_SURPLUS_ENTITY = "surplus_entity"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+CONF_SETTINGS_INTERVAL = "settings_interval"
+CONF_DIAGNOSTICS_INTERVAL = "diagnostics_interval"
+CONF_GRACE_FAILURES = "grace_failures"
+CONF_GRACE_MAX_AGE = "grace_max_age"
+CONF_TELEMETRY = "telemetry"
+CONF_ENTITY_TIMING = "entity_timing"
+CONF_IO_WORKER = "io_worker"
 
 DEFAULT_UPDATE_INTERVAL_SECONDS = 15
 MIN_UPDATE_INTERVAL_SECONDS = 5
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 10
+MIN_REQUEST_TIMEOUT_SECONDS = 2
+MAX_REQUEST_TIMEOUT_SECONDS = 60
+# Setup probe: rounds fetching all sections at once; the charger should be
+# busy at most half the interval, and a timeout leaves room for slow answers
+PROBE_ROUNDS = 5
+PROBE_INTERVAL_FACTOR = 2
+PROBE_TIMEOUT_FACTOR = 5
+# Last good data is served through failed polls until this many fail in a row
+# or it gets this old; then entities become unavailable
+DEFAULT_GRACE_FAILURES = 3
+DEFAULT_GRACE_MAX_AGE_SECONDS = 300
+# Requests running at once per charger; more are queued by priority
+DEFAULT_MAX_CONCURRENT_REQUESTS = 2
+MAX_CONCURRENT_REQUESTS = 4
+
+# Longest gap between two power samples that is still integrated into energy
+ENERGY_MAX_GAP_SECONDS = 120
+
+SESSION_STORAGE_VERSION = 1
+SESSION_SAVE_DELAY_SECONDS = 30
+SESSION_HISTORY_MAX = 10000
+
+# Locally aggregated statistics: the running hour is stored across restarts,
+# finished hours wait for the recorder for up to two days
+STATISTICS_STORAGE_VERSION = 1
+STATISTICS_PENDING_MAX_HOURS = 48
+
+# Samples kept in memory per charger (~5.7 h at the default 5 s minimum)
+SAMPLE_WINDOW_SIZE = 4096
+
+# Power quality; sag/swell thresholds follow EN 50160 (±10 % of nominal)
+NOMINAL_VOLTAGE = 230.0
+VOLTAGE_SAG_RATIO = 0.9
+VOLTAGE_SWELL_RATIO = 1.1
+VOLTAGE_PRESENT_THRESHOLD = 50.0  # V, a phase reading less is not measured
+CHARGING_CURRENT_THRESHOLD = 1.0  # A, a phase carrying less is idle
+CURRENT_LIMIT_MARGIN = 0.5  # A, below the limit still counted as reached
+
+# Settings writes per charger: a burst of 5, then one per 10 s on average
+SETTINGS_WRITE_BURST = 5
+SETTINGS_WRITE_REFILL_SECONDS = 10
+
+# Fleet allocation: supply groups by name, shared by all config entries
+DATA_FLEET: HassKey[dict[str, SupplyGroup]] = HassKey(f"{DOMAIN}_fleet")
+FLEET_ALLOCATION_COOLDOWN_SECONDS = 1.0  # coalesces member updates into one cycle
+CAR_LIMITED_HEADROOM = 2.0  # A above what a car draws before its share is capped
+
+# Websocket sample subscriptions per config entry, ended when it unloads
+DATA_SAMPLE_SUBSCRIPTIONS: HassKey[dict[str, set[Callable[[], None]]]] = HassKey(
+    f"{DOMAIN}_sample_subscriptions"
+)
+
+# I/O worker: one thread polling all chargers that opted in
+DATA_IO_WORKER: HassKey[IoWorker] = HassKey(f"{DOMAIN}_io_worker")
+
+# Solar-surplus charging
+SURPLUS_HYSTERESIS_W = 500  # extra surplus needed before switching to 3 phases
+SURPLUS_PHASE_DWELL_SECONDS = 300  # minimum time between phase switches
+SURPLUS_PAUSE_DWELL_SECONDS = 120  # minimum time between pausing and resuming
+SURPLUS_WRITE_BURST = 3  # writes that may go out back to back
+SURPLUS_WRITE_REFILL_SECONDS = 60  # long-term write rate: one per minute
+
+# Burst sampling: status-only polling at a high rate for a limited time
+BURST_MAX_CHARGERS = 4  # fleet-wide
+BURST_MAX_DURATION_SECONDS = 1800
+DEFAULT_BURST_DURATION_SECONDS = 300
+DEFAULT_BURST_INTERVAL_SECONDS = 1
+
+# Refresh cycle profiling by the profile service
+DEFAULT_PROFILE_DURATION_SECONDS = 60
+PROFILE_MAX_DURATION_SECONDS = 600
+
+# Chargers written at once by the apply_settings service
+APPLY_SETTINGS_CONCURRENCY = 8
+
+# Telemetry log: raw payloads in per-charger gzip files under the config dir
+TELEMETRY_DIRECTORY = f"{DOMAIN}_telemetry"
+TELEMETRY_BATCH_RECORDS = 120  # records compressed and written together
+TELEMETRY_FLUSH_SECONDS = 300  # a partial batch is written after this long
+TELEMETRY_MAX_FILE_BYTES = 16 * 1024 * 1024
+TELEMETRY_MAX_FILE_AGE_SECONDS = 86400
+TELEMETRY_MAX_FILES = 30  # per charger; the oldest are deleted
+
+# Base URI of a config entry replaying recorded telemetry instead of polling,
+# e.g. replay:///config/ecovolter_telemetry/<serial>?speed=10
+REPLAY_URI_PREFIX = "replay://"
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_JSONL = "jsonl"
+
+# Events fired on status transitions
+EVENT_VEHICLE_CONNECTED = f"{DOMAIN}_vehicle_connected"
+EVENT_VEHICLE_DISCONNECTED = f"{DOMAIN}_vehicle_disconnected"
+EVENT_CHARGING_STARTED = f"{DOMAIN}_charging_started"
+EVENT_CHARGING_STOPPED = f"{DOMAIN}_charging_stopped"
+EVENT_BOOST_FINISHED = f"{DOMAIN}_boost_finished"
+EVENT_THERMAL_LIMIT_ACTIVE = f"{DOMAIN}_thermal_limit_active"
+EVENT_THERMAL_LIMIT_CLEARED = f"{DOMAIN}_thermal_limit_cleared"
 
 KEY_STATUS: Final = "status"
 KEY_SETTINGS: Final = "settings"
@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from time import monotonic, time
 from typing import TYPE_CHECKING, Any, TypedDict
 
+import numpy as np
+
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import (
     EcovolterApiClientAuthenticationError,
     EcovolterApiClientError,
+    EcovolterApiClientPreemptedError,
 )
 
 from .const import (
@@ -17,7 +27,35 @@ from .const import (
     KEY_SETTINGS,
     KEY_DIAGNOSTICS,
     KEY_TYPE_INFO,
+    CONF_DIAGNOSTICS_INTERVAL,
+    CONF_ENTITY_TIMING,
+    CONF_GRACE_FAILURES,
+    CONF_GRACE_MAX_AGE,
+    CONF_PRICE_ENTITY,
+    CONF_SERIAL_NUMBER,
+    CONF_SETTINGS_INTERVAL,
+    CONF_STATISTICS_MODE,
+    CONF_TARIFF_SCHEDULE,
+    CONF_TELEMETRY,
+    DEFAULT_GRACE_FAILURES,
+    DEFAULT_GRACE_MAX_AGE_SECONDS,
+    CHARGER_TYPE_MAX_CURRENT,
+    DOMAIN,
+    ENERGY_MAX_GAP_SECONDS,
+    MAX_CURRENT,
+    SAMPLE_WINDOW_SIZE,
 )
+from .analytics import PowerQualityAnalyzer
+from .energy import EnergyIntegrator, sample_power_kw
+from .events import status_events
+from .profiling import RefreshProfile
+from .rollup import RollupStore
+from .samples import SampleWindow, sample_row
+from .session import ChargingSessionTracker
+from .statistics import StatisticsAggregator
+from .tariff import TariffEngine
+from .telemetry import TelemetryLog
+from .timing import EntityTimings
 
 if TYPE_CHECKING:
     from .data import EcovolterConfigEntry
@@ -40,30 +78,271 @@ class EcovolterDataUpdateCoordinator(DataUpdateCoordinator[DataType]):
 
     _type_info_cache: dict[str, Any] | None = None
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the coordinator."""
+        super().__init__(*args, **kwargs)
+        interval = self.update_interval.total_seconds() if self.update_interval else 0
+        self.energy = EnergyIntegrator(max(ENERGY_MAX_GAP_SECONDS, 3 * interval))
+        self._fetched_at: dict[str, float] = {}
+        self._last_good: float | None = None
+        self._previous_status: dict[str, Any] | None = None
+        self.burst_until: datetime | None = None
+        self._burst_restore = self.update_interval
+        self._burst_cancel: CALLBACK_TYPE | None = None
+        self.config_entry.async_on_unload(self._async_end_burst)
+        self.failures = 0
+        serial = self.config_entry.data.get(CONF_SERIAL_NUMBER) or "unknown"
+        # One device info shared by all entities of the charger
+        self.device_info = dr.DeviceInfo(
+            identifiers={(DOMAIN, self.config_entry.entry_id)},
+            manufacturer="EcoVolter",
+            model="EcoVolter II",  # change if you detect model dynamically
+            name=f"EcoVolter ({serial})",  # -> shows up instead of "undefined"
+        )
+        self.stale_since: datetime | None = None
+        self.profile: RefreshProfile | None = None
+        self.entity_timings: EntityTimings | None = None
+        self._configure_entity_timing()
+        self.sessions = ChargingSessionTracker(self.hass, self.config_entry.entry_id)
+        self.rollup = RollupStore(self.hass, self.config_entry.entry_id)
+        self.tariff = TariffEngine(
+            self.hass,
+            schedule=self.config_entry.options.get(CONF_TARIFF_SCHEDULE),
+            price_entity_id=self.config_entry.options.get(CONF_PRICE_ENTITY),
+        )
+        self.window = SampleWindow(SAMPLE_WINDOW_SIZE)
+        self.power_quality = PowerQualityAnalyzer(self.window)
+        self.statistics: StatisticsAggregator | None = None
+        if self.config_entry.options.get(CONF_STATISTICS_MODE):
+            self.statistics = StatisticsAggregator(
+                self.hass,
+                self.config_entry.entry_id,
+                self.config_entry.data[CONF_SERIAL_NUMBER],
+            )
+        self.telemetry: TelemetryLog | None = None
+        if self.config_entry.options.get(CONF_TELEMETRY):
+            self.telemetry = TelemetryLog(
+                self.hass, self.config_entry.data[CONF_SERIAL_NUMBER]
+            )
+
+    def async_apply_options(self, update_interval: timedelta) -> None:
+        """Apply changed options to the running coordinator."""
+        if self.burst_until is not None:
+            self._burst_restore = update_interval
+        else:
+            self.update_interval = update_interval
+        self.energy.max_gap = max(
+            ENERGY_MAX_GAP_SECONDS, 3 * update_interval.total_seconds()
+        )
+        self.tariff.configure(
+            self.config_entry.options.get(CONF_TARIFF_SCHEDULE),
+            self.config_entry.options.get(CONF_PRICE_ENTITY),
+        )
+        self._configure_entity_timing()
+
+    def _configure_entity_timing(self) -> None:
+        """Start or stop timing the entity state updates per the options."""
+        if not self.config_entry.options.get(CONF_ENTITY_TIMING):
+            self.entity_timings = None
+        elif self.entity_timings is None:
+            self.entity_timings = EntityTimings()
+
+    @callback
+    def async_start_burst(self, interval: timedelta, duration: timedelta) -> datetime:
+        """Poll only the status at a high rate for a while.
+
+        Starting a burst again extends it. The previous interval is restored
+        when it ends; return the time it will end. The interval may be below
+        the minimum measured by the setup probe (``CONF_MIN_UPDATE_INTERVAL``):
+        that minimum is for polls of all sections, a burst polls only the
+        status, is limited in time and to a few chargers at once.
+        """
+        if self._burst_cancel is None:
+            self._burst_restore = self.update_interval
+        else:
+            self._burst_cancel()
+        self.update_interval = interval
+        self.burst_until = dt_util.utcnow() + duration
+        self._burst_cancel = async_call_later(self.hass, duration, self._async_end_burst)
+        self.config_entry.async_create_task(self.hass, self.async_refresh())
+        return self.burst_until
+
+    @callback
+    def _async_end_burst(self, _now: datetime | None = None) -> None:
+        """Return to the regular schedule."""
+        if self._burst_cancel is not None:
+            self._burst_cancel()
+            self._burst_cancel = None
+        if self.burst_until is not None:
+            self.burst_until = None
+            self.update_interval = self._burst_restore
+            self.logger.debug("Burst sampling of %s ended", self.config_entry.title)
+
+    def _is_due(self, key: str, option: str) -> bool:
+        """Return whether a section is due per its interval option."""
+        if self.burst_until is not None:
+            return False  # status only
+        interval = self.config_entry.options.get(option) or 0
+        fetched_at = self._fetched_at.get(key)
+        return fetched_at is None or monotonic() - fetched_at >= interval
+
+    async def _async_fetch(
+        self, key: str, request: Callable[[], Awaitable[Any]], due: bool = True
+    ) -> tuple[Any, bool]:
+        """Fetch one section; return it and whether it is fresh.
+
+        A section that is not due, or whose request was dropped by the
+        scheduler for a more urgent one (e.g. a write), falls back to the
+        section from the previous update.
+        """
+        if due or self.data is None:
+            try:
+                value = await request()
+            except EcovolterApiClientPreemptedError:
+                if self.data is None:
+                    raise
+                self.logger.debug("Fetching %s preempted, keeping previous data", key)
+            else:
+                self._fetched_at[key] = monotonic()
+                return value, True
+        return self.data[key], False  # type: ignore[literal-required]
+
+    def _stale_or_raise(self, exception: EcovolterApiClientError) -> DataType:
+        """Serve the last good data through a failed poll, within the grace period.
+
+        Entities keep their state (with a ``stale_since`` attribute) instead of
+        flipping to unavailable and back on every transient failure.
+        """
+        self.failures += 1
+        options = self.config_entry.options
+        max_failures = options.get(CONF_GRACE_FAILURES, DEFAULT_GRACE_FAILURES)
+        max_age = options.get(CONF_GRACE_MAX_AGE, DEFAULT_GRACE_MAX_AGE_SECONDS)
+        if (
+            self.data is None
+            or self._last_good is None
+            or self.failures >= max_failures
+            or time() - self._last_good > max_age
+        ):
+            raise UpdateFailed(exception) from exception
+
+        if self.stale_since is None:
+            self.stale_since = dt_util.utc_from_timestamp(self._last_good)
+        self.logger.debug(
+            "Update failed (%s in a row), serving data from %s: %s",
+            self.failures,
+            self.stale_since,
+            exception,
+        )
+        return self.data
+
+    def _fire_status_events(self, status: dict[str, Any]) -> None:
+        """Fire events for the transitions since the previous status."""
+        previous, self._previous_status = self._previous_status, status
+        if previous is None:
+            return
+        charger_type = (self._type_info_cache or {}).get("chargerType")
+        max_current = (
+            CHARGER_TYPE_MAX_CURRENT.get(charger_type, MAX_CURRENT)
+            if isinstance(charger_type, int)
+            else MAX_CURRENT
+        )
+        events = status_events(previous, status, max_current)
+        if not events:
+            return
+
+        entry = self.config_entry
+        device = dr.async_get(self.hass).async_get_device({(DOMAIN, entry.entry_id)})
+        base = {
+            "config_entry_id": entry.entry_id,
+            "device_id": device.id if device is not None else None,
+            "serial_number": entry.data.get(CONF_SERIAL_NUMBER),
+        }
+        for event_type, data in events:
+            self.hass.bus.async_fire(event_type, {**base, **data})
+
     async def _async_update_data(self) -> DataType:
-        """Update data via library."""
+        """Update data via library (recorded while a profile runs)."""
+        if self.profile is not None:
+            return await self.profile.async_run(self._async_poll())
+        return await self._async_poll()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners (recorded while a profile runs)."""
+        if self.entity_timings is not None:
+            self.entity_timings.refreshes += 1
+        if self.profile is None:
+            super().async_update_listeners()
+            return
+        with self.profile.running():
+            super().async_update_listeners()
+
+    async def _async_poll(self) -> DataType:
+        """Fetch the due sections and process a fresh status."""
+        client = self.config_entry.runtime_data.client
         try:
-            status = (
-                await self.config_entry.runtime_data.client.async_get_status()
+            status, fresh = await self._async_fetch(
+                KEY_STATUS, client.async_get_status
             )  # /api/v1/charger/status
-            settings = (
-                await self.config_entry.runtime_data.client.async_get_settings()
+            # Settings are always due again after they were written
+            settings, settings_fresh = await self._async_fetch(
+                KEY_SETTINGS,
+                client.async_get_settings,
+                self._is_due(KEY_SETTINGS, CONF_SETTINGS_INTERVAL)
+                or client.governor.written_at >= self._fetched_at.get(KEY_SETTINGS, 0.0),
             )  # /api/v1/charger/settings
-            diagnostics = (
-                await self.config_entry.runtime_data.client.async_get_diagnostics()
+            diagnostics, diagnostics_fresh = await self._async_fetch(
+                KEY_DIAGNOSTICS,
+                client.async_get_diagnostics,
+                self._is_due(KEY_DIAGNOSTICS, CONF_DIAGNOSTICS_INTERVAL),
             )  # /api/v1/charger/diagnostic
 
             # fetch type info once and cache
+            type_fresh = False
             if self._type_info_cache is None:
                 self._type_info_cache = (
-                    await self.config_entry.runtime_data.client.async_get_type()
+                    await client.async_get_type()
                 )  # /api/v1/charger/type
+                type_fresh = True
 
         except EcovolterApiClientAuthenticationError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except EcovolterApiClientError as exception:
-            raise UpdateFailed(exception) from exception
+            return self._stale_or_raise(exception)
         else:
+            self._last_good = time()
+            self.failures = 0
+            self.stale_since = None
+
+            # Integrate locally; each fresh status contributes exactly one sample
+            if fresh:
+                now = time()
+                power = sample_power_kw(status)
+                added = self.energy.add_sample(now, power)
+                cost = self.tariff.add_energy(now, added, settings)
+                active = self.sessions.active
+                self.sessions.add_sample(now, status, settings, power, added, cost)
+                started = self.sessions.active not in (None, active)
+                self.rollup.add_sample(now, power, added, cost, started)
+                self.power_quality.append(np.array([sample_row(now, status, settings)]))
+                if self.statistics is not None:
+                    self.statistics.add_sample(now, status, self.energy.total_kwh)
+                self._fire_status_events(status)
+            # Log the raw payloads fetched in this poll
+            if self.telemetry is not None and (
+                sections := {
+                    key: value
+                    for key, value, is_fresh in (
+                        (KEY_STATUS, status, fresh),
+                        (KEY_SETTINGS, settings, settings_fresh),
+                        (KEY_DIAGNOSTICS, diagnostics, diagnostics_fresh),
+                        (KEY_TYPE_INFO, self._type_info_cache, type_fresh),
+                    )
+                    if is_fresh
+                }
+            ):
+                self.telemetry.add(time(), sections)
+
             data: DataType = {
                 KEY_STATUS: status,
                 KEY_SETTINGS: settings,
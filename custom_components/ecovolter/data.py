@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -22,3 +22,6 @@ class EcovolterData:
     client: EcovolterApiClient
     coordinator: EcovolterDataUpdateCoordinator
     integration: Integration
+    # Config the running entry was set up with or last updated to
+    applied_data: dict[str, Any] = field(default_factory=dict)
+    applied_options: dict[str, Any] = field(default_factory=dict)
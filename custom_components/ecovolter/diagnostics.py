@@ -0,0 +1,58 @@
+"""Diagnostics support for ecovolter."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import CONF_BASE_URI, CONF_SECRET_KEY, CONF_SERIAL_NUMBER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import EcovolterConfigEntry
+
+# The connection details are redacted (the base URI holds the charger's
+# address, or the path of a recording). The options (intervals, limits, entity
+# ids) and the charger's own payloads (measurements and settings) are kept, as
+# they are what a report is needed for.
+TO_REDACT = {CONF_BASE_URI, CONF_SECRET_KEY, CONF_SERIAL_NUMBER}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: EcovolterConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    client = entry.runtime_data.client
+    timings = coordinator.entity_timings
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "failures": coordinator.failures,
+            "stale_since": coordinator.stale_since,
+            "burst_until": coordinator.burst_until,
+        },
+        "client": {
+            "max_concurrent_requests": client.scheduler.max_concurrency,
+            "timeout": client.timeout,
+            "dropped_writes": client.governor.dropped,
+            "io_worker": None
+            if client.worker is None
+            else {
+                "chargers": len(client.worker.users),
+                "requests": client.worker.requests,
+                "batches": client.worker.batches,
+            },
+        },
+        "data": coordinator.data,
+        "entity_timing": None if timings is None else timings.report(),
+    }
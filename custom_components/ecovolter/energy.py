@@ -0,0 +1,109 @@
+"""Local energy integration for ecovolter."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .const import ENERGY_MAX_GAP_SECONDS
+from .utils import as_float
+
+PHASES = ("L1", "L2", "L3")
+
+
+def sample_power_kw(status: dict[str, Any]) -> float | None:
+    """Return the charging power of a status sample in kW.
+
+    Per-phase current × voltage is preferred as it has a finer resolution than
+    the reported actualPower; the latter is used when phases are incomplete.
+    """
+    total = 0.0
+    for phase in PHASES:
+        current = as_float(status.get(f"current{phase}"))
+        voltage = as_float(status.get(f"voltage{phase}"))
+        if current is None or voltage is None:
+            return as_float(status.get("actualPower"))
+        total += current * voltage
+    return total / 1000.0
+
+
+class EnergyIntegrator:
+    """Incremental trapezoidal integration of charging power into energy.
+
+    Only the last sample is kept, so every new sample costs O(1) no matter how
+    long the integrator has been running. Intervals longer than ``max_gap``
+    (missed polls, Home Assistant or charger restarts) and intervals with a
+    non-increasing timestamp are skipped instead of being bridged.
+    """
+
+    def __init__(self, max_gap: float = ENERGY_MAX_GAP_SECONDS) -> None:
+        """Initialize the integrator."""
+        self.total_kwh: float = 0.0
+        self.skipped_seconds: float = 0.0
+        self.max_gap = max_gap
+        self._last_ts: float | None = None
+        self._last_power: float | None = None
+
+    def restore(self, total_kwh: float) -> None:
+        """Add a previously persisted total on top of the running total."""
+        self.total_kwh += max(total_kwh, 0.0)
+
+    def reset_anchor(self) -> None:
+        """Forget the last sample so the next one starts a new segment."""
+        self._last_ts = None
+        self._last_power = None
+
+    def add_sample(self, ts: float, power_kw: float | None) -> float:
+        """Integrate a single sample and return the added energy in kWh."""
+        if power_kw is None:
+            self.reset_anchor()
+            return 0.0
+
+        power_kw = max(power_kw, 0.0)
+        added = 0.0
+        if self._last_ts is not None and self._last_power is not None:
+            dt = ts - self._last_ts
+            if 0.0 < dt <= self.max_gap:
+                added = 0.5 * (self._last_power + power_kw) * dt / 3600.0
+            elif dt > self.max_gap:
+                self.skipped_seconds += dt
+
+        self._last_ts = ts
+        self._last_power = power_kw
+        self.total_kwh += added
+        return added
+
+    def add_samples(self, ts: ArrayLike, power_kw: ArrayLike) -> float:
+        """Integrate a batch of samples and return the added energy in kWh.
+
+        Samples must be ordered by timestamp; NaN power marks a missing sample
+        and breaks the segment like ``add_sample(ts, None)`` does.
+        """
+        t = np.asarray(ts, dtype=np.float64)
+        p = np.asarray(power_kw, dtype=np.float64)
+        if t.size == 0:
+            return 0.0
+
+        if self._last_ts is not None and self._last_power is not None:
+            t = np.concatenate(([self._last_ts], t))
+            p = np.concatenate(([self._last_power], p))
+
+        p = np.clip(p, 0.0, None)
+        dt = np.diff(t)
+        # An interval next to a missing sample is neither integrated nor a gap,
+        # as add_sample starts a new segment after it
+        present = ~np.isnan(p[1:] + p[:-1])
+        valid = (dt > 0.0) & (dt <= self.max_gap) & present
+        gaps = (dt > self.max_gap) & present
+        added = float(np.sum(0.5 * (p[1:] + p[:-1])[valid] * dt[valid]) / 3600.0)
+
+        self.skipped_seconds += float(np.sum(dt[gaps]))
+        self.total_kwh += added
+        if np.isnan(p[-1]):
+            self.reset_anchor()
+        else:
+            self._last_ts = float(t[-1])
+            self._last_power = float(p[-1])
+        return added
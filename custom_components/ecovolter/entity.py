@@ -2,14 +2,13 @@
 
 from __future__ import annotations
 
-from homeassistant.helpers.device_registry import DeviceInfo
+from time import perf_counter
+from typing import Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (
-    ATTRIBUTION,
-    DOMAIN,
-    CONF_SERIAL_NUMBER,
-)
+from .const import ATTRIBUTION
 from .coordinator import EcovolterDataUpdateCoordinator
 
 
@@ -22,12 +21,32 @@ class IntegrationEcovolterEntity(CoordinatorEntity[EcovolterDataUpdateCoordinato
     def __init__(self, coordinator: EcovolterDataUpdateCoordinator) -> None:
         """Initialize."""
         super().__init__(coordinator)
-
-        serial = coordinator.config_entry.data.get(CONF_SERIAL_NUMBER) or "unknown"
-
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
-            manufacturer="EcoVolter",
-            model="EcoVolter II",  # change if you detect model dynamically
-            name=f"EcoVolter ({serial})",  # -> shows up instead of "undefined"
-        )
+        self._attr_device_info = coordinator.device_info
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state, timing it while entity timing is on."""
+        if (timings := self.coordinator.entity_timings) is None:
+            super()._handle_coordinator_update()
+            return
+        started = perf_counter()
+        super()._handle_coordinator_update()
+        timings.add(self.entity_id, self.platform.domain, perf_counter() - started)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Tell since when the data is stale while polls are failing."""
+        if (stale_since := self.coordinator.stale_since) is None:
+            return None
+        return {"stale_since": stale_since.isoformat()}
+
+    async def async_write_settings(self, data: dict[str, Any]) -> None:
+        """Write settings and refresh, unless the write changed nothing.
+
+        Writes from a service call made by a user are neither dropped nor
+        rate-limited, so they take precedence over writes from automations.
+        """
+        client = self.coordinator.config_entry.runtime_data.client
+        user = self._context is not None and self._context.user_id is not None
+        if await client.async_set_settings(data, user=user):
+            await self.coordinator.async_request_refresh()
@@ -0,0 +1,72 @@
+"""Semantic transition events for ecovolter."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    EVENT_BOOST_FINISHED,
+    EVENT_CHARGING_STARTED,
+    EVENT_CHARGING_STOPPED,
+    EVENT_THERMAL_LIMIT_ACTIVE,
+    EVENT_THERMAL_LIMIT_CLEARED,
+    EVENT_VEHICLE_CONNECTED,
+    EVENT_VEHICLE_DISCONNECTED,
+)
+from .utils import as_float
+
+# Status flag → events fired when it turns on / off
+FLAG_EVENTS: dict[str, tuple[str | None, str | None]] = {
+    "isVehicleConnected": (EVENT_VEHICLE_CONNECTED, EVENT_VEHICLE_DISCONNECTED),
+    "isCharging": (EVENT_CHARGING_STARTED, EVENT_CHARGING_STOPPED),
+    "isBoostModeActive": (None, EVENT_BOOST_FINISHED),
+}
+
+# Status keys sent along with the event of each flag
+FLAG_PAYLOAD: dict[str, tuple[str, ...]] = {
+    "isVehicleConnected": (),
+    "isCharging": ("actualPower", "chargedEnergy", "chargingTime"),
+    "isBoostModeActive": ("chargedEnergy",),
+}
+
+
+def _thermal_limit(status: dict[str, Any], max_current: float) -> float | None:
+    """Return the temperature current limit when it is below the maximum."""
+    limit = as_float(status.get("temperatureCurrentLimit"))
+    return limit if limit is not None and limit < max_current else None
+
+
+def status_events(
+    previous: dict[str, Any], current: dict[str, Any], max_current: float
+) -> list[tuple[str, dict[str, Any]]]:
+    """Return the events for the transitions between two status snapshots.
+
+    Only flags present in both snapshots are compared, so a key missing
+    from one response does not fire anything.
+    """
+    events: list[tuple[str, dict[str, Any]]] = []
+    for key, (on_event, off_event) in FLAG_EVENTS.items():
+        before, after = previous.get(key), current.get(key)
+        if before is None or after is None or bool(before) == bool(after):
+            continue
+        event = on_event if after else off_event
+        if event is not None:
+            events.append((event, {name: current.get(name) for name in FLAG_PAYLOAD[key]}))
+
+    if None in (
+        previous.get("temperatureCurrentLimit"),
+        current.get("temperatureCurrentLimit"),
+    ):
+        return events
+    before_limit = _thermal_limit(previous, max_current)
+    after_limit = _thermal_limit(current, max_current)
+    if before_limit is None and after_limit is not None:
+        events.append(
+            (
+                EVENT_THERMAL_LIMIT_ACTIVE,
+                {"limit": after_limit, "temperatures": current.get("temperatures")},
+            )
+        )
+    elif before_limit is not None and after_limit is None:
+        events.append((EVENT_THERMAL_LIMIT_CLEARED, {}))
+    return events
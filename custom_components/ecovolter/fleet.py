@@ -0,0 +1,353 @@
+"""Shared supply current allocation for ecovolter fleets."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers.debounce import Debouncer
+
+from .api import EcovolterApiClientError
+from .const import (
+    CAR_LIMITED_HEADROOM,
+    CONF_ALLOCATION_PRIORITY,
+    CONF_SUPPLY_GROUP,
+    CONF_SUPPLY_LIMIT,
+    CONF_SURPLUS_ENTITY,
+    DATA_FLEET,
+    FLEET_ALLOCATION_COOLDOWN_SECONDS,
+    LOGGER,
+    MIN_CURRENT,
+)
+from .energy import PHASES
+from .utils import (
+    as_float,
+    get_charger_type_maximum_charging_current,
+    get_settings,
+    get_status,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import EcovolterConfigEntry
+
+EPSILON = 1e-6
+
+
+@dataclass(slots=True)
+class ChargerDemand:
+    """What the allocator needs to know about one charger."""
+
+    entry_id: str
+    priority: int
+    phases: tuple[bool, bool, bool]
+    max_current: float
+
+
+def allocate_currents(
+    demands: list[ChargerDemand], limit: float
+) -> dict[str, int | None]:
+    """Divide a per-phase supply limit among charging chargers.
+
+    Higher priorities are served first; chargers of equal priority share
+    fairly by progressive filling: all of them are raised together until they
+    hit their own maximum or one of their phases runs out. Everyone gets at
+    least MIN_CURRENT or nothing (``None``), since a charger cannot charge
+    below it. Results are floored to whole amperes.
+    """
+    remaining = [float(limit)] * 3
+    result: dict[str, int | None] = {}
+
+    for priority in sorted({demand.priority for demand in demands}, reverse=True):
+        tier = [demand for demand in demands if demand.priority == priority]
+        level: dict[str, float] = {}
+
+        # 1) Minimum current, in order, for as many chargers as fit
+        for demand in tier:
+            used = [p for p in range(3) if demand.phases[p]]
+            if all(remaining[p] + EPSILON >= MIN_CURRENT for p in used):
+                for p in used:
+                    remaining[p] -= MIN_CURRENT
+                level[demand.entry_id] = MIN_CURRENT
+            else:
+                result[demand.entry_id] = None
+
+        # 2) Progressive filling of what is left
+        active = [
+            demand
+            for demand in tier
+            if demand.entry_id in level and demand.max_current > MIN_CURRENT
+        ]
+        while active:
+            users = [sum(demand.phases[p] for demand in active) for p in range(3)]
+            step = min(
+                min(remaining[p] / users[p] for p in range(3) if users[p]),
+                min(demand.max_current - level[demand.entry_id] for demand in active),
+            )
+            for demand in active:
+                level[demand.entry_id] += step
+            for p in range(3):
+                remaining[p] -= step * users[p]
+            active = [
+                demand
+                for demand in active
+                if demand.max_current - level[demand.entry_id] > EPSILON
+                and all(remaining[p] > EPSILON for p in range(3) if demand.phases[p])
+            ]
+
+        for entry_id, current in level.items():
+            result[entry_id] = int(current + EPSILON)
+
+    return result
+
+
+def charger_demand(entry: EcovolterConfigEntry) -> ChargerDemand | None:
+    """Return the demand of a charger, or None when it has no session.
+
+    A connected charger with charging enabled keeps at least MIN_CURRENT
+    reserved even while the car is not drawing, so it cannot overload the
+    supply when it starts.
+    """
+    coordinator = entry.runtime_data.coordinator
+    status = get_status(coordinator)
+    settings = get_settings(coordinator)
+    if not (status.get("isVehicleConnected") and settings.get("isChargingEnable")):
+        return None
+
+    currents = [as_float(status.get(f"current{phase}")) or 0.0 for phase in PHASES]
+    if status.get("isThreePhaseModeActive"):
+        phases = (True, True, True)
+    else:
+        # Single phase: the phase that carries the current (L1 when idle)
+        busiest = max(range(3), key=lambda p: currents[p])
+        phases = (busiest == 0, busiest == 1, busiest == 2)
+
+    max_current = float(get_charger_type_maximum_charging_current(coordinator))
+    if isinstance(setting_max := settings.get("maxCurrent"), (int, float)):
+        max_current = min(max_current, float(setting_max))
+
+    # A car drawing well below its setpoint does not need more; let others use it
+    target = as_float(settings.get("targetCurrent"))
+    drawn = max(currents)
+    if target is not None and drawn + CAR_LIMITED_HEADROOM < target:
+        max_current = min(max_current, max(drawn + CAR_LIMITED_HEADROOM, MIN_CURRENT))
+
+    return ChargerDemand(
+        entry_id=entry.entry_id,
+        priority=int(entry.options.get(CONF_ALLOCATION_PRIORITY, 0)),
+        phases=phases,
+        max_current=max_current,
+    )
+
+
+def _enabled_phases(entry: EcovolterConfigEntry) -> range:
+    """Return the phases a charger uses once charging is enabled."""
+    settings = get_settings(entry.runtime_data.coordinator)
+    return range(3) if settings.get("isThreePhaseModeEnable") else range(1)
+
+
+class SupplyGroup:
+    """Chargers behind one supply fuse and the control loop sharing it.
+
+    Every coordinator update of a member schedules one allocation cycle;
+    updates arriving close together are coalesced by a debouncer. A cycle
+    computes all setpoints at once and writes only the changed ones, in one
+    concurrent pass.
+
+    The supply limit takes precedence over surplus control: the current a
+    cycle leaves a charger is its cap (see ``supply_cap``), which the surplus
+    controller of that charger stays below. The group only lowers the
+    setpoint of such a charger and leaves pausing and resuming it within
+    the cap to the controller.
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        """Initialize the group."""
+        self.name = name
+        self.members: dict[str, EcovolterConfigEntry] = {}
+        self.caps: dict[str, int] = {}
+        # Chargers paused by the group → when the pause was written
+        self._paused: dict[str, float] = {}
+        self.last_cycle_seconds: float | None = None
+        self._debouncer: Debouncer = Debouncer(
+            hass,
+            LOGGER,
+            cooldown=FLEET_ALLOCATION_COOLDOWN_SECONDS,
+            immediate=False,
+            function=self.async_allocate,
+        )
+
+    @property
+    def limit(self) -> float:
+        """Return the per-phase limit; the strictest member setting wins."""
+        return min(
+            float(entry.options[CONF_SUPPLY_LIMIT]) for entry in self.members.values()
+        )
+
+    @callback
+    def async_schedule(self) -> None:
+        """Schedule an allocation cycle."""
+        self._debouncer.async_schedule_call()
+
+    async def async_allocate(self) -> None:
+        """Run one allocation cycle and push the changed setpoints."""
+        if not self.members:
+            return
+        started = perf_counter()
+
+        demands = [
+            demand
+            for entry in self.members.values()
+            if (demand := charger_demand(entry)) is not None
+        ]
+        allocation = allocate_currents(demands, self.limit)
+
+        # Per-phase current handed out, to know whether paused chargers fit
+        used = [0.0, 0.0, 0.0]
+        for demand in demands:
+            current = allocation[demand.entry_id]
+            for p in range(3):
+                used[p] += (current or 0) * demand.phases[p]
+
+        # The share of a charger, or the room left for one that is not charging
+        for entry_id, entry in self.members.items():
+            if entry_id in allocation:
+                self.caps[entry_id] = allocation[entry_id] or 0
+            else:
+                room = min(self.limit - used[p] for p in _enabled_phases(entry))
+                self.caps[entry_id] = max(0, int(room + EPSILON))
+
+        writes: dict[str, dict[str, int | bool]] = {}
+        # Pauses and decreases protect the fuse, so they are not rate-limited
+        urgent: set[str] = set()
+        for entry_id, current in allocation.items():
+            entry = self.members[entry_id]
+            target = get_settings(entry.runtime_data.coordinator).get("targetCurrent")
+            if current is None:
+                writes[entry_id] = {"isChargingEnable": False}
+                urgent.add(entry_id)
+            elif target != current and not (
+                entry.options.get(CONF_SURPLUS_ENTITY)
+                and isinstance(target, (int, float))
+                and target <= current
+            ):
+                writes[entry_id] = {"targetCurrent": current}
+                if not isinstance(target, (int, float)) or current < target:
+                    urgent.add(entry_id)
+
+        # Resume chargers we paused once there is room for them again
+        for entry_id, paused_at in list(self._paused.items()):
+            member = self.members.get(entry_id)
+            if member is None:
+                del self._paused[entry_id]
+                continue
+            if entry_id in writes:
+                continue
+            governor = member.runtime_data.client.governor
+            if (
+                governor.settings.get("isChargingEnable")
+                or governor.requested.get("isChargingEnable") != paused_at
+                or member.options.get(CONF_SURPLUS_ENTITY)
+            ):
+                # Switched on or off by someone else meanwhile (even to off
+                # again), or resumed by its surplus controller: not ours any more
+                del self._paused[entry_id]
+                continue
+            phases = _enabled_phases(member)
+            if all(self.limit - used[p] >= MIN_CURRENT for p in phases):
+                for p in phases:
+                    used[p] += MIN_CURRENT
+                writes[entry_id] = {
+                    "isChargingEnable": True,
+                    "targetCurrent": MIN_CURRENT,
+                }
+
+        if writes:
+            await asyncio.gather(
+                *(
+                    self._async_write(entry_id, data, entry_id in urgent)
+                    for entry_id, data in writes.items()
+                )
+            )
+        self.last_cycle_seconds = perf_counter() - started
+        LOGGER.debug(
+            "Supply group %s: %s chargers, %s writes in %.3f s",
+            self.name,
+            len(demands),
+            len(writes),
+            self.last_cycle_seconds,
+        )
+
+    async def _async_write(
+        self, entry_id: str, data: dict[str, int | bool], urgent: bool
+    ) -> None:
+        """Write one charger's setpoint; a failure must not stop the others."""
+        # The charger may have been unloaded since the cycle started
+        if (member := self.members.get(entry_id)) is None:
+            return
+        runtime = member.runtime_data
+        try:
+            written = await runtime.client.async_set_settings(data, urgent=urgent)
+        except EcovolterApiClientError as exception:
+            LOGGER.warning(
+                "Supply group %s: cannot set %s - %s", self.name, data, exception
+            )
+            return
+        if not written or entry_id not in self.members:
+            return
+        if data.get("isChargingEnable") is False:
+            self._paused[entry_id] = runtime.client.governor.requested[
+                "isChargingEnable"
+            ]
+        elif data.get("isChargingEnable"):
+            self._paused.pop(entry_id, None)
+        await runtime.coordinator.async_request_refresh()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel a scheduled cycle."""
+        self._debouncer.async_cancel()
+
+
+def supply_cap(hass: HomeAssistant, entry: EcovolterConfigEntry) -> float:
+    """Return the current the supply group leaves a charger, in A.
+
+    Chargers outside a group, or not allocated yet, are not capped.
+    """
+    name = entry.options.get(CONF_SUPPLY_GROUP)
+    group = hass.data.get(DATA_FLEET, {}).get(name) if name else None
+    if group is None:
+        return math.inf
+    return group.caps.get(entry.entry_id, math.inf)
+
+
+@callback
+def async_join_supply_group(hass: HomeAssistant, entry: EcovolterConfigEntry) -> None:
+    """Add a charger to the supply group configured in its options."""
+    name = entry.options.get(CONF_SUPPLY_GROUP)
+    if not name or not entry.options.get(CONF_SUPPLY_LIMIT):
+        return
+
+    groups = hass.data.setdefault(DATA_FLEET, {})
+    group = groups.get(name)
+    if group is None:
+        group = groups[name] = SupplyGroup(hass, name)
+    group.members[entry.entry_id] = entry
+
+    @callback
+    def _async_leave() -> None:
+        group.members.pop(entry.entry_id, None)
+        group.caps.pop(entry.entry_id, None)
+        if not group.members:
+            groups.pop(name, None)
+            group.async_shutdown()
+
+    entry.async_on_unload(
+        entry.runtime_data.coordinator.async_add_listener(group.async_schedule)
+    )
+    entry.async_on_unload(_async_leave)
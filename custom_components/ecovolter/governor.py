@@ -0,0 +1,95 @@
+"""Settings write governance for ecovolter."""
+
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+from typing import Any
+
+
+class WriteBudget:
+    """Token bucket bounding how often settings are written.
+
+    A few writes may go out back to back, so a change is applied at once,
+    but in the long run no more than one write per refill period is made.
+    """
+
+    def __init__(self, burst: int, refill_seconds: float) -> None:
+        """Initialize a full bucket."""
+        self._burst = burst
+        self._refill_seconds = refill_seconds
+        self._tokens = float(burst)
+        self._updated = monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) / self._refill_seconds
+        )
+        self._updated = now
+
+    def try_acquire(self, now: float | None = None) -> bool:
+        """Take a token if one is available."""
+        self._refill(monotonic() if now is None else now)
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def take(self, now: float | None = None) -> None:
+        """Take a token even if none is available, going into debt.
+
+        The debt is bounded by one full burst, so it delays others by at most
+        one burst worth of refill time.
+        """
+        self._refill(monotonic() if now is None else now)
+        self._tokens = max(self._tokens - 1, -self._burst)
+
+    def retry_after(self, now: float | None = None) -> float:
+        """Return the seconds until the next token is available."""
+        self._refill(monotonic() if now is None else now)
+        return max(0.0, (1 - self._tokens) * self._refill_seconds)
+
+
+class WriteGovernor:
+    """Decide which settings writes reach one charger, and when.
+
+    Automation values equal to the last known settings are dropped, so only
+    real changes are written. A user may have changed the charger since the
+    settings were last fetched, so user writes are never dropped. Writes draw
+    from a ``WriteBudget``: writes made by a user, and urgent ones, go out at
+    once (and are charged to the budget), while automation writes wait in order until the
+    budget allows them.
+    """
+
+    def __init__(self, burst: int, refill_seconds: float) -> None:
+        """Initialize the governor."""
+        self.settings: dict[str, Any] = {}
+        self.dropped = 0
+        self.written_at = float("-inf")  # monotonic time of the last write
+        # Monotonic time each key was last asked for, dropped writes included
+        self.requested: dict[str, float] = {}
+        self._budget = WriteBudget(burst, refill_seconds)
+        self._lock = asyncio.Lock()
+
+    def changes(self, data: dict[str, Any], user: bool = False) -> dict[str, Any]:
+        """Return the part of a write that changes the known settings."""
+        self.requested.update(dict.fromkeys(data, monotonic()))
+        if user:
+            return dict(data)
+        changes = {
+            key: value
+            for key, value in data.items()
+            if key not in self.settings or self.settings[key] != value
+        }
+        if not changes:
+            self.dropped += 1
+        return changes
+
+    async def async_acquire(self, immediate: bool) -> None:
+        """Wait until a write may be sent; immediate writes do not wait."""
+        if immediate:
+            self._budget.take()
+            return
+        async with self._lock:
+            while not self._budget.try_acquire():
+                await asyncio.sleep(self._budget.retry_after())
@@ -0,0 +1,185 @@
+"""Polling worker thread for ecovolter fleets."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Coroutine
+from concurrent.futures import Future
+from functools import partial
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import aiohttp
+from aiohttp.resolver import AsyncResolver
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, callback
+from homeassistant.helpers.aiohttp_client import (
+    ENABLE_CLEANUP_CLOSED,
+    MAXIMUM_CONNECTIONS,
+    MAXIMUM_CONNECTIONS_PER_HOST,
+    SERVER_SOFTWARE,
+    HomeAssistantTCPConnector,
+)
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util.ssl import client_context
+
+from .api import EcovolterApiClientCommunicationError
+from .const import DATA_IO_WORKER, DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import EcovolterConfigEntry
+
+_T = TypeVar("_T")
+
+
+class IoWorker:
+    """Thread with its own event loop running the charger requests.
+
+    The HTTP traffic, HMAC signing and JSON decoding of the chargers run on
+    the worker loop, with a client session of its own. Responses are handed
+    back to the main loop in batches: the ones completed before the main
+    loop gets to them are delivered in a single wakeup. The worker keeps no
+    reference to a delivered response, so the main loop owns it alone.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the worker."""
+        self.hass = hass
+        self.session: aiohttp.ClientSession | None = None
+        self.users: set[str] = set()
+        self.requests = 0
+        self.batches = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._finished: list[tuple[asyncio.Future[Any], Future[Any]]] = []
+        self._unsub_stop: CALLBACK_TYPE | None = None
+
+    def start(self) -> None:
+        """Start the thread."""
+        loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, args=(loop,), name=f"{DOMAIN}_io", daemon=True
+        )
+        self._thread.start()
+        self._loop = loop
+        self._unsub_stop = self.hass.bus.async_listen(
+            EVENT_HOMEASSISTANT_STOP, self._async_handle_stop
+        )
+
+    def client_session(self) -> aiohttp.ClientSession:
+        """Return the session of the worker; call it on the worker loop only.
+
+        Home Assistant's shared session is bound to its own loop, so the
+        worker makes one like it: the same connector settings and user agent.
+        """
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=HomeAssistantTCPConnector(
+                    enable_cleanup_closed=ENABLE_CLEANUP_CLOSED,
+                    ssl=client_context(),
+                    limit=MAXIMUM_CONNECTIONS,
+                    limit_per_host=MAXIMUM_CONNECTIONS_PER_HOST,
+                    resolver=AsyncResolver(),
+                ),
+                headers={aiohttp.hdrs.USER_AGENT: SERVER_SOFTWARE},
+                json_serialize=json_dumps,
+            )
+        return self.session
+
+    async def async_stop(self) -> None:
+        """Close the session and stop the thread."""
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        if self._loop is None or self._thread is None:
+            return
+        if self.session is not None:
+            await self.async_run(self.session.close())
+            self.session = None
+        loop, self._loop = self._loop, None
+        loop.call_soon_threadsafe(loop.stop)
+        await self.hass.async_add_executor_job(self._thread.join)
+        self._thread = None
+
+    async def _async_handle_stop(self, _event: Event) -> None:
+        """Stop with Home Assistant, which does not unload the entries."""
+        await self.async_stop()
+
+    async def async_run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        """Run a coroutine on the worker loop and return its result."""
+        if self._loop is None:
+            coro.close()
+            msg = "I/O worker is not running"
+            raise EcovolterApiClientCommunicationError(msg)
+        future: asyncio.Future[_T] = self.hass.loop.create_future()
+        worker_future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        worker_future.add_done_callback(partial(self._finish, future))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            worker_future.cancel()
+            raise
+
+    def _finish(self, future: asyncio.Future[Any], worker_future: Future[Any]) -> None:
+        """Queue a finished request; wake the main loop once per batch."""
+        with self._lock:
+            self._finished.append((future, worker_future))
+            if len(self._finished) > 1:
+                return  # a delivery is already scheduled
+        self.hass.loop.call_soon_threadsafe(self._deliver)
+
+    def _deliver(self) -> None:
+        """Resolve the finished requests on the main loop."""
+        with self._lock:
+            finished, self._finished = self._finished, []
+        self.batches += 1
+        self.requests += len(finished)
+        for future, worker_future in finished:
+            if future.done():
+                continue  # cancelled meanwhile
+            if worker_future.cancelled():
+                future.cancel()
+            elif (exception := worker_future.exception()) is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(worker_future.result())
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop) -> None:
+        """Run the worker loop until stopped."""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+
+@callback
+def async_acquire_io_worker(
+    hass: HomeAssistant, entry: EcovolterConfigEntry
+) -> IoWorker:
+    """Return the shared worker, started if needed, until the entry unloads."""
+    if (worker := hass.data.get(DATA_IO_WORKER)) is None:
+        worker = hass.data[DATA_IO_WORKER] = IoWorker(hass)
+        worker.start()
+        LOGGER.debug("Started the I/O worker")
+    worker.users.add(entry.entry_id)
+
+    async def _async_release() -> None:
+        worker.users.discard(entry.entry_id)
+        if worker.users or hass.data.get(DATA_IO_WORKER) is not worker:
+            return
+        del hass.data[DATA_IO_WORKER]
+        await worker.async_stop()
+        LOGGER.debug("Stopped the I/O worker")
+
+    entry.async_on_unload(_async_release)
+    return worker
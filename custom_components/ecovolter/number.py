@@ -22,7 +22,7 @@ from homeassistant.helpers.entity import EntityCategory
 from .utils import (
     camel_to_snake,
     get_settings,
-    get_charger_type_maximum_charging_current,
+    get_maximum_current,
     clamp_int,
     as_float,
 )
@@ -137,21 +137,9 @@ class IntegrationEcovolterNumber(IntegrationEcovolterEntity, NumberEntity):
         desc_max = cast(float, self.entity_description.native_max_value)
         key = self.entity_description.key
 
-        # maxCurrent needs to be capped by charger type max current
-        if key == "maxCurrent":
-            return float(get_charger_type_maximum_charging_current(self.coordinator))
-
-        # For current-related entities, cap by maxCurrent if available
-        if key in CURRENT_KEYS:
-            # Use charger type limit if available
-            type_max = get_charger_type_maximum_charging_current(self.coordinator)
-
-            # Use maxCurrent setting if defined and lower than type_max
-            dynamic_max = get_settings(self.coordinator).get("maxCurrent")
-
-            if isinstance(dynamic_max, (int, float)):
-                return float(min(dynamic_max, type_max))
-            return float(type_max)
+        # maxCurrent is capped by the charger type, target/boost also by maxCurrent
+        if key == "maxCurrent" or key in CURRENT_KEYS:
+            return float(get_maximum_current(self.coordinator, key))
 
         return desc_max
 
@@ -193,7 +181,4 @@ class IntegrationEcovolterNumber(IntegrationEcovolterEntity, NumberEntity):
         else:
             value = int(value)
 
-        await self.coordinator.config_entry.runtime_data.client.async_set_settings(
-            {key: value}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.async_write_settings({key: value})
@@ -0,0 +1,107 @@
+"""Connectivity probe for ecovolter."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from math import ceil
+from statistics import median, pstdev
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    MAX_REQUEST_TIMEOUT_SECONDS,
+    MIN_REQUEST_TIMEOUT_SECONDS,
+    MIN_UPDATE_INTERVAL_SECONDS,
+    PROBE_INTERVAL_FACTOR,
+    PROBE_ROUNDS,
+    PROBE_TIMEOUT_FACTOR,
+)
+from .utils import clamp_int
+
+if TYPE_CHECKING:
+    from .api import EcovolterApiClient
+
+
+@dataclass(slots=True)
+class ProbeResult:
+    """Round-trip times of a charger and the polling they allow, in seconds."""
+
+    rounds: int
+    rtt: dict[str, float]  # median per endpoint
+    poll: float  # median time to fetch all sections at once
+    jitter: float  # standard deviation of the poll time
+    min_interval: int
+    timeout: int
+
+    def placeholders(self) -> dict[str, str]:
+        """Return the results as config flow description placeholders."""
+        return {
+            "rounds": str(self.rounds),
+            **{name: f"{1000 * rtt:.0f}" for name, rtt in self.rtt.items()},
+            "poll": f"{1000 * self.poll:.0f}",
+            "jitter": f"{1000 * self.jitter:.0f}",
+            "min_interval": str(self.min_interval),
+            "timeout": str(self.timeout),
+        }
+
+
+def probe_result(rtts: dict[str, list[float]], polls: list[float]) -> ProbeResult:
+    """Recommend the polling from the measured times.
+
+    A poll is assumed to take as long as the slowest one measured, or its
+    median plus three standard deviations if that is more. The interval
+    keeps the charger busy at most half the time; the timeout is a multiple
+    of the slowest single answer.
+    """
+    poll, jitter = median(polls), pstdev(polls)
+    busy = max(max(polls), poll + 3 * jitter)
+    slowest = max(max(times) for times in rtts.values())
+    return ProbeResult(
+        rounds=len(polls),
+        rtt={name: median(times) for name, times in rtts.items()},
+        poll=poll,
+        jitter=jitter,
+        min_interval=max(
+            MIN_UPDATE_INTERVAL_SECONDS, ceil(PROBE_INTERVAL_FACTOR * busy)
+        ),
+        timeout=clamp_int(
+            ceil(PROBE_TIMEOUT_FACTOR * slowest),
+            MIN_REQUEST_TIMEOUT_SECONDS,
+            MAX_REQUEST_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+async def _async_timed(request: Callable[[], Awaitable[Any]]) -> float:
+    started = monotonic()
+    await request()
+    return monotonic() - started
+
+
+async def async_probe(
+    client: EcovolterApiClient, rounds: int = PROBE_ROUNDS
+) -> ProbeResult:
+    """Fetch all sections at once a few times and time every request.
+
+    Requests go through the client's scheduler like a regular poll, so the
+    times include waiting for a free request slot.
+    """
+    requests = {
+        "status": client.async_get_status,
+        "settings": client.async_get_settings,
+        "diagnostics": client.async_get_diagnostics,
+        "type": client.async_get_type,
+    }
+    rtts: dict[str, list[float]] = {name: [] for name in requests}
+    polls: list[float] = []
+    for _ in range(rounds):
+        started = monotonic()
+        times = await asyncio.gather(
+            *(_async_timed(request) for request in requests.values())
+        )
+        polls.append(monotonic() - started)
+        for name, elapsed in zip(requests, times, strict=True):
+            rtts[name].append(elapsed)
+    return probe_result(rtts, polls)
@@ -0,0 +1,76 @@
+"""Refresh cycle profiling for ecovolter."""
+
+from __future__ import annotations
+
+import cProfile
+from collections.abc import Coroutine, Generator, Iterator
+from contextlib import contextmanager
+from typing import Any, Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class _Profiled(Generic[_T]):
+    """Awaitable running a coroutine with the profiler on during its steps only.
+
+    The profiler is switched off whenever the coroutine suspends, so the
+    other tasks that run on the event loop meanwhile are not recorded.
+    """
+
+    def __init__(self, profile: RefreshProfile, coro: Coroutine[Any, Any, _T]) -> None:
+        self._profile = profile
+        self._coro = coro
+
+    def __await__(self) -> Generator[Any, Any, _T]:
+        value: Any = None
+        error: BaseException | None = None
+        while True:
+            with self._profile.running():
+                try:
+                    if error is None:
+                        future = self._coro.send(value)
+                    else:
+                        future = self._coro.throw(error)
+                except StopIteration as stop:
+                    return stop.value
+            try:
+                value, error = (yield future), None
+            # Whatever the awaiting task gets (cancellation included) is
+            # thrown into the coroutine, like a plain await would
+            except BaseException as exception:  # noqa: BLE001
+                value, error = None, exception
+
+
+class RefreshProfile:
+    """cProfile profile of the refresh cycles of one or more coordinators.
+
+    Only the code run by the coordinator is recorded: fetching and
+    processing the data, and dispatching the update to the listeners, which
+    includes the evaluation of the entity properties.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profile."""
+        self.profile = cProfile.Profile()
+        self._depth = 0
+
+    @contextmanager
+    def running(self) -> Iterator[None]:
+        """Record the code run in the block."""
+        if self._depth == 0:
+            self.profile.enable()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.profile.disable()
+
+    async def async_run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        """Await a coroutine and record its steps."""
+        return await _Profiled(self, coro)
+
+    def dump(self, path: str) -> None:
+        """Write the profile in pstats format (blocking I/O)."""
+        self.profile.dump_stats(path)
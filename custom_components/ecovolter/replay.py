@@ -0,0 +1,180 @@
+"""Replay of recorded telemetry for ecovolter."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import monotonic
+from typing import TYPE_CHECKING, Any, TypeGuard
+
+from yarl import URL
+
+from .api import EcovolterApiClient, EcovolterApiClientCommunicationError
+from .const import (
+    KEY_DIAGNOSTICS,
+    KEY_SETTINGS,
+    KEY_STATUS,
+    KEY_TYPE_INFO,
+    REPLAY_URI_PREFIX,
+)
+from .telemetry import TELEMETRY_SUFFIX, read_telemetry
+
+if TYPE_CHECKING:
+    import aiohttp
+    from homeassistant.core import HomeAssistant
+
+
+def is_replay_uri(base_uri: str | None) -> TypeGuard[str]:
+    """Return whether a base URI points to a recording."""
+    return base_uri is not None and base_uri.startswith(REPLAY_URI_PREFIX)
+
+
+def load_recording(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the records of a telemetry file or directory (blocking I/O).
+
+    The files are read one after the other as the records are consumed.
+    """
+    paths = sorted(path.glob(f"*{TELEMETRY_SUFFIX}")) if path.is_dir() else [path]
+    for file in paths:
+        yield from read_telemetry(file)
+
+
+@dataclass(slots=True)
+class Recording:
+    """The polls of a recording, each with the settings and diagnostics then."""
+
+    type_info: Any = field(default_factory=dict)
+    polls: list[tuple[float, Any, Any, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, Any]]) -> Recording:
+        """Index the polls of a stream of records.
+
+        Records without a status only update the sections served with the
+        following polls.
+        """
+        recording = cls()
+        settings: Any = {}
+        diagnostics: Any = {}
+        for record in records:
+            recording.type_info = record.get(KEY_TYPE_INFO, recording.type_info)
+            settings = record.get(KEY_SETTINGS, settings)
+            diagnostics = record.get(KEY_DIAGNOSTICS, diagnostics)
+            if KEY_STATUS in record:
+                recording.polls.append(
+                    (float(record["ts"]), record[KEY_STATUS], settings, diagnostics)
+                )
+        return recording
+
+
+class EcovolterReplayClient(EcovolterApiClient):
+    """API client serving payloads recorded by the telemetry log.
+
+    Every status request moves on to the next recorded poll; settings and
+    diagnostics are the ones last recorded up to that poll. With a ``speed``,
+    a status request waits until the recorded time since the first poll,
+    divided by the speed, has passed (1 = real time); without one, polls are
+    served as fast as they are requested. Writes are kept on top of the
+    recorded settings. After the last poll, requests fail like an offline
+    charger.
+    """
+
+    def __init__(
+        self,
+        serial_number: str,
+        recording: Recording,
+        session: aiohttp.ClientSession,
+        *,
+        speed: float | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the client."""
+        super().__init__(serial_number, "", None, session, **kwargs)
+        self.speed = speed
+        self._type_info = recording.type_info
+        self._polls = recording.polls
+        self._index = -1
+        self._started: float | None = None
+        self._written: dict[str, Any] = {}
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of polls not replayed yet."""
+        return len(self._polls) - self._index - 1
+
+    async def _async_next_poll(self) -> Any:
+        """Move on to the next poll, at the replay speed; return its status."""
+        if self.remaining <= 0:
+            msg = "Replay finished"
+            raise EcovolterApiClientCommunicationError(msg)
+        self._index += 1
+        ts, status, _, _ = self._polls[self._index]
+        if self.speed:
+            now = monotonic()
+            if self._started is None:
+                self._started = now
+            delay = (ts - self._polls[0][0]) / self.speed - (now - self._started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return status
+
+    async def _api_wrapper(
+        self,
+        method: str,
+        path: str,
+        data: dict | None = None,
+        headers: dict | None = None,
+    ) -> Any:
+        """Serve a request from the recording."""
+        if method == "patch":
+            self._written.update(
+                {
+                    key: value
+                    for key, value in (data or {}).items()
+                    if key != "timestamp"
+                }
+            )
+            return {}
+        if path == "/status":
+            return await self._async_next_poll()
+        if path == "/type":
+            return self._type_info
+        if not self._polls:
+            msg = "Empty recording"
+            raise EcovolterApiClientCommunicationError(msg)
+        _, _, settings, diagnostics = self._polls[max(self._index, 0)]
+        if path == "/settings":
+            return {**settings, **self._written}
+        return diagnostics
+
+
+async def async_create_replay_client(
+    hass: HomeAssistant,
+    serial_number: str,
+    base_uri: str,
+    session: aiohttp.ClientSession,
+    **kwargs: Any,
+) -> EcovolterReplayClient:
+    """Create a client replaying the recording a replay URI points to.
+
+    The URI is ``replay://<path>`` with the path of a telemetry file or
+    directory, optionally followed by ``?speed=<factor>`` (default 1).
+    """
+    url = URL(base_uri)
+    try:
+        speed = float(url.query.get("speed", 1))
+        # The records are streamed into the index, in the executor
+        recording = await hass.async_add_executor_job(
+            Recording.from_records, load_recording(Path(url.path))
+        )
+    except (OSError, ValueError, EOFError) as exception:
+        msg = f"Error reading recording {url.path} - {exception}"
+        raise EcovolterApiClientCommunicationError(msg) from exception
+    if not recording.polls:
+        msg = f"No polls in {url.path}"
+        raise EcovolterApiClientCommunicationError(msg)
+    return EcovolterReplayClient(
+        serial_number, recording, session, speed=speed or None, **kwargs
+    )
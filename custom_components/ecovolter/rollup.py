@@ -0,0 +1,190 @@
+"""Hourly rollup store for ecovolter."""
+
+from __future__ import annotations
+
+import asyncio
+import mmap
+import struct
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from time import time
+from typing import TYPE_CHECKING
+
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+HOUR_SECONDS = 3600
+
+# File layout: a header with the first hour, then one fixed-width record per
+# hour since then, so the record of an hour is found by its offset alone.
+# Hours without data are zero-filled (hour 0 marks a gap).
+ROLLUP_MAGIC = b"EVR1"
+ROLLUP_HEADER = struct.Struct("<4sI")  # magic, first hour
+ROLLUP_RECORD = struct.Struct("<IH2xdff")  # hour, sessions, energy, max power, cost
+
+
+@dataclass(slots=True)
+class HourlyRollup:
+    """Aggregates of one hour; ``hour`` counts hours since the epoch."""
+
+    hour: int
+    sessions: int = 0  # sessions started in this hour
+    energy_kwh: float = 0.0
+    max_power_kw: float = 0.0
+    cost: float = 0.0
+
+    @property
+    def start(self) -> float:
+        """Return the timestamp the hour starts at."""
+        return float(self.hour * HOUR_SECONDS)
+
+
+class RollupFile:
+    """Packed file of hourly records of one charger (blocking I/O)."""
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the file."""
+        self.path = path
+
+    def write(self, rollup: HourlyRollup) -> None:
+        """Write the record of an hour, replacing a previous one."""
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_bytes(ROLLUP_HEADER.pack(ROLLUP_MAGIC, rollup.hour))
+        with self.path.open("r+b") as file:
+            _, first = ROLLUP_HEADER.unpack(file.read(ROLLUP_HEADER.size))
+            if rollup.hour < first:
+                LOGGER.debug("Hour %s before the rollup store, ignored", rollup.hour)
+                return
+            # Seeking past the end zero-fills the hours in between
+            file.seek(ROLLUP_HEADER.size + (rollup.hour - first) * ROLLUP_RECORD.size)
+            file.write(ROLLUP_RECORD.pack(*astuple(rollup)))
+
+    def read_last(self) -> HourlyRollup | None:
+        """Return the most recent record."""
+        if not self.path.exists():
+            return None
+        with self.path.open("rb") as file:
+            size = file.seek(0, 2)
+            if size < ROLLUP_HEADER.size + ROLLUP_RECORD.size:
+                return None
+            file.seek(size - ROLLUP_RECORD.size)
+            return HourlyRollup(*ROLLUP_RECORD.unpack(file.read(ROLLUP_RECORD.size)))
+
+    def remove(self) -> None:
+        """Delete the file if it exists."""
+        self.path.unlink(missing_ok=True)
+
+    def read_range(self, start_hour: int, end_hour: int) -> list[HourlyRollup]:
+        """Return the records of the hours in [start_hour, end_hour).
+
+        The range is located by offset and only its pages are read from the
+        memory map, so the time taken does not depend on the file size.
+        """
+        if not self.path.exists():
+            return []
+        with self.path.open("rb") as file:
+            if file.seek(0, 2) <= ROLLUP_HEADER.size:
+                return []
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                _, first = ROLLUP_HEADER.unpack_from(data)
+                count = (len(data) - ROLLUP_HEADER.size) // ROLLUP_RECORD.size
+                lo = min(max(start_hour - first, 0), count)
+                hi = min(max(end_hour - first, lo), count)
+                offset = ROLLUP_HEADER.size
+                view = memoryview(data)[
+                    offset + lo * ROLLUP_RECORD.size : offset + hi * ROLLUP_RECORD.size
+                ]
+                try:
+                    return [
+                        HourlyRollup(*row)
+                        for row in ROLLUP_RECORD.iter_unpack(view)
+                        if row[0]  # skip gaps
+                    ]
+                finally:
+                    view.release()
+
+
+class RollupStore:
+    """Roll coordinator samples up into hourly records on disk.
+
+    The running hour is aggregated in memory and written when the next hour
+    starts (and on unload, so a restart continues it). Each charger has its
+    own file next to the session store.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.file = RollupFile(
+            Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.rollup"))
+        )
+        self.current: HourlyRollup | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Continue the running hour after a restart."""
+        last = await self.hass.async_add_executor_job(self.file.read_last)
+        if last is not None and last.hour == int(time() // HOUR_SECONDS):
+            self.current = last
+
+    def add_sample(
+        self,
+        ts: float,
+        power_kw: float | None,
+        energy_kwh: float,
+        cost: float,
+        session_started: bool,
+    ) -> None:
+        """Add one coordinator sample to the hour it falls in."""
+        hour = int(ts // HOUR_SECONDS)
+        if self.current is not None and self.current.hour != hour:
+            self.hass.async_create_background_task(
+                self._async_write(self.current), "ecovolter rollup write"
+            )
+            self.current = None
+        if self.current is None:
+            self.current = HourlyRollup(hour)
+
+        rollup = self.current
+        rollup.energy_kwh += energy_kwh
+        rollup.cost += cost
+        if power_kw is not None:
+            rollup.max_power_kw = max(rollup.max_power_kw, power_kw)
+        if session_started:
+            rollup.sessions += 1
+
+    async def async_flush(self) -> None:
+        """Write the running hour now, e.g. when the entry is unloaded."""
+        if self.current is not None:
+            await self._async_write(self.current)
+
+    async def async_remove(self) -> None:
+        """Delete the file, e.g. when the entry is removed."""
+        async with self._lock:
+            await self.hass.async_add_executor_job(self.file.remove)
+
+    async def async_range(self, start: float, end: float) -> list[HourlyRollup]:
+        """Return the hours that start in [start, end), the running one included."""
+        start_hour = -int(-start // HOUR_SECONDS)  # first hour starting at or after
+        end_hour = -int(-end // HOUR_SECONDS)
+        async with self._lock:
+            rollups = await self.hass.async_add_executor_job(
+                self.file.read_range, start_hour, end_hour
+            )
+        current = self.current
+        if current is not None and start_hour <= current.hour < end_hour:
+            rollups = [r for r in rollups if r.hour != current.hour] + [current]
+        return rollups
+
+    async def _async_write(self, rollup: HourlyRollup) -> None:
+        record = HourlyRollup(*astuple(rollup))  # the running hour keeps changing
+        async with self._lock:
+            try:
+                await self.hass.async_add_executor_job(self.file.write, record)
+            except OSError as exception:
+                LOGGER.warning("Writing hourly rollup failed: %s", exception)
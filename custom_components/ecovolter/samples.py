@@ -0,0 +1,94 @@
+"""In-memory sample window for ecovolter."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from .utils import as_float
+
+# Columns of a sample row; currentLimit is the lowest of the limits in force
+COLUMNS: tuple[str, ...] = (
+    "ts",
+    "actualPower",
+    "currentL1",
+    "currentL2",
+    "currentL3",
+    "voltageL1",
+    "voltageL2",
+    "voltageL3",
+    "currentLimit",
+)
+COL = {name: idx for idx, name in enumerate(COLUMNS)}
+
+
+def _nan_if_none(value: float | None) -> float:
+    return np.nan if value is None else value
+
+
+def sample_row(
+    ts: float, status: dict[str, Any], settings: dict[str, Any]
+) -> list[float]:
+    """Build a window row from one status/settings snapshot."""
+    limits = [
+        value
+        for value in (
+            as_float(settings.get("targetCurrent")),
+            as_float(status.get("temperatureCurrentLimit")),
+            as_float(status.get("adapterMaxCurrent")),
+        )
+        if value
+    ]
+    return [
+        ts,
+        *(_nan_if_none(as_float(status.get(name))) for name in COLUMNS[1:-1]),
+        min(limits) if limits else np.nan,
+    ]
+
+
+class SampleWindow:
+    """Fixed-size ring buffer of the most recent samples of one charger.
+
+    Rows live in a preallocated float array, so appending never allocates and
+    readers get whole columns for vectorized processing. Missing values are NaN.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the window."""
+        self.capacity = capacity
+        self.data = np.full((capacity, len(COLUMNS)), np.nan)
+        self.size = 0
+        self.appended = 0  # rows ever appended, for readers following along
+        self._next = 0
+
+    def append(self, rows: np.ndarray) -> np.ndarray:
+        """Write a batch of rows and return the ring positions they took.
+
+        Batches larger than the window keep only their newest rows.
+        """
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))[-self.capacity :]
+        positions = (self._next + np.arange(len(rows))) % self.capacity
+        self.data[positions] = rows
+        self._next = int((self._next + len(rows)) % self.capacity)
+        self.size = min(self.size + len(rows), self.capacity)
+        self.appended += len(rows)
+        return positions
+
+    def positions_to_overwrite(self, count: int) -> np.ndarray:
+        """Return the ring positions holding rows the next append will evict."""
+        count = min(count, self.capacity)
+        positions = (self._next + np.arange(count)) % self.capacity
+        free = self.capacity - self.size
+        return positions[free:] if free else positions
+
+    def latest(self, count: int) -> np.ndarray:
+        """Return the newest rows in chronological order (a copy)."""
+        count = min(count, self.size)
+        return self.data[(self._next - count + np.arange(count)) % self.capacity]
+
+    def ordered(self) -> np.ndarray:
+        """Return the filled rows in chronological order (a copy)."""
+        if self.size < self.capacity:
+            return self.data[: self.size].copy()
+        return np.roll(self.data, -self._next, axis=0)
@@ -0,0 +1,100 @@
+"""Per-charger request scheduling for ecovolter."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from itertools import count
+
+# Priority lanes, most urgent first
+LANE_WRITE = 0
+LANE_STATUS = 1
+LANE_SETTINGS = 2
+LANE_BACKGROUND = 3  # /diagnostic and /type
+
+
+class RequestPreemptedError(Exception):
+    """Exception to indicate a queued request was dropped for a more urgent one."""
+
+
+@dataclass(order=True, slots=True)
+class _Waiter:
+    lane: int
+    seq: int
+    future: asyncio.Future[None] = field(compare=False)
+    preemptible: bool = field(compare=False)
+
+
+class RequestScheduler:
+    """Admit requests to one charger by priority, a few at a time.
+
+    At most ``max_concurrency`` requests run at once; the others wait in a
+    heap ordered by lane and arrival. A request arriving in a more urgent
+    lane drops the preemptible requests queued in less urgent lanes, which
+    fail with ``RequestPreemptedError`` instead of delaying it.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        """Initialize the scheduler."""
+        self.max_concurrency = max_concurrency
+        self._running = 0
+        self._queue: list[_Waiter] = []
+        self._seq = count()
+
+    def set_max_concurrency(self, max_concurrency: int) -> None:
+        """Change the limit; a higher one admits waiters at once."""
+        self.max_concurrency = max_concurrency
+        self._admit()
+
+    @asynccontextmanager
+    async def async_slot(
+        self, lane: int, *, preemptible: bool = True
+    ) -> AsyncIterator[None]:
+        """Wait for a slot in the given lane and hold it."""
+        self._preempt(lane)
+        if self._running < self.max_concurrency and not self._queue:
+            self._running += 1
+        else:
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._queue, _Waiter(lane, next(self._seq), future, preemptible))
+            try:
+                await future
+            except asyncio.CancelledError:
+                # Granted just before being cancelled: pass the slot on
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    self._release()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _preempt(self, lane: int) -> None:
+        """Drop queued preemptible requests of less urgent lanes."""
+        kept: list[_Waiter] = []
+        for waiter in self._queue:
+            if waiter.lane > lane and waiter.preemptible:
+                if not waiter.future.done():
+                    waiter.future.set_exception(RequestPreemptedError())
+            else:
+                kept.append(waiter)
+        if len(kept) != len(self._queue):
+            heapq.heapify(kept)
+            self._queue = kept
+
+    def _release(self) -> None:
+        """Free a slot and admit the most urgent waiters."""
+        self._running -= 1
+        self._admit()
+
+    def _admit(self) -> None:
+        """Admit the most urgent waiters while slots are free."""
+        while self._queue and self._running < self.max_concurrency:
+            waiter = heapq.heappop(self._queue)
+            if waiter.future.done():
+                continue  # cancelled while waiting
+            self._running += 1
+            waiter.future.set_result(None)
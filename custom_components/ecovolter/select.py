@@ -77,7 +77,4 @@ class EcovolterCurrencySelect(IntegrationEcovolterEntity, SelectEntity):
         value = CURRENCY_INV_MAP.get(option)
         if value is None:
             raise ValueError(f"Unsupported currency option: {option}")
-        await self.coordinator.config_entry.runtime_data.client.async_set_settings(
-            {"currency": value}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.async_write_settings({"currency": value})
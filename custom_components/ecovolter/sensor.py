@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, cast
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
@@ -12,6 +14,7 @@ from homeassistant.components.sensor import (
 )
 
 from homeassistant.const import (
+    PERCENTAGE,
     UnitOfTime,
     UnitOfEnergy,
     UnitOfPower,
@@ -29,12 +32,15 @@ from .utils import (
     get_settings,
     get_diagnostics,
     get_type_info,
+    get_currency,
     extract_temperature,
 )
 from .const import (
     CURRENCY_MAP,
     CHARGER_TYPE_LABELS,
+    CONF_STATISTICS_MODE,
 )
+from .statistics import STATISTICS_KEYS
 
 from .entity import IntegrationEcovolterEntity
 
@@ -265,6 +271,41 @@ ENTITY_DESCRIPTIONS = (
     ),
 )
 
+# Computed by the power-quality analyzer over the sample window; the
+# snake_case key is the name of the analyzer property
+POWER_QUALITY_DESCRIPTIONS = (
+    SensorEntityDescription(
+        key="phaseImbalance",
+        translation_key="phase_imbalance",
+        icon="mdi:scale-unbalanced",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key="voltageSags",
+        translation_key="voltage_sags",
+        icon="mdi:sine-wave",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="voltageSwells",
+        translation_key="voltage_swells",
+        icon="mdi:sine-wave",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="currentLimitShare",
+        translation_key="current_limit_share",
+        icon="mdi:gauge-full",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        suggested_display_precision=0,
+    ),
+)
+
 TEMPERATURE_KEYS = {
     "temperature_internal",
     "temperature_adapter1",
@@ -286,11 +327,15 @@ async def async_setup_entry(
 
     entities: list[SensorEntity] = []
 
-    # 1) generic sensors
+    # 1) generic sensors; in statistics mode the high-churn measurements are
+    # aggregated by the integration, so the recorder must not compile them too
+    statistics_mode = entry.options.get(CONF_STATISTICS_MODE, False)
     entities.extend(
         IntegrationEcovolterSensor(
             coordinator=entry.runtime_data.coordinator,
-            entity_description=entity_description,
+            entity_description=replace(entity_description, state_class=None)
+            if statistics_mode and entity_description.key in STATISTICS_KEYS
+            else entity_description,
         )
         for entity_description in ENTITY_DESCRIPTIONS
     )
@@ -309,6 +354,58 @@ async def async_setup_entry(
         )
     )
 
+    # 3) locally integrated energy
+    entities.append(
+        EcovolterIntegratedEnergySensor(
+            entry.runtime_data.coordinator,
+            SensorEntityDescription(
+                key="integratedEnergy",
+                translation_key="integrated_energy",
+                icon="mdi:sigma",
+                device_class=SensorDeviceClass.ENERGY,
+                state_class=SensorStateClass.TOTAL_INCREASING,
+                native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+                suggested_display_precision=4,
+            ),
+        )
+    )
+
+    # 4) tariff costs, in the currency selected on the charger
+    entities.append(
+        EcovolterTariffCostSensor(
+            entry.runtime_data.coordinator,
+            SensorEntityDescription(
+                key="tariffCost",
+                translation_key="tariff_cost",
+                icon="mdi:cash-clock",
+                device_class=SensorDeviceClass.MONETARY,
+                state_class=SensorStateClass.TOTAL,
+                suggested_display_precision=2,
+            ),
+        )
+    )
+    entities.append(
+        EcovolterSessionCostSensor(
+            entry.runtime_data.coordinator,
+            SensorEntityDescription(
+                key="sessionCost",
+                translation_key="session_cost",
+                icon="mdi:cash",
+                device_class=SensorDeviceClass.MONETARY,
+                suggested_display_precision=2,
+            ),
+        )
+    )
+
+    # 5) power quality over the sample window
+    entities.extend(
+        EcovolterPowerQualitySensor(
+            coordinator=entry.runtime_data.coordinator,
+            entity_description=entity_description,
+        )
+        for entity_description in POWER_QUALITY_DESCRIPTIONS
+    )
+
     async_add_entities(entities)
 
 
@@ -407,3 +504,164 @@ class EcovolterChargerTypeSensor(IntegrationEcovolterEntity, SensorEntity):
             return CHARGER_TYPE_LABELS[raw]
 
         return None
+
+
+class EcovolterIntegratedEnergySensor(IntegrationEcovolterEntity, RestoreSensor):
+    """Energy integrated locally from the polled power samples.
+
+    Cross-checks the coarse device counters; the total survives restarts.
+    """
+
+    def __init__(
+        self,
+        coordinator: EcovolterDataUpdateCoordinator,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{camel_to_snake(entity_description.key)}"
+
+    @property
+    def suggested_object_id(self) -> str:
+        """This is used to generate the entity_id."""
+        return camel_to_snake(self.entity_description.key)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the integrated total from before the restart."""
+        await super().async_added_to_hass()
+        last = await self.async_get_last_sensor_data()
+        restored = as_float(last.native_value) if last is not None else None
+        if restored is not None:
+            self.coordinator.energy.restore(restored)
+
+    @property
+    def native_value(self) -> float:
+        """Return the integrated energy in kWh."""
+        return self.coordinator.energy.total_kwh
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Expose the time that could not be integrated because of gaps."""
+        return {
+            **(super().extra_state_attributes or {}),
+            "skipped_seconds": round(self.coordinator.energy.skipped_seconds),
+        }
+
+
+class EcovolterTariffCostSensor(IntegrationEcovolterEntity, RestoreSensor):
+    """Running cost of the integrated energy priced by the tariff engine."""
+
+    def __init__(
+        self,
+        coordinator: EcovolterDataUpdateCoordinator,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{camel_to_snake(entity_description.key)}"
+
+    @property
+    def suggested_object_id(self) -> str:
+        """This is used to generate the entity_id."""
+        return camel_to_snake(self.entity_description.key)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the running cost from before the restart."""
+        await super().async_added_to_hass()
+        last = await self.async_get_last_sensor_data()
+        restored = as_float(last.native_value) if last is not None else None
+        if restored is not None:
+            self.coordinator.tariff.restore(restored)
+
+    @property
+    def native_value(self) -> float:
+        """Return the running cost."""
+        return self.coordinator.tariff.total_cost
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        """Return the currency selected on the charger."""
+        return get_currency(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Expose the price that was applied to the last sample."""
+        return {
+            **(super().extra_state_attributes or {}),
+            "price": self.coordinator.tariff.price,
+        }
+
+
+class EcovolterSessionCostSensor(IntegrationEcovolterEntity, SensorEntity):
+    """Tariff cost of the running charging session, or of the last one."""
+
+    def __init__(
+        self,
+        coordinator: EcovolterDataUpdateCoordinator,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{camel_to_snake(entity_description.key)}"
+
+    @property
+    def suggested_object_id(self) -> str:
+        """This is used to generate the entity_id."""
+        return camel_to_snake(self.entity_description.key)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the session cost."""
+        sessions = self.coordinator.sessions
+        session = sessions.active or (sessions.sessions[-1] if sessions.sessions else None)
+        return None if session is None else session.cost
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        """Return the currency selected on the charger."""
+        return get_currency(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Tell whether the value belongs to a running session."""
+        return {
+            **(super().extra_state_attributes or {}),
+            "session_active": self.coordinator.sessions.active is not None,
+        }
+
+
+class EcovolterPowerQualitySensor(IntegrationEcovolterEntity, SensorEntity):
+    """Power-quality figure computed over the recent sample window."""
+
+    def __init__(
+        self,
+        coordinator: EcovolterDataUpdateCoordinator,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{camel_to_snake(entity_description.key)}"
+
+    @property
+    def suggested_object_id(self) -> str:
+        """This is used to generate the entity_id."""
+        return camel_to_snake(self.entity_description.key)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the analyzer value."""
+        return getattr(
+            self.coordinator.power_quality, camel_to_snake(self.entity_description.key)
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Expose how many samples the value covers."""
+        return {
+            **(super().extra_state_attributes or {}),
+            "window_samples": self.coordinator.window.size,
+        }
@@ -0,0 +1,468 @@
+"""Services for ecovolter."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.core import ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .api import EcovolterApiClientError
+from .const import (
+    APPLY_SETTINGS_CONCURRENCY,
+    BURST_MAX_CHARGERS,
+    BURST_MAX_DURATION_SECONDS,
+    CONF_SERIAL_NUMBER,
+    CURRENCY_INV_MAP,
+    CURRENCY_MAP,
+    DEFAULT_BURST_DURATION_SECONDS,
+    DEFAULT_BURST_INTERVAL_SECONDS,
+    DEFAULT_PROFILE_DURATION_SECONDS,
+    DOMAIN,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_JSONL,
+    LOGGER,
+    MAX_CURRENT,
+    MIN_CURRENT,
+    MIN_UPDATE_INTERVAL_SECONDS,
+    PROFILE_MAX_DURATION_SECONDS,
+)
+from .profiling import RefreshProfile
+from .utils import as_float, get_maximum_current, get_settings
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import EcovolterConfigEntry
+    from .session import ChargingSession
+
+SERVICE_EXPORT_SESSIONS = "export_sessions"
+SERVICE_APPLY_SETTINGS = "apply_settings"
+SERVICE_BURST_SAMPLING = "burst_sampling"
+SERVICE_GET_HOURLY_ROLLUPS = "get_hourly_rollups"
+SERVICE_PROFILE = "profile"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_FILENAME = "filename"
+ATTR_FORMAT = "format"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_SETTINGS = "settings"
+ATTR_DURATION = "duration"
+ATTR_INTERVAL = "interval"
+
+EXPORT_COLUMNS = (
+    "serial_number",
+    "start",
+    "end",
+    "energy_kwh",
+    "peak_power_kw",
+    "average_current_a",
+    "cost",
+    "currency",
+    "kwh_price",
+    "boost_seconds",
+    "three_phase_seconds",
+)
+
+EXPORT_SESSIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_FORMAT, default=EXPORT_FORMAT_CSV): vol.In(
+            [EXPORT_FORMAT_CSV, EXPORT_FORMAT_JSONL]
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+    }
+)
+
+_CURRENT = vol.All(vol.Coerce(int), vol.Range(min=MIN_CURRENT, max=MAX_CURRENT))
+
+# Writable charger settings and how their values are validated
+SETTINGS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("targetCurrent"): _CURRENT,
+        vol.Optional("boostCurrent"): _CURRENT,
+        vol.Optional("maxCurrent"): _CURRENT,
+        vol.Optional("boostTime"): vol.All(
+            vol.Coerce(int),
+            vol.Range(min=0, max=86340),  # 23 hours, 59 minutes
+        ),
+        vol.Optional("kwhPrice"): vol.All(
+            vol.Coerce(float),
+            vol.Range(min=0, max=999.99),
+            lambda value: round(value, 2),
+        ),
+        vol.Optional("currency"): vol.All(
+            vol.Upper, vol.In(CURRENCY_INV_MAP), CURRENCY_INV_MAP.__getitem__
+        ),
+        vol.Optional("isChargingEnable"): cv.boolean,
+        vol.Optional("isThreePhaseModeEnable"): cv.boolean,
+        vol.Optional("isBoostModeEnable"): cv.boolean,
+        vol.Optional("isLocalPanelEnable"): cv.boolean,
+    }
+)
+
+APPLY_SETTINGS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SETTINGS): vol.All(
+            SETTINGS_SCHEMA, vol.Length(min=1, msg="No settings given")
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+BURST_SAMPLING_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(
+            ATTR_DURATION, default=timedelta(seconds=DEFAULT_BURST_DURATION_SECONDS)
+        ): vol.All(
+            cv.time_period,
+            vol.Range(
+                min=timedelta(seconds=1),
+                max=timedelta(seconds=BURST_MAX_DURATION_SECONDS),
+            ),
+        ),
+        vol.Optional(ATTR_INTERVAL, default=DEFAULT_BURST_INTERVAL_SECONDS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MIN_UPDATE_INTERVAL_SECONDS)
+        ),
+    }
+)
+
+GET_HOURLY_ROLLUPS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            ATTR_DURATION, default=timedelta(seconds=DEFAULT_PROFILE_DURATION_SECONDS)
+        ): vol.All(
+            cv.time_period,
+            vol.Range(
+                min=timedelta(seconds=1),
+                max=timedelta(seconds=PROFILE_MAX_DURATION_SECONDS),
+            ),
+        ),
+        vol.Optional(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+
+def _loaded_entries(
+    hass: HomeAssistant, entry_ids: list[str] | None
+) -> list[EcovolterConfigEntry]:
+    """Return the targeted loaded entries; all of them when none are given."""
+    entries: list[EcovolterConfigEntry] = hass.config_entries.async_loaded_entries(
+        DOMAIN
+    )
+    if not entry_ids:
+        return entries
+    by_id = {entry.entry_id: entry for entry in entries}
+    missing = [entry_id for entry_id in entry_ids if entry_id not in by_id]
+    if missing:
+        raise ServiceValidationError(
+            f"Config entries not loaded: {', '.join(missing)}"
+        )
+    return [by_id[entry_id] for entry_id in entry_ids]
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    if value is None:
+        return None
+    return dt_util.as_utc(value).timestamp()
+
+
+def _isoformat(ts: float | None) -> str | None:
+    return None if ts is None else dt_util.utc_from_timestamp(ts).isoformat()
+
+
+async def _async_output_path(
+    hass: HomeAssistant, filename: str | None, default: str
+) -> str:
+    """Return the path of a file to write, relative to the config directory.
+
+    Default names are generated by the integration and always written to the
+    configuration directory; a given name has to be in a directory listed in
+    ``allowlist_external_dirs``.
+    """
+    if not filename:
+        return hass.config.path(default)
+    path = hass.config.path(filename)
+    if not await hass.async_add_executor_job(hass.config.is_allowed_path, path):
+        raise ServiceValidationError(
+            f"Cannot write to {path}, add its directory to allowlist_external_dirs"
+        )
+    return path
+
+
+def _session_rows(
+    sources: Iterable[tuple[dict[str, Any], list[ChargingSession]]],
+) -> Iterator[tuple[Any, ...]]:
+    """Turn per-charger sessions into export rows, lazily."""
+    for meta, sessions in sources:
+        for session in sessions:
+            average_current = session.average_current
+            yield (
+                meta["serial_number"],
+                _isoformat(session.start),
+                _isoformat(session.end),
+                round(session.energy_kwh, 4),
+                round(session.peak_power_kw, 3),
+                None if average_current is None else round(average_current, 2),
+                round(session.cost, 2),
+                meta["currency"],
+                meta["kwh_price"],
+                round(session.boost_seconds),
+                round(session.three_phase_seconds),
+            )
+
+
+def _write_rows(path: str, fmt: str, rows: Iterator[tuple[Any, ...]]) -> int:
+    """Stream rows to a file (runs in the executor) and return their count."""
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if fmt == EXPORT_FORMAT_CSV:
+            writer = csv.writer(file)
+            writer.writerow(EXPORT_COLUMNS)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in rows:
+                file.write(json.dumps(dict(zip(EXPORT_COLUMNS, row, strict=True))))
+                file.write("\n")
+                count += 1
+    return count
+
+
+async def _async_export_sessions(call: ServiceCall) -> ServiceResponse:
+    """Export finished charging sessions of the targeted chargers to a file."""
+    hass = call.hass
+    fmt = call.data[ATTR_FORMAT]
+    path = await _async_output_path(
+        hass,
+        call.data.get(ATTR_FILENAME),
+        f"ecovolter_sessions_{dt_util.utcnow():%Y%m%d_%H%M%S}.{fmt}",
+    )
+    start = _timestamp(call.data.get(ATTR_START))
+    end = _timestamp(call.data.get(ATTR_END))
+
+    sources = []
+    for entry in _loaded_entries(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+        coordinator = entry.runtime_data.coordinator
+        settings = get_settings(coordinator)
+        currency = settings.get("currency")
+        meta = {
+            "serial_number": entry.data.get(CONF_SERIAL_NUMBER),
+            "currency": CURRENCY_MAP.get(currency)
+            if isinstance(currency, int)
+            else None,
+            "kwh_price": as_float(settings.get("kwhPrice")),
+        }
+        # Copied here, the tracker may add or drop sessions while writing
+        sources.append((meta, list(coordinator.sessions.iter_range(start, end))))
+
+    count = await hass.async_add_executor_job(
+        _write_rows, path, fmt, _session_rows(sources)
+    )
+    LOGGER.debug("Exported %s charging sessions to %s", count, path)
+    return {"path": path, "sessions": count}
+
+
+def _current_limit_error(
+    entry: EcovolterConfigEntry, data: dict[str, Any]
+) -> str | None:
+    """Tell which current in the settings is above the limit of a charger."""
+    for key in ("maxCurrent", "targetCurrent", "boostCurrent"):
+        if key not in data:
+            continue
+        limit = get_maximum_current(
+            entry.runtime_data.coordinator, key, data.get("maxCurrent")
+        )
+        if data[key] > limit:
+            return f"{key} {data[key]} A is above the limit of this charger ({limit} A)"
+    return None
+
+
+async def _async_apply_settings(call: ServiceCall) -> ServiceResponse:
+    """Write the same settings to the targeted chargers concurrently."""
+    data: dict[str, Any] = call.data[ATTR_SETTINGS]
+    user = call.context.user_id is not None
+    semaphore = asyncio.Semaphore(APPLY_SETTINGS_CONCURRENCY)
+
+    async def _async_apply(entry: EcovolterConfigEntry) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            "serial_number": entry.data.get(CONF_SERIAL_NUMBER),
+            "written": False,
+            "error": None,
+        }
+        if error := _current_limit_error(entry, data):
+            result["error"] = error
+            return result
+        async with semaphore:
+            try:
+                result["written"] = await entry.runtime_data.client.async_set_settings(
+                    dict(data), user=user
+                )
+            except EcovolterApiClientError as exception:
+                result["error"] = str(exception)
+                return result
+        if result["written"]:
+            # Debounced, so concurrent writes to one charger share a refresh
+            await entry.runtime_data.coordinator.async_request_refresh()
+        return result
+
+    entries = _loaded_entries(call.hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+    results = await asyncio.gather(*(_async_apply(entry) for entry in entries))
+    LOGGER.debug("Applied %s to %s chargers", data, len(entries))
+    return {
+        "results": {
+            entry.entry_id: result
+            for entry, result in zip(entries, results, strict=True)
+        }
+    }
+
+
+async def _async_burst_sampling(call: ServiceCall) -> ServiceResponse:
+    """Poll the status of the targeted chargers at a high rate for a while."""
+    entries = _loaded_entries(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    bursting = {
+        entry.entry_id
+        for entry in call.hass.config_entries.async_loaded_entries(DOMAIN)
+        if entry.runtime_data.coordinator.burst_until is not None
+    }
+    # Chargers already in burst mode are only extended
+    if len(bursting | {entry.entry_id for entry in entries}) > BURST_MAX_CHARGERS:
+        raise ServiceValidationError(
+            f"At most {BURST_MAX_CHARGERS} chargers can be in burst mode at once"
+        )
+
+    interval = timedelta(seconds=call.data[ATTR_INTERVAL])
+    return {
+        "until": {
+            entry.entry_id: entry.runtime_data.coordinator.async_start_burst(
+                interval, call.data[ATTR_DURATION]
+            ).isoformat()
+            for entry in entries
+        }
+    }
+
+
+async def _async_get_hourly_rollups(call: ServiceCall) -> ServiceResponse:
+    """Return the hourly rollups of the targeted chargers in a time range."""
+    start = dt_util.as_utc(call.data[ATTR_START]).timestamp()
+    end = _timestamp(call.data.get(ATTR_END)) or dt_util.utcnow().timestamp()
+    entries = _loaded_entries(call.hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+    ranges = await asyncio.gather(
+        *(
+            entry.runtime_data.coordinator.rollup.async_range(start, end)
+            for entry in entries
+        )
+    )
+    return {
+        "rollups": {
+            entry.entry_id: {
+                "serial_number": entry.data.get(CONF_SERIAL_NUMBER),
+                "hours": [
+                    {
+                        "start": _isoformat(rollup.start),
+                        "energy_kwh": round(rollup.energy_kwh, 4),
+                        "max_power_kw": round(rollup.max_power_kw, 3),
+                        "cost": round(rollup.cost, 2),
+                        "sessions": rollup.sessions,
+                    }
+                    for rollup in rollups
+                ],
+            }
+            for entry, rollups in zip(entries, ranges, strict=True)
+        }
+    }
+
+
+async def _async_profile(call: ServiceCall) -> ServiceResponse:
+    """Profile the refresh cycles of the targeted chargers for a while."""
+    hass = call.hass
+    path = await _async_output_path(
+        hass,
+        call.data.get(ATTR_FILENAME),
+        f"ecovolter_profile_{dt_util.utcnow():%Y%m%d_%H%M%S}.prof",
+    )
+
+    entries = _loaded_entries(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+    if any(
+        entry.runtime_data.coordinator.profile is not None
+        for entry in hass.config_entries.async_loaded_entries(DOMAIN)
+    ):
+        raise ServiceValidationError("A profile is already running")
+    profile = RefreshProfile()
+    try:
+        with profile.running():
+            pass  # fails while another profiler (e.g. the Profiler integration) runs
+    except ValueError as exception:
+        raise ServiceValidationError(f"Cannot start profiling: {exception}") from exception
+
+    for entry in entries:
+        entry.runtime_data.coordinator.profile = profile
+    try:
+        await asyncio.sleep(call.data[ATTR_DURATION].total_seconds())
+    finally:
+        for entry in entries:
+            entry.runtime_data.coordinator.profile = None
+    await hass.async_add_executor_job(profile.dump, path)
+    LOGGER.debug("Wrote profile of %s chargers to %s", len(entries), path)
+    return {"path": path}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the ecovolter services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_SESSIONS,
+        _async_export_sessions,
+        schema=EXPORT_SESSIONS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_SETTINGS,
+        _async_apply_settings,
+        schema=APPLY_SETTINGS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BURST_SAMPLING,
+        _async_burst_sampling,
+        schema=BURST_SAMPLING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HOURLY_ROLLUPS,
+        _async_get_hourly_rollups,
+        schema=GET_HOURLY_ROLLUPS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,190 @@
+"""Charging session tracking for ecovolter."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterator
+from dataclasses import astuple, dataclass
+from itertools import islice
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    ENERGY_MAX_GAP_SECONDS,
+    SESSION_HISTORY_MAX,
+    SESSION_SAVE_DELAY_SECONDS,
+    SESSION_STORAGE_VERSION,
+)
+from .energy import PHASES
+from .utils import as_float
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+@dataclass(slots=True)
+class ChargingSession:
+    """Aggregates of a single charging session.
+
+    Stored as a flat row (see ``as_row``/``from_row``) to keep the store small.
+    """
+
+    start: float
+    end: float | None = None
+    energy_kwh: float = 0.0
+    peak_power_kw: float = 0.0
+    current_seconds: float = 0.0  # ∫ current dt, in A·s
+    charging_seconds: float = 0.0
+    cost: float = 0.0
+    boost_seconds: float = 0.0
+    three_phase_seconds: float = 0.0
+    last_ts: float | None = None
+
+    @property
+    def average_current(self) -> float | None:
+        """Return the time-weighted average phase current in A."""
+        if self.charging_seconds <= 0:
+            return None
+        return self.current_seconds / self.charging_seconds
+
+    def as_row(self) -> list[Any]:
+        """Return the session as a compact row."""
+        return list(astuple(self))
+
+    @classmethod
+    def from_row(cls, row: list[Any]) -> ChargingSession:
+        """Build a session from a compact row."""
+        return cls(*row)
+
+
+class ChargingSessionTracker:
+    """Track charging sessions from the coordinator sample stream.
+
+    A session runs while a vehicle is connected and charging is enabled. Every
+    sample updates the running aggregates in O(1); finished sessions are kept in
+    a compact per-entry store so they survive restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the tracker."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SESSION_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.sessions"
+        )
+        self.active: ChargingSession | None = None
+        self.sessions: list[ChargingSession] = []
+        self._last_sample: tuple[float, float | None, bool, bool] | None = None
+
+    async def async_load(self) -> None:
+        """Load finished sessions and the interrupted active session."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self.sessions = [ChargingSession.from_row(row) for row in stored["sessions"]]
+        if stored.get("active"):
+            self.active = ChargingSession.from_row(stored["active"])
+
+    async def async_flush(self) -> None:
+        """Write pending changes now, e.g. when the entry is unloaded."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the stored sessions, e.g. when the entry is removed."""
+        await self._store.async_remove()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "sessions": [session.as_row() for session in self.sessions],
+            "active": self.active.as_row() if self.active else None,
+        }
+
+    def iter_range(
+        self, start: float | None = None, end: float | None = None
+    ) -> Iterator[ChargingSession]:
+        """Yield finished sessions that started in [start, end).
+
+        Sessions are appended in start order, so the list itself is the index
+        and the range is located by bisection instead of a scan.
+        """
+        key = attrgetter("start")
+        lo = 0 if start is None else bisect_left(self.sessions, start, key=key)
+        hi = (
+            len(self.sessions)
+            if end is None
+            else bisect_left(self.sessions, end, lo=lo, key=key)
+        )
+        return islice(self.sessions, lo, hi)
+
+    def add_sample(
+        self,
+        ts: float,
+        status: dict[str, Any],
+        settings: dict[str, Any],
+        power_kw: float | None,
+        energy_kwh: float,
+        cost: float,
+    ) -> None:
+        """Update the session aggregates with one coordinator sample."""
+        in_session = bool(status.get("isVehicleConnected")) and bool(
+            settings.get("isChargingEnable")
+        )
+
+        # A session restored after a restart ended at its last sample at the
+        # latest, not when the first new sample arrives
+        restored = self.active is not None and self._last_sample is None
+        last_ts = self.active.last_ts if self.active is not None else None
+
+        if not in_session:
+            self._finish(last_ts if restored and last_ts is not None else ts)
+            self._last_sample = None
+            return
+
+        if self.active is None:
+            self.active = ChargingSession(start=ts)
+        elif (
+            restored and last_ts is not None and ts - last_ts > ENERGY_MAX_GAP_SECONDS
+        ):
+            self._finish(last_ts)
+            self.active = ChargingSession(start=ts)
+
+        session = self.active
+        session.energy_kwh += energy_kwh
+        session.cost += cost
+        if power_kw is not None:
+            session.peak_power_kw = max(session.peak_power_kw, power_kw)
+
+        # Durations use the state of the previous sample (left rectangle rule)
+        if self._last_sample is not None:
+            last_ts, last_current, last_boost, last_three_phase = self._last_sample
+            dt = ts - last_ts
+            if 0 < dt <= ENERGY_MAX_GAP_SECONDS:
+                if last_current is not None:
+                    session.current_seconds += last_current * dt
+                    session.charging_seconds += dt
+                if last_boost:
+                    session.boost_seconds += dt
+                if last_three_phase:
+                    session.three_phase_seconds += dt
+
+        currents = [as_float(status.get(f"current{phase}")) for phase in PHASES]
+        current = max((c for c in currents if c is not None), default=None)
+        self._last_sample = (
+            ts,
+            current,
+            bool(status.get("isBoostModeActive")),
+            bool(status.get("isThreePhaseModeActive")),
+        )
+        session.last_ts = ts
+        self._store.async_delay_save(self._data_to_save, SESSION_SAVE_DELAY_SECONDS)
+
+    def _finish(self, ts: float) -> None:
+        """Close the active session, if any, and queue it for persisting."""
+        if self.active is None:
+            return
+        self.active.end = ts
+        self.sessions.append(self.active)
+        del self.sessions[:-SESSION_HISTORY_MAX]
+        self.active = None
+        self._store.async_delay_save(self._data_to_save, SESSION_SAVE_DELAY_SECONDS)
@@ -0,0 +1,233 @@
+"""Locally aggregated long-term statistics for ecovolter."""
+
+from __future__ import annotations
+
+from dataclasses import astuple, dataclass, field
+from typing import TYPE_CHECKING, Any, cast
+
+from homeassistant.components.recorder import models as recorder_models
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.const import (
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfEnergy,
+    UnitOfPower,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import (
+    DOMAIN,
+    LOGGER,
+    SESSION_SAVE_DELAY_SECONDS,
+    STATISTICS_PENDING_MAX_HOURS,
+    STATISTICS_STORAGE_VERSION,
+)
+from .utils import as_float, camel_to_snake
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# Home Assistant 2025.4 replaced ``has_mean`` of the metadata with a mean type
+StatisticMeanType: Any = getattr(recorder_models, "StatisticMeanType", None)
+
+# Status key → unit of the mean/min/max statistic
+STATISTICS_KEYS: dict[str, str] = {
+    "actualPower": UnitOfPower.KILO_WATT,
+    "currentL1": UnitOfElectricCurrent.AMPERE,
+    "currentL2": UnitOfElectricCurrent.AMPERE,
+    "currentL3": UnitOfElectricCurrent.AMPERE,
+    "voltageL1": UnitOfElectricPotential.VOLT,
+    "voltageL2": UnitOfElectricPotential.VOLT,
+    "voltageL3": UnitOfElectricPotential.VOLT,
+}
+ENERGY_STATISTIC = "integrated_energy"
+
+HOUR_SECONDS = 3600
+
+
+def _metadata(statistic_id: str, unit: str, *, mean: bool) -> StatisticMetaData:
+    """Return the metadata of a mean/min/max statistic, or else of a sum."""
+    metadata: dict[str, Any] = {
+        "has_sum": not mean,
+        "name": None,
+        "source": DOMAIN,
+        "statistic_id": statistic_id,
+        "unit_of_measurement": unit,
+    }
+    if StatisticMeanType is None:
+        metadata["has_mean"] = mean
+    else:
+        metadata["mean_type"] = (
+            StatisticMeanType.ARITHMETIC if mean else StatisticMeanType.NONE
+        )
+    return cast(StatisticMetaData, metadata)
+
+
+@dataclass(slots=True)
+class Bucket:
+    """Running mean/min/max of one key over one period."""
+
+    count: int = 0
+    total: float = 0.0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+
+    def add(self, value: float) -> None:
+        """Add a value in O(1)."""
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def mean(self) -> float:
+        """Return the mean of the added values."""
+        return self.total / self.count
+
+
+@dataclass(slots=True)
+class Period:
+    """Buckets of all keys for one period."""
+
+    start: float
+    buckets: dict[str, Bucket] = field(default_factory=dict)
+    energy_kwh: float | None = None  # integrated energy at the end of the period
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the period for storing, with the buckets as rows."""
+        return {
+            "start": self.start,
+            "energy_kwh": self.energy_kwh,
+            "buckets": {key: astuple(bucket) for key, bucket in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Period:
+        """Build a period from its stored form."""
+        return cls(
+            start=data["start"],
+            buckets={key: Bucket(*row) for key, row in data["buckets"].items()},
+            energy_kwh=data["energy_kwh"],
+        )
+
+
+class StatisticsAggregator:
+    """Aggregate samples locally and import them as external statistics.
+
+    Samples are folded into hourly buckets as they arrive. The recorder only
+    accepts hourly external statistics, so finished hours are queued and
+    imported in one batch per statistic. The running hour is kept in a
+    per-entry store, so a restart continues it instead of losing it.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, serial_number: str) -> None:
+        """Initialize the aggregator."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STATISTICS_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics"
+        )
+        self._prefix = f"{DOMAIN}:{slugify(serial_number)}"
+        self._hour: Period | None = None
+        self._pending: list[Period] = []
+
+    async def async_load(self) -> None:
+        """Restore the running hour; queue it if it ended meanwhile."""
+        stored = await self._store.async_load()
+        if not stored or not stored.get("hour"):
+            return
+        hour = Period.from_dict(stored["hour"])
+        now = dt_util.utcnow().timestamp()
+        if hour.start == now - now % HOUR_SECONDS:
+            self._hour = hour
+        else:
+            self._pending.append(hour)
+
+    async def async_flush(self) -> None:
+        """Import finished hours and store the running one now."""
+        self.async_import()
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the stored running hour, e.g. when the entry is removed."""
+        await self._store.async_remove()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"hour": self._hour.as_dict() if self._hour else None}
+
+    def add_sample(self, ts: float, status: dict[str, Any], energy_kwh: float) -> None:
+        """Fold one sample into the running hour."""
+        hour_start = ts - ts % HOUR_SECONDS
+        if self._hour is not None and self._hour.start != hour_start:
+            self._pending.append(self._hour)
+            # Without the recorder nothing is imported; keep the latest hours
+            del self._pending[:-STATISTICS_PENDING_MAX_HOURS]
+            self._hour = None
+            self.async_import()
+        if self._hour is None:
+            self._hour = Period(hour_start)
+
+        for key in STATISTICS_KEYS:
+            value = as_float(status.get(key))
+            if value is None:
+                continue
+            bucket = self._hour.buckets.get(key)
+            if bucket is None:
+                bucket = self._hour.buckets[key] = Bucket()
+            bucket.add(value)
+        self._hour.energy_kwh = energy_kwh
+        self._store.async_delay_save(self._data_to_save, SESSION_SAVE_DELAY_SECONDS)
+
+    def async_import(self) -> None:
+        """Import all finished hours, one batch per statistic."""
+        if not self._pending or "recorder" not in self._hass.config.components:
+            return
+
+        pending, self._pending = self._pending, []
+        for key, unit in STATISTICS_KEYS.items():
+            statistics = [
+                StatisticData(
+                    start=dt_util.utc_from_timestamp(period.start),
+                    mean=bucket.mean,
+                    min=bucket.minimum,
+                    max=bucket.maximum,
+                )
+                for period in pending
+                if (bucket := period.buckets.get(key)) is not None
+            ]
+            if statistics:
+                async_add_external_statistics(
+                    self._hass,
+                    _metadata(f"{self._prefix}_{camel_to_snake(key)}", unit, mean=True),
+                    statistics,
+                )
+
+        energy = [
+            StatisticData(
+                start=dt_util.utc_from_timestamp(period.start),
+                state=period.energy_kwh,
+                sum=period.energy_kwh,
+            )
+            for period in pending
+            if period.energy_kwh is not None
+        ]
+        if energy:
+            async_add_external_statistics(
+                self._hass,
+                _metadata(
+                    f"{self._prefix}_{ENERGY_STATISTIC}",
+                    UnitOfEnergy.KILO_WATT_HOUR,
+                    mean=False,
+                ),
+                energy,
+            )
+        LOGGER.debug(
+            "Imported %s hours of statistics for %s", len(pending), self._prefix
+        )
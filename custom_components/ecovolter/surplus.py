@@ -0,0 +1,220 @@
+"""Solar-surplus charging for ecovolter."""
+
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import UnitOfPower
+from homeassistant.core import Event, EventStateChangedData, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .api import EcovolterApiClientError
+from .const import (
+    CONF_SURPLUS_ENTITY,
+    LOGGER,
+    MIN_CURRENT,
+    NOMINAL_VOLTAGE,
+    SURPLUS_HYSTERESIS_W,
+    SURPLUS_PAUSE_DWELL_SECONDS,
+    SURPLUS_PHASE_DWELL_SECONDS,
+    SURPLUS_WRITE_BURST,
+    SURPLUS_WRITE_REFILL_SECONDS,
+)
+from .energy import sample_power_kw
+from .fleet import supply_cap
+from .governor import WriteBudget
+from .utils import (
+    as_float,
+    get_maximum_current,
+    get_settings,
+    get_status,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import EcovolterConfigEntry
+
+
+def surplus_setpoint(
+    available_w: float,
+    three_phase: bool,
+    max_current: float,
+    voltage: float = NOMINAL_VOLTAGE,
+) -> tuple[int | None, bool]:
+    """Return the current (None to pause) and phase mode for a surplus.
+
+    Three-phase charging is chosen above the three-phase minimum plus the
+    hysteresis and kept until the surplus drops below that minimum;
+    below the single-phase minimum, or with a maximum below the minimum
+    current, charging pauses.
+    """
+    three_phase_min = 3 * voltage * MIN_CURRENT
+    if three_phase:
+        three_phase = available_w >= three_phase_min
+    else:
+        three_phase = available_w >= three_phase_min + SURPLUS_HYSTERESIS_W
+
+    current = min(
+        int(available_w / (voltage * (3 if three_phase else 1))), int(max_current)
+    )
+    if current < MIN_CURRENT:
+        return None, three_phase
+    return current, three_phase
+
+
+class SurplusController:
+    """Closed loop charging one charger from the grid export only.
+
+    A single task waits for a wake-up, which is set by grid power changes
+    and coordinator updates, so bursts of events are coalesced into one
+    evaluation and nothing runs from entity property reads. Phase switches
+    and pauses need a minimum dwell time, and all writes draw from a
+    ``WriteBudget`` to spare the charger's settings storage.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: EcovolterConfigEntry) -> None:
+        """Initialize the controller."""
+        self._hass = hass
+        self._entry = entry
+        self._entity_id: str = entry.options[CONF_SURPLUS_ENTITY]
+        self._wakeup = asyncio.Event()
+        self._budget = WriteBudget(SURPLUS_WRITE_BURST, SURPLUS_WRITE_REFILL_SECONDS)
+        self._last_phase_switch = float("-inf")
+        self._last_pause_change = float("-inf")
+        self._retry: asyncio.TimerHandle | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening and the control task."""
+        entry = self._entry
+        entry.async_on_unload(
+            async_track_state_change_event(
+                self._hass, self._entity_id, self._async_state_changed
+            )
+        )
+        entry.async_on_unload(
+            entry.runtime_data.coordinator.async_add_listener(self._wakeup.set)
+        )
+        entry.async_on_unload(self._async_cancel_retry)
+        entry.async_create_background_task(
+            self._hass, self._async_run(), f"{entry.entry_id} surplus control"
+        )
+
+    @callback
+    def _async_cancel_retry(self) -> None:
+        if self._retry is not None:
+            self._retry.cancel()
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        self._wakeup.set()
+
+    @callback
+    def _async_retry(self) -> None:
+        self._retry = None
+        self._wakeup.set()
+
+    def _grid_export_w(self) -> float | None:
+        """Return the grid export in W (negative when importing)."""
+        state = self._hass.states.get(self._entity_id)
+        if state is None or (value := as_float(state.state)) is None:
+            return None
+        if state.attributes.get("unit_of_measurement") == UnitOfPower.KILO_WATT:
+            value *= 1000
+        return value
+
+    async def _async_run(self) -> None:
+        """Evaluate the loop whenever woken up."""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if (data := self._evaluate()) is None:
+                continue
+            # A token is only taken when a write is sent, see _async_write
+            if self._budget.retry_after() > 0:
+                # Retry when the budget allows, unless woken up earlier
+                if self._retry is None or self._retry.cancelled():
+                    self._retry = self._hass.loop.call_later(
+                        self._budget.retry_after(), self._async_retry
+                    )
+                continue
+            await self._async_write(data)
+
+    def _evaluate(self) -> dict[str, Any] | None:
+        """Return the settings to write, or None when nothing changes."""
+        coordinator = self._entry.runtime_data.coordinator
+        status = get_status(coordinator)
+        settings = get_settings(coordinator)
+        export_w = self._grid_export_w()
+        if export_w is None or not status.get("isVehicleConnected"):
+            return None
+
+        # What the charger draws now would be exported without it
+        charging_w = (sample_power_kw(status) or 0.0) * 1000
+        available_w = export_w + charging_w
+
+        now = monotonic()
+        enabled = bool(settings.get("isChargingEnable"))
+        three_phase = bool(settings.get("isThreePhaseModeEnable"))
+        # The charger's maxCurrent and, within a supply group, the current
+        # the group leaves the charger
+        max_current = min(
+            float(get_maximum_current(coordinator, "targetCurrent")),
+            supply_cap(self._hass, self._entry),
+        )
+        current, want_three_phase = surplus_setpoint(
+            available_w, three_phase, max_current
+        )
+
+        data: dict[str, Any] = {}
+        if (current is not None) != enabled:
+            if now - self._last_pause_change < SURPLUS_PAUSE_DWELL_SECONDS:
+                return None
+            data["isChargingEnable"] = current is not None
+        if current is None:
+            return data or None
+
+        if want_three_phase != three_phase:
+            if now - self._last_phase_switch >= SURPLUS_PHASE_DWELL_SECONDS:
+                data["isThreePhaseModeEnable"] = want_three_phase
+            else:
+                # Keep the phase mode until the dwell time has passed; if the
+                # surplus is too low for it, pause rather than draw from the grid
+                phases = 3 if three_phase else 1
+                current = min(
+                    int(available_w / (NOMINAL_VOLTAGE * phases)), int(max_current)
+                )
+                if current < MIN_CURRENT:
+                    if not enabled or (
+                        now - self._last_pause_change < SURPLUS_PAUSE_DWELL_SECONDS
+                    ):
+                        return None  # stay paused, or hold until it may pause
+                    return {"isChargingEnable": False}
+        if settings.get("targetCurrent") != current:
+            data["targetCurrent"] = current
+        return data or None
+
+    async def _async_write(self, data: dict[str, Any]) -> None:
+        """Write settings and refresh so the next evaluation sees them.
+
+        The budget and the dwell times only count writes that were sent.
+        """
+        client = self._entry.runtime_data.client
+        try:
+            written = await client.async_set_settings(data)
+        except EcovolterApiClientError as exception:
+            LOGGER.warning("Surplus control cannot set %s - %s", data, exception)
+            return
+        if not written:
+            return
+        LOGGER.debug("Surplus control set %s", data)
+        self._budget.take()
+        now = monotonic()
+        if "isChargingEnable" in data:
+            self._last_pause_change = now
+        if "isThreePhaseModeEnable" in data:
+            self._last_phase_switch = now
+        await self._entry.runtime_data.coordinator.async_request_refresh()
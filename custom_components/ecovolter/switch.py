@@ -98,14 +98,8 @@ class IntegrationEcovolterSwitch(IntegrationEcovolterEntity, SwitchEntity):
 
     async def async_turn_on(self, **_: Any) -> None:
         """Turn on the switch."""
-        await self.coordinator.config_entry.runtime_data.client.async_set_settings(
-            {self.entity_description.key: True}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.async_write_settings({self.entity_description.key: True})
 
     async def async_turn_off(self, **_: Any) -> None:
         """Turn off the switch."""
-        await self.coordinator.config_entry.runtime_data.client.async_set_settings(
-            {self.entity_description.key: False}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.async_write_settings({self.entity_description.key: False})
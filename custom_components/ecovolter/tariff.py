@@ -0,0 +1,191 @@
+"""Time-of-use tariff for ecovolter charging cost."""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import LOGGER
+from .utils import as_float
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# Price entity units per energy unit → factor to a price per kWh
+PRICE_UNIT_FACTORS = {"/wh": 1000.0, "/kwh": 1.0, "/mwh": 0.001}
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+SECONDS_PER_DAY = 86400
+SECONDS_PER_WEEK = 7 * SECONDS_PER_DAY
+
+_ENTRY_RE = re.compile(
+    r"^(?:(?P<days>[a-z,\-]+)\s+)?(?P<hour>\d{1,2}):(?P<minute>\d{2})\s*=\s*(?P<price>\d+(?:\.\d+)?)$"
+)
+
+
+class InvalidTariffSchedule(ValueError):
+    """Exception to indicate a tariff schedule that cannot be parsed."""
+
+
+def price_per_kwh(value: float, unit: str | None) -> float | None:
+    """Convert a price entity value to a price per kWh.
+
+    A value without a unit is taken to be per kWh; None for other units.
+    """
+    if not unit:
+        return value
+    _, slash, energy = unit.replace(" ", "").lower().rpartition("/")
+    factor = PRICE_UNIT_FACTORS.get(slash + energy)
+    return None if factor is None else value * factor
+
+
+def _parse_days(spec: str) -> list[int]:
+    """Parse 'mon-fri' or 'sat,sun' into weekday indexes."""
+    days: list[int] = []
+    for part in spec.split(","):
+        first, _, last = part.partition("-")
+        try:
+            lo = WEEKDAYS.index(first)
+            hi = WEEKDAYS.index(last) if last else lo
+        except ValueError as exception:
+            raise InvalidTariffSchedule(f"Unknown day in '{spec}'") from exception
+        days.extend(range(lo, hi + 1) if lo <= hi else [*range(lo, 7), *range(hi + 1)])
+    return days
+
+
+class TariffSchedule:
+    """Weekly price schedule with a precomputed interval index.
+
+    The schedule is given as lines (or ``;`` separated entries) like
+    ``07:00=0.30`` or ``sat-sun 00:00=0.10``; a price applies from its start
+    time until the next one. Entries with days replace the entries without
+    days on those days. All boundaries are flattened into one sorted array of
+    seconds since Monday 00:00, so a lookup is a bisection and consecutive
+    lookups within the same interval are answered from a cache in O(1).
+    """
+
+    def __init__(self, text: str) -> None:
+        """Parse the schedule text and build the interval index."""
+        general: list[tuple[int, float]] = []
+        per_day: dict[int, list[tuple[int, float]]] = {}
+
+        entries = (part.strip() for part in re.split(r"[\n;]", text.lower()))
+        for item in filter(None, entries):
+            match = _ENTRY_RE.match(item)
+            if match is None:
+                raise InvalidTariffSchedule(f"Invalid tariff entry '{item}'")
+            hour, minute = int(match["hour"]), int(match["minute"])
+            if hour > 23 or minute > 59:
+                raise InvalidTariffSchedule(f"Invalid time in '{item}'")
+            point = (hour * 3600 + minute * 60, float(match["price"]))
+            if match["days"]:
+                for day in _parse_days(match["days"]):
+                    per_day.setdefault(day, []).append(point)
+            else:
+                general.append(point)
+
+        bounds: list[tuple[int, float]] = []
+        for day in range(7):
+            for offset, price in per_day.get(day, general):
+                bounds.append((day * SECONDS_PER_DAY + offset, price))
+        if not bounds:
+            raise InvalidTariffSchedule("Tariff schedule has no entries")
+        bounds.sort()
+
+        self._starts = [start for start, _ in bounds]
+        self._prices = [price for _, price in bounds]
+        self._cache: tuple[float, float, float] | None = None
+
+    def price_at(self, ts: float) -> float:
+        """Return the price valid at the given UNIX timestamp."""
+        if self._cache is not None and self._cache[0] <= ts < self._cache[1]:
+            return self._cache[2]
+
+        local = dt_util.as_local(dt_util.utc_from_timestamp(ts))
+        week_start = (local - timedelta(days=local.weekday())).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        offset = (local - week_start).total_seconds()
+
+        # Before the first boundary of the week, the last price of the week applies
+        idx = bisect_right(self._starts, offset) - 1
+        lo = self._starts[idx] if idx >= 0 else self._starts[-1] - SECONDS_PER_WEEK
+        hi = (
+            self._starts[idx + 1]
+            if idx + 1 < len(self._starts)
+            else self._starts[0] + SECONDS_PER_WEEK
+        )
+        price = self._prices[idx]
+        # Cache in absolute time. Adding to an aware datetime counts wall-clock
+        # time, so each edge gets the UTC offset valid at it (DST changes)
+        self._cache = (
+            (week_start + timedelta(seconds=lo)).timestamp(),
+            (week_start + timedelta(seconds=hi)).timestamp(),
+            price,
+        )
+        return price
+
+
+class TariffEngine:
+    """Price charged energy with a schedule, a price sensor or the device price.
+
+    Precedence is the price entity, then the schedule, then ``kwhPrice`` from
+    the charger settings, which is what the device itself uses.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        schedule: str | None = None,
+        price_entity_id: str | None = None,
+    ) -> None:
+        """Initialize the engine."""
+        self._hass = hass
+        self.configure(schedule, price_entity_id)
+        self.total_cost: float = 0.0
+        self.price: float | None = None
+
+    def configure(self, schedule: str | None, price_entity_id: str | None) -> None:
+        """Set the price sources; the running total is kept."""
+        self._schedule = TariffSchedule(schedule) if schedule else None
+        self._price_entity_id = price_entity_id
+        self._invalid_unit: str | None = None  # last unit warned about
+
+    def restore(self, total_cost: float) -> None:
+        """Add a previously persisted total on top of the running total."""
+        self.total_cost += max(total_cost, 0.0)
+
+    def price_at(self, ts: float, settings: dict[str, Any]) -> float | None:
+        """Return the energy price at the given time."""
+        if self._price_entity_id and (
+            (state := self._hass.states.get(self._price_entity_id)) is not None
+            and (value := as_float(state.state)) is not None
+        ):
+            unit = state.attributes.get("unit_of_measurement")
+            if (price := price_per_kwh(value, unit)) is not None:
+                return price
+            if unit != self._invalid_unit:
+                self._invalid_unit = unit
+                LOGGER.warning(
+                    "Price entity %s has unit %s, not a price per energy; ignored",
+                    self._price_entity_id,
+                    unit,
+                )
+        if self._schedule is not None:
+            return self._schedule.price_at(ts)
+        return as_float(settings.get("kwhPrice"))
+
+    def add_energy(
+        self, ts: float, energy_kwh: float, settings: dict[str, Any]
+    ) -> float:
+        """Price an energy increment and return its cost."""
+        self.price = self.price_at(ts, settings)
+        if self.price is None or energy_kwh <= 0:
+            return 0.0
+        cost = energy_kwh * self.price
+        self.total_cost += cost
+        return cost
@@ -0,0 +1,162 @@
+"""Compressed telemetry log for ecovolter."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+from collections.abc import Iterator
+from datetime import timedelta
+from pathlib import Path
+from time import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import slugify
+from homeassistant.util.json import json_loads_object
+
+from .const import (
+    LOGGER,
+    TELEMETRY_BATCH_RECORDS,
+    TELEMETRY_DIRECTORY,
+    TELEMETRY_FLUSH_SECONDS,
+    TELEMETRY_MAX_FILE_AGE_SECONDS,
+    TELEMETRY_MAX_FILE_BYTES,
+    TELEMETRY_MAX_FILES,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import EcovolterConfigEntry
+
+TELEMETRY_SUFFIX = ".jsonl.gz"
+
+
+class TelemetryFiles:
+    """Append-only, rotating telemetry files of one charger (blocking I/O).
+
+    Every batch is appended as a gzip member of its own, so a file is valid
+    after each append and reads (``gzip.open``, ``zcat``) as one stream of
+    JSON lines. Files are named after the time they were started.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = TELEMETRY_MAX_FILE_BYTES,
+        max_age: float = TELEMETRY_MAX_FILE_AGE_SECONDS,
+        max_files: int = TELEMETRY_MAX_FILES,
+    ) -> None:
+        """Initialize the files."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_files = max_files
+        self._path: Path | None = None
+        self._started = 0.0
+        self._size = 0
+
+    def files(self) -> list[Path]:
+        """Return the telemetry files, oldest first.
+
+        Other files in the directory (e.g. a renamed copy) are not ours to
+        continue or delete and are left out.
+        """
+        return sorted(
+            path
+            for path in self.directory.glob(f"*{TELEMETRY_SUFFIX}")
+            if path.name.removesuffix(TELEMETRY_SUFFIX).isdigit()
+        )
+
+    def append(self, lines: list[bytes], now: float) -> None:
+        """Compress a batch of JSON lines and append it."""
+        member = gzip.compress(b"".join(lines), mtime=0)
+        if self._path is None:
+            self._resume()
+        if (
+            self._path is None
+            or now - self._started >= self.max_age
+            or (self._size and self._size + len(member) > self.max_bytes)
+        ):
+            self._rotate(now)
+        assert self._path is not None
+        with self._path.open("ab") as file:
+            file.write(member)
+        self._size += len(member)
+
+    def _resume(self) -> None:
+        """Continue the newest file, e.g. after a restart."""
+        if files := self.files():
+            self._path = files[-1]
+            self._started = float(self._path.name.removesuffix(TELEMETRY_SUFFIX))
+            self._size = self._path.stat().st_size
+
+    def _rotate(self, now: float) -> None:
+        """Start a new file and delete the oldest ones over the limit."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = self.files()
+        for path in files[: max(0, len(files) - self.max_files + 1)]:
+            path.unlink(missing_ok=True)
+        self._path = self.directory / f"{int(now):010d}{TELEMETRY_SUFFIX}"
+        self._started = float(int(now))
+        self._size = self._path.stat().st_size if self._path.exists() else 0
+
+
+def read_telemetry(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the records of a telemetry file."""
+    with gzip.open(path, "rb") as file:
+        for line in file:
+            yield json_loads_object(line)
+
+
+class TelemetryLog:
+    """Log every coordinator snapshot of one charger to telemetry files.
+
+    A record holds the poll time and the sections fetched fresh in that
+    poll. Records are serialized on the event loop and buffered; a full
+    batch, or a partial one every few minutes, is compressed and written in
+    the executor. The buffer is also written on unload and on shutdown.
+    """
+
+    def __init__(self, hass: HomeAssistant, serial_number: str) -> None:
+        """Initialize the log."""
+        self.hass = hass
+        self.files = TelemetryFiles(
+            Path(hass.config.path(TELEMETRY_DIRECTORY, slugify(serial_number)))
+        )
+        self._buffer: list[bytes] = []
+        self._lock = asyncio.Lock()
+
+    def async_start(self, entry: EcovolterConfigEntry) -> None:
+        """Write partial batches periodically and on shutdown."""
+        entry.async_on_unload(
+            async_track_time_interval(
+                self.hass, self.async_flush, timedelta(seconds=TELEMETRY_FLUSH_SECONDS)
+            )
+        )
+        entry.async_on_unload(
+            self.hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, self.async_flush)
+        )
+
+    def add(self, ts: float, sections: dict[str, Any]) -> None:
+        """Buffer one record; write the batch once it is full."""
+        self._buffer.append(json_bytes({"ts": round(ts, 3), **sections}) + b"\n")
+        if len(self._buffer) >= TELEMETRY_BATCH_RECORDS:
+            self.hass.async_create_background_task(
+                self.async_flush(), "ecovolter telemetry flush"
+            )
+
+    async def async_flush(self, _arg: Any = None) -> None:
+        """Write the buffered records."""
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        async with self._lock:  # appends to one file must not interleave
+            try:
+                await self.hass.async_add_executor_job(self.files.append, lines, time())
+            except OSError as exception:
+                LOGGER.warning(
+                    "Writing %s telemetry records failed: %s", len(lines), exception
+                )
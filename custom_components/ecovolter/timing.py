@@ -0,0 +1,73 @@
+"""Entity state timing for ecovolter."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+SLOW_ENTITY_REPORT_SIZE = 20
+
+
+@dataclass(slots=True)
+class _Timing:
+    """Time spent writing the state of one entity."""
+
+    platform: str
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+
+class EntityTimings:
+    """Time spent computing the state of each entity per refresh.
+
+    Every coordinator update makes each entity evaluate its properties and
+    write the resulting state; the duration of that is summed per entity.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty timings."""
+        self._entities: dict[str, _Timing] = {}
+        self.refreshes = 0
+
+    def add(self, entity_id: str, platform: str, seconds: float) -> None:
+        """Add the time one entity took to write its state."""
+        if (timing := self._entities.get(entity_id)) is None:
+            timing = self._entities[entity_id] = _Timing(platform)
+        timing.add(seconds)
+
+    def report(self, size: int = SLOW_ENTITY_REPORT_SIZE) -> dict[str, Any]:
+        """Return the slowest entities and the time per platform, in ms."""
+        refreshes = max(self.refreshes, 1)
+        platforms: dict[str, float] = defaultdict(float)
+        for timing in self._entities.values():
+            platforms[timing.platform] += timing.total
+        slowest = sorted(
+            self._entities.items(), key=lambda item: item[1].total, reverse=True
+        )[:size]
+        return {
+            "refreshes": self.refreshes,
+            "ms_per_refresh": round(1000 * sum(platforms.values()) / refreshes, 3),
+            "platforms_ms_per_refresh": {
+                platform: round(1000 * total / refreshes, 3)
+                for platform, total in sorted(
+                    platforms.items(), key=lambda item: item[1], reverse=True
+                )
+            },
+            "slowest_entities": [
+                {
+                    "entity_id": entity_id,
+                    "platform": timing.platform,
+                    "updates": timing.count,
+                    "mean_ms": round(1000 * timing.total / timing.count, 4),
+                    "max_ms": round(1000 * timing.maximum, 4),
+                }
+                for entity_id, timing in slowest
+            ],
+        }
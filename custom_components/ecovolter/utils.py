@@ -1,4 +1,6 @@
 import re
+import sys
+from functools import cache
 
 from typing import (
     Any,
@@ -12,13 +14,19 @@ from .const import (
     KEY_TYPE_INFO,
     MAX_CURRENT,
     CHARGER_TYPE_MAX_CURRENT,
+    CURRENCY_MAP,
 )
 
 
+@cache
 def camel_to_snake(name: str) -> str:
-    """Convert camelCase to snake_case."""
+    """Convert camelCase to snake_case.
+
+    Results are cached and interned: the keys are a fixed set, and the
+    entities of all chargers then share one string per key.
+    """
     name = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
-    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", name).lower()
+    return sys.intern(re.sub("([a-z0-9])([A-Z])", r"\1_\2", name).lower())
 
 
 # Safe conversions
@@ -75,6 +83,14 @@ def get_type_info(coordinator) -> dict[str, Any]:
     return get_section(coordinator.data, KEY_TYPE_INFO)
 
 
+def get_currency(coordinator) -> str:
+    """Get the ISO code of the currency selected on the charger."""
+    currency_raw = get_settings(coordinator).get("currency")
+    if isinstance(currency_raw, int) and currency_raw in CURRENCY_MAP:
+        return CURRENCY_MAP[currency_raw]
+    return "EUR"
+
+
 def extract_temperature(status: dict[str, Any], key: str) -> float | None:
     """Extract temperatures from the device status section."""
     temps = status.get("temperatures", {})
@@ -104,6 +120,25 @@ def get_charger_type_maximum_charging_current(coordinator) -> int:
     return type_max
 
 
+def get_maximum_current(
+    coordinator, key: str, max_current: float | None = None
+) -> int:
+    """Get the highest value a current setting can have on this charger.
+
+    ``maxCurrent`` is capped by the charger type, the target and boost
+    currents also by ``max_current`` (the charger's ``maxCurrent`` if not given).
+    """
+    type_max = get_charger_type_maximum_charging_current(coordinator)
+    if key == "maxCurrent":
+        return type_max
+    if max_current is None:
+        setting = get_settings(coordinator).get("maxCurrent")
+        if not isinstance(setting, (int, float)):
+            return type_max
+        max_current = setting
+    return int(min(max_current, type_max))
+
+
 def clamp_int(value: int, lo: int, hi: int) -> int:
     """Clamp an integer value to always be between lo and hi."""
     return max(lo, min(value, hi))
@@ -0,0 +1,176 @@
+"""Websocket API for ecovolter."""
+
+from __future__ import annotations
+
+from functools import partial
+from math import isnan
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import CONF_SERIAL_NUMBER, DATA_SAMPLE_SUBSCRIPTIONS, DOMAIN
+from .samples import COL, COLUMNS
+
+if TYPE_CHECKING:
+    from .data import EcovolterConfigEntry
+
+ATTR_CONFIG_ENTRY_IDS = "config_entry_ids"
+ATTR_SINCE = "since"
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the ecovolter websocket commands."""
+    websocket_api.async_register_command(hass, websocket_samples)
+    websocket_api.async_register_command(hass, websocket_subscribe_samples)
+
+
+def _columns(rows: np.ndarray) -> dict[str, list[float | None]]:
+    """Return rows as one list per column, with None for missing values."""
+    columns = cast(list[list[float]], rows.T.tolist())
+    return {
+        name: [None if isnan(value) else value for value in column]
+        for name, column in zip(COLUMNS, columns, strict=True)
+    }
+
+
+@callback
+def _async_end_subscriptions(hass: HomeAssistant, entry_id: str) -> None:
+    """End the sample subscriptions of an unloaded charger."""
+    for end in list(hass.data[DATA_SAMPLE_SUBSCRIPTIONS].pop(entry_id, ())):
+        end()
+
+
+def _rows_since(entry: EcovolterConfigEntry, since: float | None) -> np.ndarray:
+    """Return the samples of a charger newer than a timestamp, oldest first."""
+    rows = entry.runtime_data.coordinator.window.ordered()
+    if since is None:
+        return rows
+    return rows[np.searchsorted(rows[:, COL["ts"]], since, side="right") :]
+
+
+def _loaded_entries(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> list[EcovolterConfigEntry] | None:
+    """Return the requested loaded entries (all without ids), or send an error."""
+    entries: list[EcovolterConfigEntry] = hass.config_entries.async_loaded_entries(
+        DOMAIN
+    )
+    if not (entry_ids := msg.get(ATTR_CONFIG_ENTRY_IDS)):
+        return entries
+    by_id = {entry.entry_id: entry for entry in entries}
+    if missing := [entry_id for entry_id in entry_ids if entry_id not in by_id]:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"Config entries not loaded: {', '.join(missing)}",
+        )
+        return None
+    return [by_id[entry_id] for entry_id in entry_ids]
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/samples",
+        vol.Optional(ATTR_CONFIG_ENTRY_IDS): [str],
+        vol.Optional(ATTR_SINCE): vol.Coerce(float),
+    }
+)
+@callback
+def websocket_samples(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the in-memory samples of the chargers, one list per column."""
+    if (entries := _loaded_entries(hass, connection, msg)) is None:
+        return
+    connection.send_result(
+        msg["id"],
+        {
+            entry.entry_id: {
+                "serial_number": entry.data.get(CONF_SERIAL_NUMBER),
+                "samples": _columns(_rows_since(entry, msg.get(ATTR_SINCE))),
+            }
+            for entry in entries
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_samples",
+        vol.Optional(ATTR_CONFIG_ENTRY_IDS): [str],
+    }
+)
+@callback
+def websocket_subscribe_samples(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Push the new samples of a charger each time its data is refreshed.
+
+    The subscription ends with an error when one of its chargers is unloaded
+    (or reloaded), as its samples start over; subscribe again once it is loaded.
+    """
+    if (entries := _loaded_entries(hass, connection, msg)) is None:
+        return
+
+    def _listener(entry: EcovolterConfigEntry) -> CALLBACK_TYPE:
+        window = entry.runtime_data.coordinator.window
+        seen = window.appended
+
+        @callback
+        def _async_push() -> None:
+            nonlocal seen
+            if window.appended == seen:
+                return  # not refreshed with a new status (e.g. a failed poll)
+            rows = window.latest(window.appended - seen)
+            seen = window.appended
+            connection.send_message(
+                websocket_api.event_message(
+                    msg["id"], {"entry_id": entry.entry_id, "samples": _columns(rows)}
+                )
+            )
+
+        return entry.runtime_data.coordinator.async_add_listener(_async_push)
+
+    unsubs = [_listener(entry) for entry in entries]
+    # One unload callback per entry ends all of its subscriptions, so
+    # subscribing does not pile up callbacks on the entry
+    subscriptions = hass.data.setdefault(DATA_SAMPLE_SUBSCRIPTIONS, {})
+    ends: dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def _async_unsubscribe() -> None:
+        for unsub in unsubs:
+            unsub()
+        for entry_id, end in ends.items():
+            subscriptions.get(entry_id, set()).discard(end)
+
+    def _end(entry_id: str) -> CALLBACK_TYPE:
+        @callback
+        def _async_entry_unloaded() -> None:
+            connection.subscriptions.pop(msg["id"])()
+            connection.send_error(
+                msg["id"],
+                websocket_api.ERR_NOT_FOUND,
+                f"Config entry {entry_id} unloaded",
+            )
+
+        return _async_entry_unloaded
+
+    for entry in entries:
+        if entry.entry_id not in subscriptions:
+            subscriptions[entry.entry_id] = set()
+            entry.async_on_unload(
+                partial(_async_end_subscriptions, hass, entry.entry_id)
+            )
+        ends[entry.entry_id] = _end(entry.entry_id)
+        subscriptions[entry.entry_id].add(ends[entry.entry_id])
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
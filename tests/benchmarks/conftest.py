@@ -0,0 +1,96 @@
+import json
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def verify_cleanup():
+    """
+    Override strict cleanup verification from pytest-homeassistant-custom-component.
+
+    Setting up the entry loads translations, which spawns pytest-asyncio's
+    _run_safe_shutdown_loop thread; the benchmarks unload their entries.
+    """
+    yield
+
+
+BASELINES = Path(__file__).with_name("baselines.json")
+# Synthetic polls, not captured from a charger: status, settings, diagnostics
+# and type sections in the shape the charger API returns, with plausible values
+PAYLOADS = Path(__file__).with_name("payloads.json")
+REPEAT = 5
+
+
+def _best_us(func: Callable[[], object]) -> float:
+    """Return the µs per call of a callable, the best of ``REPEAT`` loops.
+
+    The callable is run in loops of at least 0.2 s; the best loop counts, as
+    it is the least disturbed by other processes.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number * 1e6
+
+
+def _reference_work() -> None:
+    """Do a fixed amount of dict lookups, calls and float math."""
+    data: dict[str, Any] = {"actualPower": 11.0, "targetCurrent": "16"}
+    for _ in range(100):
+        float(data["actualPower"]) * float(data.get("targetCurrent", 0))
+
+
+@pytest.fixture(scope="session")
+def reference() -> float:
+    """Time of the reference work on this machine, in µs."""
+    return _best_us(_reference_work)
+
+
+@pytest.fixture(scope="session")
+def baselines(request):
+    """Stored baselines, rewritten with ``--benchmark-save``.
+
+    Baselines are times relative to the reference work, so that they carry
+    over to other machines as long as they are about as much faster or
+    slower on the benchmarked code as on the reference work.
+    """
+    stored = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    results: dict[str, float] = {}
+    yield stored, results
+    if request.config.getoption("--benchmark-save") and results:
+        BASELINES.write_text(
+            json.dumps(stored | results, indent=2, sort_keys=True) + "\n"
+        )
+
+
+@pytest.fixture
+def benchmark(request, baselines, reference):
+    """Time a callable and compare it with its baseline; return the µs per call."""
+    stored, results = baselines
+    threshold = request.config.getoption("--benchmark-threshold")
+
+    def _benchmark(func: Callable[[], object], name: str | None = None) -> float:
+        name = name or request.node.name
+        best = _best_us(func)
+        relative = results[name] = round(best / reference, 4)
+        baseline = stored.get(name)
+        print(
+            f"\n{name}: {best:.3f} µs, {relative} x reference (baseline {baseline})",
+            end="",
+        )
+        if baseline is not None and not request.config.getoption("--benchmark-save"):
+            assert relative <= baseline * threshold, (
+                f"{name} regressed: {relative} x reference, baseline {baseline}"
+            )
+        return best
+
+    return _benchmark
+
+
+@pytest.fixture(scope="session")
+def payloads() -> list[dict]:
+    """Synthetic polls of a charger: charging, then idle with the car connected."""
+    return json.loads(PAYLOADS.read_text())
@@ -0,0 +1,133 @@
+"""Benchmarks of the entity values and of the coordinator-to-entity update.
+
+Run with ``pytest tests/benchmarks --benchmark -s``. The charger is set up
+from the sample polls, so every entity is evaluated on complete payloads.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterator
+from itertools import cycle
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.json import json_bytes
+from pytest_homeassistant_custom_component.common import (  # type: ignore[import-untyped]
+    MockConfigEntry,
+)
+
+from custom_components.ecovolter.const import DOMAIN, KEY_STATUS
+from custom_components.ecovolter.coordinator import DataType
+from custom_components.ecovolter.data import EcovolterConfigEntry
+from custom_components.ecovolter.number import IntegrationEcovolterNumber
+from custom_components.ecovolter.sensor import IntegrationEcovolterSensor
+from custom_components.ecovolter.switch import IntegrationEcovolterSwitch
+from custom_components.ecovolter.telemetry import TelemetryFiles
+
+
+@pytest.fixture
+async def entry(
+    hass: HomeAssistant, tmp_path: Path, payloads: list[dict]
+) -> AsyncIterator[EcovolterConfigEntry]:
+    """Set up a charger replaying the sample polls."""
+    TelemetryFiles(tmp_path).append(
+        [json_bytes(poll) + b"\n" for poll in payloads], 0.0
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "serial_number": "benchmark",
+            "secret_key": "",
+            "base_uri": f"replay://{tmp_path}?speed=0",
+        },
+        options={"update_interval": 3600},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield entry
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+def _entities(hass: HomeAssistant, cls: type[Entity]) -> list:
+    return [
+        entity
+        for platform in async_get_platforms(hass, DOMAIN)
+        for entity in platform.entities.values()
+        if isinstance(entity, cls)
+    ]
+
+
+async def test_sensor_native_value(
+    hass: HomeAssistant, entry: EcovolterConfigEntry, benchmark
+) -> None:
+    sensors = _entities(hass, IntegrationEcovolterSensor)
+    assert sensors
+
+    def _run() -> None:
+        for sensor in sensors:
+            _ = sensor.native_value
+
+    benchmark(_run)
+
+
+async def test_number_native_value(
+    hass: HomeAssistant, entry: EcovolterConfigEntry, benchmark
+) -> None:
+    numbers = _entities(hass, IntegrationEcovolterNumber)
+    assert numbers
+
+    def _run() -> None:
+        for number in numbers:
+            _ = number.native_value
+
+    benchmark(_run)
+
+
+async def test_number_native_max_value(
+    hass: HomeAssistant, entry: EcovolterConfigEntry, benchmark
+) -> None:
+    numbers = _entities(hass, IntegrationEcovolterNumber)
+
+    def _run() -> None:
+        for number in numbers:
+            _ = number.native_max_value
+
+    benchmark(_run)
+
+
+async def test_switch_is_on(
+    hass: HomeAssistant, entry: EcovolterConfigEntry, benchmark
+) -> None:
+    switches = _entities(hass, IntegrationEcovolterSwitch)
+    assert switches
+
+    def _run() -> None:
+        for switch in switches:
+            _ = switch.is_on
+
+    benchmark(_run)
+
+
+async def test_coordinator_update(
+    hass: HomeAssistant, entry: EcovolterConfigEntry, benchmark, payloads
+) -> None:
+    """Dispatch alternating polls to all entities of all platforms."""
+    coordinator = entry.runtime_data.coordinator
+    polls: Iterator[DataType] = cycle(
+        [
+            {**coordinator.data, KEY_STATUS: payloads[0][KEY_STATUS]},
+            {**coordinator.data, KEY_STATUS: payloads[1][KEY_STATUS]},
+        ]
+    )
+
+    def _run() -> None:
+        coordinator.data = next(polls)
+        coordinator.async_update_listeners()
+
+    benchmark(_run)
+    assert hass.states.async_all("sensor")
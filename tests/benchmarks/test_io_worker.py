@@ -0,0 +1,86 @@
+"""Main-loop CPU per poll with and without the I/O worker.
+
+Run with ``pytest tests/benchmarks --benchmark -s``. A fleet of chargers is
+polled from a local server serving the sample payloads; the server runs on
+a thread of its own, so only the polling side is measured.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from time import thread_time
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant.core import HomeAssistant
+
+from custom_components.ecovolter.api import EcovolterApiClient
+from custom_components.ecovolter.const import KEY_SETTINGS, KEY_STATUS
+from custom_components.ecovolter.io_worker import IoWorker
+
+CHARGERS = 50
+ROUNDS = 20
+
+
+async def _poll(clients: list[EcovolterApiClient]) -> float:
+    """Poll every charger ROUNDS times; return the main thread CPU per poll."""
+    started = thread_time()
+    for _ in range(ROUNDS):
+        await asyncio.gather(
+            *(client.async_get_status() for client in clients),
+            *(client.async_get_settings() for client in clients),
+        )
+    return (thread_time() - started) / (ROUNDS * len(clients))
+
+
+async def test_main_loop_cpu_per_poll(
+    hass: HomeAssistant, payloads: list[dict], socket_enabled
+) -> None:
+    poll = payloads[0]
+
+    async def _status(_request: web.Request) -> web.Response:
+        return web.json_response(poll[KEY_STATUS])
+
+    async def _settings(_request: web.Request) -> web.Response:
+        return web.json_response(poll[KEY_SETTINGS])
+
+    app = web.Application()
+    app.router.add_get("/api/v1/charger/status", _status)
+    app.router.add_get("/api/v1/charger/settings", _settings)
+    server = TestServer(app, host="127.0.0.1")
+    server_thread = IoWorker(hass)
+    server_thread.start()
+    await server_thread.async_run(server.start_server())
+    base_uri = str(server.make_url(""))
+
+    session = aiohttp.ClientSession()
+    worker = IoWorker(hass)
+    worker.start()
+    try:
+        inline = await _poll(
+            [
+                EcovolterApiClient(f"sn{i}", "secret", base_uri, session)
+                for i in range(CHARGERS)
+            ]
+        )
+        offloaded = await _poll(
+            [
+                EcovolterApiClient(f"sn{i}", "secret", base_uri, session, worker=worker)
+                for i in range(CHARGERS)
+            ]
+        )
+    finally:
+        await session.close()
+        await worker.async_stop()
+        await server_thread.async_run(server.close())
+        await server_thread.async_stop()
+
+    print(
+        f"\n{CHARGERS} chargers x {ROUNDS} polls (status + settings), main loop CPU "
+        f"per poll: {1000 * inline:.3f} ms on the main loop, "
+        f"{1000 * offloaded:.3f} ms with the I/O worker; "
+        f"{worker.requests} requests in {worker.batches} deliveries "
+        f"({worker.requests / max(worker.batches, 1):.1f} per wakeup)"
+    )
+    assert offloaded < inline
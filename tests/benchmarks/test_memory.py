@@ -0,0 +1,74 @@
+"""Measure the memory taken by each charger of a fleet.
+
+Run with ``pytest tests/benchmarks --benchmark -s``. Chargers are set up
+from the sample polls; the platforms are loaded by a first charger, so
+the growth measured over the next ones is the cost of a charger alone.
+"""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+from pytest_homeassistant_custom_component.common import (  # type: ignore[import-untyped]
+    MockConfigEntry,
+)
+
+from custom_components.ecovolter.const import DOMAIN
+from custom_components.ecovolter.telemetry import TelemetryFiles
+
+CHARGERS = 20
+
+
+async def _setup(hass: HomeAssistant, recording: Path, serial: str) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=serial,
+        data={
+            "serial_number": serial,
+            "secret_key": "",
+            "base_uri": f"replay://{recording}?speed=0",
+        },
+        options={"update_interval": 3600},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_memory_per_charger(
+    hass: HomeAssistant, tmp_path: Path, payloads: list[dict]
+) -> None:
+    TelemetryFiles(tmp_path).append(
+        [json_bytes(poll) + b"\n" for poll in payloads], 0.0
+    )
+    entries = [await _setup(hass, tmp_path, "warmup")]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for i in range(CHARGERS):
+            entries.append(await _setup(hass, tmp_path, f"charger{i:03d}"))
+        gc.collect()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    per_charger = (after - before) / CHARGERS
+    entities = len(hass.states.async_all()) / len(entries)
+    print(
+        f"\n{CHARGERS} chargers: {per_charger / 1024:.0f} KiB per charger "
+        f"({entities:.0f} entities each, {per_charger / entities / 1024:.1f} KiB "
+        f"per entity), peak {peak / 2**20:.1f} MiB; "
+        f"200 chargers ~ {200 * per_charger / 2**20:.0f} MiB"
+    )
+    assert per_charger > 0
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
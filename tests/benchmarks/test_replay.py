@@ -0,0 +1,137 @@
+"""Replay a recording at 100x through the coordinator and all platforms.
+
+Run with ``pytest tests/benchmarks --benchmark -s``.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from time import perf_counter, process_time
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes
+from pytest_homeassistant_custom_component.common import (  # type: ignore[import-untyped]
+    MockConfigEntry,
+)
+
+from custom_components.ecovolter.const import DOMAIN
+from custom_components.ecovolter.telemetry import TelemetryFiles
+
+POLLS = 300
+POLL_SECONDS = 5
+SPEED = 100
+
+SETTINGS = {
+    "targetCurrent": 16,
+    "boostCurrent": 16,
+    "maxCurrent": 16,
+    "boostTime": 0,
+    "kwhPrice": 0.25,
+    "currency": 0,
+    "isThreePhaseModeEnable": True,
+    "isChargingEnable": True,
+    "isBoostModeEnable": False,
+    "isLocalPanelEnable": True,
+}
+
+
+def status(i: int) -> dict:
+    """Return a charging status that changes with every poll."""
+    current = 6.0 + i % 11
+    return {
+        "actualPower": round(3 * 230 * current / 1000, 2),
+        "chargedEnergy": round(i * 0.015, 3),
+        "chargingCost": round(i * 0.004, 3),
+        "chargingTime": i * POLL_SECONDS,
+        "remainingBoostTime": 0,
+        "currentL1": current,
+        "currentL2": current,
+        "currentL3": current,
+        "voltageL1": 230.0 + i % 3,
+        "voltageL2": 231.0,
+        "voltageL3": 229.0 - i % 2,
+        "temperatureCurrentLimit": 32,
+        "adapterMaxCurrent": 32,
+        "isCharging": i % 100 < 90,
+        "isBoostModeAvailable": True,
+        "isBoostModeActive": False,
+        "isThreePhaseModeAvailable": True,
+        "isThreePhaseModeActive": True,
+        "isVehicleConnected": True,
+        "isChargingScheduleActive": False,
+        "temperatures": {
+            "internal": 30 + i % 5,
+            "adapter": [25, 26, 27],
+            "relay": [40, 41],
+        },
+    }
+
+
+def record(path: Path) -> None:
+    """Write a recording of POLLS polls."""
+    files = TelemetryFiles(path)
+    lines = [
+        b'{"ts":%d,"status":%s,"settings":%s,"diagnostics":%s,"type_info":%s}\n'
+        % (
+            0,
+            json_bytes(status(0)),
+            json_bytes(SETTINGS),
+            json_bytes({"totalChargedEnergy": 100.0, "totalChargingCount": 10}),
+            json_bytes({"chargerType": 0, "chargingPower": 11.0}),
+        )
+    ]
+    lines += [
+        b'{"ts":%d,"status":%s}\n' % (i * POLL_SECONDS, json_bytes(status(i)))
+        for i in range(1, POLLS)
+    ]
+    files.append(lines, 0.0)
+
+
+async def test_replay_throughput(hass: HomeAssistant, tmp_path: Path) -> None:
+    record(tmp_path)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "serial_number": "replay",
+            "secret_key": "",
+            "base_uri": f"replay://{tmp_path}?speed={SPEED}",
+        },
+        options={"update_interval": 3600},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = entry.runtime_data.coordinator
+    client = entry.runtime_data.client
+
+    updates = 0
+
+    @callback
+    def _count(_event) -> None:
+        nonlocal updates
+        updates += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _count)
+    cpu: list[float] = []
+    started = perf_counter()
+    while client.remaining:
+        cpu_started = process_time()
+        await coordinator.async_refresh()
+        cpu.append(process_time() - cpu_started)
+    elapsed = perf_counter() - started
+    unsub()
+
+    cpu.sort()
+    print(
+        f"\nReplayed {len(cpu)} polls at {SPEED}x in {elapsed:.2f} s: "
+        f"{updates} entity updates ({updates / elapsed:.0f}/s, "
+        f"{updates / len(cpu):.1f} per refresh); CPU per refresh "
+        f"mean {1000 * sum(cpu) / len(cpu):.2f} ms, "
+        f"p95 {1000 * cpu[int(0.95 * len(cpu))]:.2f} ms"
+    )
+    assert len(cpu) == POLLS - 1
+    assert updates > 0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
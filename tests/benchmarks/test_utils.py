@@ -0,0 +1,93 @@
+"""Micro-benchmarks of the helpers run for every entity on every refresh.
+
+Run with ``pytest tests/benchmarks --benchmark -s``; each benchmark times one
+pass over the keys or values of a sample poll.
+"""
+
+from __future__ import annotations
+
+from custom_components.ecovolter.const import (
+    KEY_DIAGNOSTICS,
+    KEY_SETTINGS,
+    KEY_STATUS,
+    KEY_TYPE_INFO,
+)
+from custom_components.ecovolter.sensor import TEMPERATURE_KEYS
+from custom_components.ecovolter.utils import (
+    as_float,
+    as_int,
+    camel_to_snake,
+    extract_temperature,
+    get_section,
+)
+
+
+def _values(poll: dict) -> list:
+    """Return the scalar values of the status and settings of a poll."""
+    return [
+        value
+        for section in (poll[KEY_STATUS], poll[KEY_SETTINGS])
+        for value in section.values()
+        if not isinstance(value, dict)
+    ] + ["16", "0.25", "", None]
+
+
+def test_camel_to_snake(benchmark, payloads) -> None:
+    keys = [
+        key
+        for section in payloads[0].values()
+        if isinstance(section, dict)
+        for key in section
+    ]
+
+    def _run() -> None:
+        for key in keys:
+            camel_to_snake(key)
+
+    benchmark(_run)
+    assert camel_to_snake("isThreePhaseModeEnable") == "is_three_phase_mode_enable"
+
+
+def test_as_float(benchmark, payloads) -> None:
+    values = _values(payloads[0])
+
+    def _run() -> None:
+        for value in values:
+            as_float(value)
+
+    benchmark(_run)
+    assert as_float("0.25") == 0.25
+
+
+def test_as_int(benchmark, payloads) -> None:
+    values = _values(payloads[0])
+
+    def _run() -> None:
+        for value in values:
+            as_int(value)
+
+    benchmark(_run)
+    assert as_int("16") == 16
+
+
+def test_get_section(benchmark, payloads) -> None:
+    poll = payloads[0]
+
+    def _run() -> None:
+        for key in (KEY_STATUS, KEY_SETTINGS, KEY_DIAGNOSTICS, KEY_TYPE_INFO):
+            get_section(poll, key)
+
+    benchmark(_run)
+    assert get_section(poll, KEY_STATUS) == poll[KEY_STATUS]
+
+
+def test_extract_temperature(benchmark, payloads) -> None:
+    status = payloads[0][KEY_STATUS]
+    keys = sorted(TEMPERATURE_KEYS)
+
+    def _run() -> None:
+        for key in keys:
+            extract_temperature(status, key)
+
+    benchmark(_run)
+    assert extract_temperature(status, "temperature_relay2") == 46.5
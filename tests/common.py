@@ -0,0 +1,80 @@
+"""Helpers for the ecovolter tests."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (  # type: ignore[import-untyped]
+    MockConfigEntry,
+)
+
+from custom_components.ecovolter.const import DOMAIN
+
+STATUS = {
+    "actualPower": 11.0,
+    "currentL1": 16.0,
+    "currentL2": 16.0,
+    "currentL3": 16.0,
+    "voltageL1": 230.0,
+    "voltageL2": 231.0,
+    "voltageL3": 229.0,
+    "temperatureCurrentLimit": 32,
+    "adapterMaxCurrent": 32,
+    "isCharging": True,
+    "isVehicleConnected": True,
+    "temperatures": {"internal": 30, "adapter": [25, 26, 27], "relay": [40, 41]},
+}
+SETTINGS = {"targetCurrent": 16, "maxCurrent": 32, "isChargingEnable": True}
+
+
+class FakeCharger:
+    """The API of a charger, served from its sections."""
+
+    def __init__(self) -> None:
+        """Initialize a 3x32 A charger that is charging."""
+        self.sections: dict[str, dict[str, Any]] = {
+            "/status": deepcopy(STATUS),
+            "/settings": deepcopy(SETTINGS),
+            "/diagnostic": {},
+            "/type": {"chargerType": 1},
+        }
+        self.error: Exception | None = None  # raised by every request when set
+        self.writes: list[dict[str, Any]] = []
+
+    async def async_request(
+        self, method: str, path: str, data: dict | None = None
+    ) -> Any:
+        """Answer a request like the charger."""
+        if self.error is not None:
+            raise self.error
+        if method == "patch":
+            changes = {k: v for k, v in (data or {}).items() if k != "timestamp"}
+            self.writes.append(changes)
+            self.sections[path].update(changes)
+            return {}
+        return deepcopy(self.sections.get(path, {}))
+
+
+class FakeChargers(dict[str, FakeCharger]):
+    """Fake chargers by serial number, created when first requested."""
+
+    def __missing__(self, serial_number: str) -> FakeCharger:
+        charger = self[serial_number] = FakeCharger()
+        return charger
+
+
+async def async_setup_charger(
+    hass: HomeAssistant, serial_number: str = "abc", **options: Any
+) -> MockConfigEntry:
+    """Set up a config entry of a charger with the given options."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"serial_number": serial_number, "secret_key": "abc"},
+        options=options,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
@@ -1,5 +1,50 @@
+from unittest.mock import patch
+
 import pytest
 
+from .common import FakeChargers
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark", action="store_true", default=False, help="run the benchmarks"
+    )
+    parser.addoption(
+        "--benchmark-save",
+        action="store_true",
+        default=False,
+        help="store the benchmark results as the new baselines",
+    )
+    parser.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=1.5,
+        help="fail a benchmark slower than its baseline times this factor",
+    )
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with --benchmark")
+    for item in items:
+        if "benchmarks" in item.path.parts:
+            item.add_marker(skip)
+
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
     yield
+
+@pytest.fixture
+def chargers():
+    """Serve the API of every charger from a fake, by serial number."""
+    fakes = FakeChargers()
+
+    async def _api(client, method, path, data=None, headers=None):
+        return await fakes[client._serial_number].async_request(method, path, data)
+
+    with patch(
+        "custom_components.ecovolter.api.EcovolterApiClient._api_wrapper",
+        autospec=True,
+        side_effect=_api,
+    ):
+        yield fakes
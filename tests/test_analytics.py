@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from custom_components.ecovolter.analytics import PowerQualityAnalyzer
+from custom_components.ecovolter.const import (
+    CHARGING_CURRENT_THRESHOLD,
+    CURRENT_LIMIT_MARGIN,
+    NOMINAL_VOLTAGE,
+    VOLTAGE_PRESENT_THRESHOLD,
+    VOLTAGE_SAG_RATIO,
+    VOLTAGE_SWELL_RATIO,
+)
+from custom_components.ecovolter.samples import COLUMNS, SampleWindow
+
+CAPACITY = 50
+
+
+def _stream(count: int) -> np.ndarray:
+    """Return rows with idle and single-phase stretches, sags, swells and gaps."""
+    rng = np.random.default_rng(42)
+    rows = np.empty((count, len(COLUMNS)))
+    rows[:, 0] = np.arange(count)
+    rows[:, 1] = rng.uniform(0, 22, count)
+    rows[:, 2:5] = rng.choice([0.0, 0.5, 6.0, 10.0, 16.0], (count, 3))
+    rows[:, 5:8] = rng.choice([0.0, 180.0, 230.0, 231.0, 260.0], (count, 3))
+    rows[:, 8] = rng.choice([10.0, 16.0, np.nan], count)
+    rows[rng.random((count, len(COLUMNS))) < 0.05] = np.nan
+    return rows
+
+
+def _naive(rows: np.ndarray) -> dict[str, float | None]:
+    """Recompute the analytics of the last CAPACITY rows one row at a time."""
+    charging = three_phase = at_limit = sags = swells = 0
+    imbalance = 0.0
+    last_sag = last_swell = [False] * 3
+    for i, row in enumerate(rows):
+        currents = [0.0 if math.isnan(c) else c for c in row[2:5]]
+        voltages = list(row[5:8])
+        sag = [
+            VOLTAGE_PRESENT_THRESHOLD < v < NOMINAL_VOLTAGE * VOLTAGE_SAG_RATIO
+            for v in voltages
+        ]
+        swell = [v > NOMINAL_VOLTAGE * VOLTAGE_SWELL_RATIO for v in voltages]
+        if i >= len(rows) - CAPACITY:
+            carrying = [c > CHARGING_CURRENT_THRESHOLD for c in currents]
+            if any(carrying):
+                charging += 1
+                at_limit += max(currents) >= row[8] - CURRENT_LIMIT_MARGIN
+            if all(carrying):
+                three_phase += 1
+                imbalance += (max(currents) - min(currents)) / (sum(currents) / 3)
+            sags += sum(s and not p for s, p in zip(sag, last_sag, strict=True))
+            swells += sum(s and not p for s, p in zip(swell, last_swell, strict=True))
+        last_sag, last_swell = sag, swell
+    return {
+        "phase_imbalance": 100 * imbalance / three_phase if three_phase else None,
+        "current_limit_share": 100 * at_limit / charging if charging else None,
+        "voltage_sags": sags,
+        "voltage_swells": swells,
+    }
+
+
+@pytest.mark.parametrize("batch", [1, 7, CAPACITY + 3])
+def test_matches_naive_recomputation(batch: int) -> None:
+    rows = _stream(4 * CAPACITY + 11)
+    analyzer = PowerQualityAnalyzer(SampleWindow(CAPACITY))
+
+    for end in range(batch, len(rows) + batch, batch):
+        analyzer.append(rows[end - batch : end])
+        expected = _naive(rows[:end])
+        assert analyzer.phase_imbalance == pytest.approx(
+            expected["phase_imbalance"], rel=1e-5
+        )
+        assert analyzer.current_limit_share == pytest.approx(
+            expected["current_limit_share"]
+        )
+        assert analyzer.voltage_sags == expected["voltage_sags"]
+        assert analyzer.voltage_swells == expected["voltage_swells"]
+
+
+def test_empty_window() -> None:
+    analyzer = PowerQualityAnalyzer(SampleWindow(CAPACITY))
+    assert analyzer.phase_imbalance is None
+    assert analyzer.current_limit_share is None
+    assert (analyzer.voltage_sags, analyzer.voltage_swells) == (0, 0)
+
+
+@pytest.mark.parametrize("count", [1, 7, CAPACITY, CAPACITY + 5])
+def test_window_latest(count: int) -> None:
+    rows = _stream(CAPACITY + 23)
+    window = SampleWindow(CAPACITY)
+    for end in range(10, len(rows) + 10, 10):
+        window.append(rows[end - 10 : end])
+    assert window.appended == len(rows)
+    np.testing.assert_array_equal(window.latest(count), window.ordered()[-count:])
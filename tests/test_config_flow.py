@@ -1,28 +1,40 @@
 from __future__ import annotations
 
-import pytest
 from unittest.mock import AsyncMock, patch
 
-from homeassistant.core import HomeAssistant
+import pytest
 from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.ecovolter.api import (
+    EcovolterApiClientAuthenticationError,
+    EcovolterApiClientCommunicationError,
+    EcovolterApiClientError,
+)
 
 # Adjust if your import paths differ
 from custom_components.ecovolter.const import (
-    DOMAIN,
-    CONF_SERIAL_NUMBER,
-    CONF_SECRET_KEY,
     CONF_BASE_URI,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_REQUEST_TIMEOUT,
+    CONF_SECRET_KEY,
+    CONF_SERIAL_NUMBER,
     CONF_UPDATE_INTERVAL,
-    MIN_UPDATE_INTERVAL_SECONDS,
     DEFAULT_UPDATE_INTERVAL_SECONDS,
-)
-from custom_components.ecovolter.api import (
-    EcovolterApiClientAuthenticationError,
-    EcovolterApiClientCommunicationError,
-    EcovolterApiClientError,
+    DOMAIN,
+    MIN_REQUEST_TIMEOUT_SECONDS,
+    MIN_UPDATE_INTERVAL_SECONDS,
 )
 
-from homeassistant.data_entry_flow import FlowResultType
+
+async def _confirm_probe(hass: HomeAssistant, result, user_input=None):
+    """Accept the interval and timeout proposed by the connection test."""
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "probe"
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input or {}
+    )
 
 @pytest.fixture(name="ecovolter_setup", autouse=True)
 def ecovolter_setup_fixture():
@@ -77,6 +89,7 @@ async def test_create_entry_success(hass: HomeAssistant, api) -> None:
         context={"source": config_entries.SOURCE_USER},
         data=user_input,
     )
+    result = await _confirm_probe(hass, result)
 
     assert result["type"] is FlowResultType.CREATE_ENTRY
     assert result["title"] == "revcr01a00000001"
@@ -86,6 +99,8 @@ async def test_create_entry_success(hass: HomeAssistant, api) -> None:
     assert data[CONF_SECRET_KEY] == "revcr01a00000001"
     assert data[CONF_BASE_URI] == "http://ecovolter.test"
     assert data[CONF_UPDATE_INTERVAL] == 17
+    assert data[CONF_MIN_UPDATE_INTERVAL] == MIN_UPDATE_INTERVAL_SECONDS
+    assert result["options"] == {CONF_REQUEST_TIMEOUT: MIN_REQUEST_TIMEOUT_SECONDS}
 
 @pytest.mark.asyncio
 async def test_min_update_interval_enforced(hass: HomeAssistant) -> None:
@@ -105,6 +120,7 @@ async def test_min_update_interval_enforced(hass: HomeAssistant) -> None:
                 CONF_UPDATE_INTERVAL: 1,  # below min
             },
         )
+        result = await _confirm_probe(hass, result)
 
     assert result["type"] == "create_entry"
     assert result["data"][CONF_UPDATE_INTERVAL] == MIN_UPDATE_INTERVAL_SECONDS
@@ -127,6 +143,7 @@ async def test_default_update_interval_when_missing(hass: HomeAssistant) -> None
                 # no interval provided
             },
         )
+        result = await _confirm_probe(hass, result)
 
     assert result["type"] == "create_entry"
     assert result["data"][CONF_UPDATE_INTERVAL] == DEFAULT_UPDATE_INTERVAL_SECONDS
@@ -201,6 +218,7 @@ async def test_unique_id_and_abort_if_exists(hass: HomeAssistant) -> None:
             context={"source": config_entries.SOURCE_USER},
             data={CONF_SERIAL_NUMBER: "SERIAL1", CONF_SECRET_KEY: "SERIAL1"},
         )
+        first = await _confirm_probe(hass, first)
         assert first["type"] == "create_entry"
 
         # Second run → same serial (case-insensitive)
@@ -212,3 +230,40 @@ async def test_unique_id_and_abort_if_exists(hass: HomeAssistant) -> None:
 
     assert second["type"] == "abort"
     assert second["reason"] == "already_configured"
+
+@pytest.mark.asyncio
+async def test_probe_rejects_interval_below_measured(hass: HomeAssistant, api) -> None:
+    """The connection test shows the round trips and keeps the interval servable."""
+    with patch(
+        "custom_components.ecovolter.probe.monotonic",
+        side_effect=[float(i) for i in range(1000)],
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_USER},
+            data={CONF_SERIAL_NUMBER: "abc", CONF_SECRET_KEY: "abc"},
+        )
+
+    assert result["step_id"] == "probe"
+    placeholders = result["description_placeholders"]
+    assert placeholders is not None
+    assert placeholders["rounds"] == "5"
+    assert set(placeholders) >= {"status", "settings", "diagnostics", "type"}
+    min_interval = int(placeholders["min_interval"])
+    assert min_interval > DEFAULT_UPDATE_INTERVAL_SECONDS
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_UPDATE_INTERVAL: min_interval - 1, CONF_REQUEST_TIMEOUT: 10},
+    )
+    assert result["type"] == "form"
+    assert result["errors"] == {CONF_UPDATE_INTERVAL: "interval_too_short"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_UPDATE_INTERVAL: min_interval, CONF_REQUEST_TIMEOUT: 10},
+    )
+    assert result["type"] == "create_entry"
+    assert result["data"][CONF_UPDATE_INTERVAL] == min_interval
+    assert result["data"][CONF_MIN_UPDATE_INTERVAL] == min_interval
+    assert result["options"] == {CONF_REQUEST_TIMEOUT: 10}
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (  # type: ignore[import-untyped]
+    async_fire_time_changed,
+)
+
+from custom_components.ecovolter.api import EcovolterApiClientCommunicationError
+from custom_components.ecovolter.const import BURST_MAX_CHARGERS, DOMAIN
+
+from .common import FakeChargers, async_setup_charger
+
+
+@pytest.fixture(autouse=True)
+def verify_cleanup():
+    """Setting up the entry loads translations, see test_config_flow."""
+    yield
+
+
+async def test_stale_data_served_until_failures(
+    hass: HomeAssistant, chargers: FakeChargers, freezer: FrozenDateTimeFactory
+) -> None:
+    entry = await async_setup_charger(hass, grace_failures=3)
+    coordinator = entry.runtime_data.coordinator
+    good = coordinator.data
+    last_good = dt_util.utcnow()
+
+    chargers["abc"].error = EcovolterApiClientCommunicationError("down")
+    for failures in (1, 2):
+        freezer.tick(10)
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert coordinator.data is good
+        assert coordinator.failures == failures
+        assert coordinator.stale_since == last_good
+
+    # The third failure in a row is reported
+    freezer.tick(10)
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+    # Recovery resets the counters
+    chargers["abc"].error = None
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.failures == 0
+    assert coordinator.stale_since is None
+
+
+async def test_stale_data_expires(
+    hass: HomeAssistant, chargers: FakeChargers, freezer: FrozenDateTimeFactory
+) -> None:
+    entry = await async_setup_charger(hass, grace_failures=10, grace_max_age=60)
+    coordinator = entry.runtime_data.coordinator
+
+    chargers["abc"].error = EcovolterApiClientCommunicationError("down")
+    freezer.tick(59)
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.stale_since is not None
+
+    freezer.tick(2)
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+
+async def test_burst_sampling(
+    hass: HomeAssistant, chargers: FakeChargers, freezer: FrozenDateTimeFactory
+) -> None:
+    entry = await async_setup_charger(hass, update_interval=30)
+    coordinator = entry.runtime_data.coordinator
+
+    await hass.services.async_call(
+        DOMAIN,
+        "burst_sampling",
+        {"config_entry_id": entry.entry_id, "duration": 60},
+        blocking=True,
+    )
+    assert coordinator.update_interval == timedelta(seconds=1)
+    until = coordinator.burst_until
+
+    # Starting it again extends it, keeping the interval to restore
+    freezer.tick(30)
+    await hass.services.async_call(
+        DOMAIN,
+        "burst_sampling",
+        {"config_entry_id": entry.entry_id, "duration": 60, "interval": 2},
+        blocking=True,
+    )
+    assert until is not None
+    assert coordinator.burst_until == until + timedelta(seconds=30)
+    assert coordinator.update_interval == timedelta(seconds=2)
+
+    # An interval changed meanwhile applies once the burst is over
+    hass.config_entries.async_update_entry(entry, options={"update_interval": 20})
+    await hass.async_block_till_done()
+    assert coordinator.update_interval == timedelta(seconds=2)
+
+    freezer.tick(61)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert coordinator.burst_until is None
+    assert coordinator.update_interval == timedelta(seconds=20)
+
+
+async def test_burst_sampling_fleet_cap(
+    hass: HomeAssistant, chargers: FakeChargers
+) -> None:
+    entries = [
+        await async_setup_charger(hass, f"sn{index}")
+        for index in range(BURST_MAX_CHARGERS + 1)
+    ]
+    await hass.services.async_call(
+        DOMAIN,
+        "burst_sampling",
+        {"config_entry_id": [entry.entry_id for entry in entries[:-1]]},
+        blocking=True,
+    )
+    with pytest.raises(ServiceValidationError, match="At most"):
+        await hass.services.async_call(
+            DOMAIN,
+            "burst_sampling",
+            {"config_entry_id": entries[-1].entry_id},
+            blocking=True,
+        )
+    assert entries[-1].runtime_data.coordinator.burst_until is None
+
+    # The chargers already bursting can be extended
+    await hass.services.async_call(
+        DOMAIN,
+        "burst_sampling",
+        {"config_entry_id": entries[0].entry_id},
+        blocking=True,
+    )
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import pytest
+from homeassistant.core import HomeAssistant
+from syrupy.assertion import SnapshotAssertion
+
+from custom_components.ecovolter.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+from .common import FakeChargers, async_setup_charger
+
+
+@pytest.fixture(autouse=True)
+def verify_cleanup():
+    """Setting up the entry loads translations, see test_config_flow."""
+    yield
+
+
+async def test_diagnostics(
+    hass: HomeAssistant, chargers: FakeChargers, snapshot: SnapshotAssertion
+) -> None:
+    entry = await async_setup_charger(
+        hass, supply_group="garage", supply_limit=25, request_timeout=10
+    )
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, "base_uri": "http://192.168.1.20"}
+    )
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics == snapshot
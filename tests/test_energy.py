@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from custom_components.ecovolter.energy import EnergyIntegrator, sample_power_kw
+
+
+def test_sample_power_prefers_phases() -> None:
+    status = {
+        "actualPower": 11.0,
+        "currentL1": 16.0,
+        "currentL2": 16.0,
+        "currentL3": 16.0,
+        "voltageL1": 230.0,
+        "voltageL2": 230.0,
+        "voltageL3": 230.0,
+    }
+    assert sample_power_kw(status) == pytest.approx(11.04)
+
+    del status["voltageL3"]
+    assert sample_power_kw(status) == 11.0
+    assert sample_power_kw({}) is None
+
+
+def test_trapezoid_and_gaps() -> None:
+    integrator = EnergyIntegrator(max_gap=60)
+
+    assert integrator.add_sample(0, 0.0) == 0.0  # anchor only
+    integrator.add_sample(30, 6.0)  # 0.5 * 6 kW * 30 s
+    integrator.add_sample(60, 6.0)  # 6 kW * 30 s
+    assert integrator.total_kwh == pytest.approx((90 + 180) / 3600)
+
+    # Gap longer than max_gap is not bridged, only re-anchored
+    integrator.add_sample(600, 6.0)
+    assert integrator.total_kwh == pytest.approx(270 / 3600)
+    assert integrator.skipped_seconds == 540
+
+    # Missing sample breaks the segment
+    integrator.add_sample(610, None)
+    assert integrator.add_sample(620, 6.0) == 0.0
+
+
+def test_batch_matches_incremental() -> None:
+    ts = [0, 5, 10, 15, 200, 205, 210]
+    power = [1.0, 2.0, 3.0, 2.5, 7.0, float("nan"), 4.0]
+
+    batch = EnergyIntegrator(max_gap=60)
+    batch.add_samples(ts[:3], power[:3])
+    batch.add_samples(ts[3:], power[3:])
+
+    single = EnergyIntegrator(max_gap=60)
+    for t, p in zip(ts, power, strict=True):
+        single.add_sample(t, None if math.isnan(p) else p)
+
+    assert batch.total_kwh == pytest.approx(single.total_kwh)
+    assert batch.skipped_seconds == single.skipped_seconds
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_incremental_with_gaps_and_missing(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    ts = np.cumsum(rng.choice([0.0, 5.0, 10.0, 90.0, 300.0], 200))
+    power = rng.uniform(0, 11, 200)
+    power[rng.random(200) < 0.2] = np.nan
+
+    batch = EnergyIntegrator(max_gap=60)
+    for start in range(0, 200, 17):
+        batch.add_samples(ts[start : start + 17], power[start : start + 17])
+
+    single = EnergyIntegrator(max_gap=60)
+    for t, p in zip(ts, power, strict=True):
+        single.add_sample(float(t), None if math.isnan(p) else float(p))
+
+    assert batch.total_kwh == pytest.approx(single.total_kwh)
+    assert batch.skipped_seconds == single.skipped_seconds
+
+
+def test_restore_is_added() -> None:
+    integrator = EnergyIntegrator()
+    integrator.add_sample(0, 3.6)
+    integrator.add_sample(10, 3.6)
+    integrator.restore(5.0)
+    assert integrator.total_kwh == pytest.approx(5.01)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from custom_components.ecovolter.const import (
+    EVENT_BOOST_FINISHED,
+    EVENT_CHARGING_STARTED,
+    EVENT_THERMAL_LIMIT_ACTIVE,
+    EVENT_THERMAL_LIMIT_CLEARED,
+    EVENT_VEHICLE_CONNECTED,
+)
+from custom_components.ecovolter.events import status_events
+
+IDLE = {
+    "isVehicleConnected": False,
+    "isCharging": False,
+    "isBoostModeActive": False,
+    "temperatureCurrentLimit": 16,
+}
+
+
+def test_no_change_no_events() -> None:
+    assert status_events(IDLE, dict(IDLE), 16) == []
+
+
+def test_transitions() -> None:
+    connected = {**IDLE, "isVehicleConnected": True}
+    charging = {
+        **connected,
+        "isCharging": True,
+        "isBoostModeActive": True,
+        "actualPower": 11.0,
+        "chargedEnergy": 0.0,
+        "chargingTime": 0,
+    }
+
+    assert status_events(IDLE, connected, 16) == [(EVENT_VEHICLE_CONNECTED, {})]
+    assert status_events(connected, charging, 16) == [
+        (
+            EVENT_CHARGING_STARTED,
+            {"actualPower": 11.0, "chargedEnergy": 0.0, "chargingTime": 0},
+        )
+    ]
+    boost_done = {**charging, "isBoostModeActive": False, "chargedEnergy": 2.5}
+    assert status_events(charging, boost_done, 16) == [
+        (EVENT_BOOST_FINISHED, {"chargedEnergy": 2.5})
+    ]
+
+
+def test_thermal_limit() -> None:
+    hot = {**IDLE, "temperatureCurrentLimit": 10, "temperatures": {"internal": 70}}
+
+    assert status_events(IDLE, hot, 16) == [
+        (EVENT_THERMAL_LIMIT_ACTIVE, {"limit": 10.0, "temperatures": {"internal": 70}})
+    ]
+    assert status_events(hot, IDLE, 16) == [(EVENT_THERMAL_LIMIT_CLEARED, {})]
+    # A missing key is not a transition
+    assert status_events(hot, {"isCharging": False}, 16) == []
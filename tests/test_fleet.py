@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.ecovolter.const import DATA_FLEET, DOMAIN
+from custom_components.ecovolter.fleet import (
+    ChargerDemand,
+    SupplyGroup,
+    allocate_currents,
+    supply_cap,
+)
+
+from .common import FakeChargers, async_setup_charger
+
+THREE = (True, True, True)
+L1 = (True, False, False)
+L2 = (False, True, False)
+
+
+def _demand(
+    entry_id: str,
+    max_current: float = 32,
+    phases: tuple[bool, bool, bool] = THREE,
+    priority: int = 0,
+) -> ChargerDemand:
+    return ChargerDemand(entry_id, priority, phases, max_current)
+
+
+def test_fair_share() -> None:
+    allocation = allocate_currents([_demand("a"), _demand("b"), _demand("c")], 40)
+
+    assert allocation == {"a": 13, "b": 13, "c": 13}
+
+
+def test_capped_charger_leaves_rest_to_others() -> None:
+    allocation = allocate_currents([_demand("a", max_current=8), _demand("b")], 40)
+
+    assert allocation == {"a": 8, "b": 32}
+
+
+def test_priority_served_first() -> None:
+    allocation = allocate_currents(
+        [_demand("low"), _demand("high", max_current=16, priority=1)], 25
+    )
+
+    assert allocation == {"high": 16, "low": 9}
+
+
+def test_pause_below_minimum() -> None:
+    allocation = allocate_currents([_demand("a"), _demand("b"), _demand("c")], 16)
+
+    assert allocation == {"a": 8, "b": 8, "c": None}
+
+
+def test_single_phase_chargers_use_their_phase() -> None:
+    allocation = allocate_currents(
+        [_demand("a", phases=L1), _demand("b", phases=L2), _demand("c")], 20
+    )
+
+    # The 3-phase charger is limited by the phases it shares with a and b
+    assert allocation == {"a": 10, "b": 10, "c": 10}
+    assert allocate_currents(
+        [_demand("a", phases=L1), _demand("b", phases=L1)], 20
+    ) == {
+        "a": 10,
+        "b": 10,
+    }
+
+
+@pytest.fixture(autouse=True)
+def verify_cleanup():
+    """Setting up the entries loads translations, see test_config_flow."""
+    yield
+
+
+async def _setup_group(hass: HomeAssistant, **options: Any) -> SupplyGroup:
+    for serial in ("a", "b"):
+        await async_setup_charger(
+            hass, serial, supply_group="garage", supply_limit=10, **options
+        )
+    return hass.data[DATA_FLEET]["garage"]
+
+
+async def _set_connected(
+    hass: HomeAssistant, chargers: FakeChargers, serial: str, connected: bool
+) -> None:
+    chargers[serial].sections["/status"]["isVehicleConnected"] = connected
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.data["serial_number"] == serial:
+            await entry.runtime_data.coordinator.async_refresh()
+
+
+async def test_group_pauses_and_resumes(
+    hass: HomeAssistant, chargers: FakeChargers
+) -> None:
+    group = await _setup_group(hass)
+    await group.async_allocate()
+    assert chargers["a"].writes[-1] == {"targetCurrent": 10}
+    assert chargers["b"].writes[-1] == {"isChargingEnable": False}
+    assert group.caps == {
+        entry.entry_id: cap
+        for entry, cap in zip(hass.config_entries.async_entries(DOMAIN), (10, 0))
+    }
+
+    await _set_connected(hass, chargers, "a", False)
+    await group.async_allocate()
+    assert chargers["b"].writes[-1] == {"isChargingEnable": True, "targetCurrent": 6}
+
+
+async def test_group_lowers_without_rate_limit(
+    hass: HomeAssistant, chargers: FakeChargers
+) -> None:
+    group = await _setup_group(hass)
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        entry.runtime_data.client.governor._budget._tokens = 0.0
+
+    # Both are decreases, sent although no write is left in the budget
+    await asyncio.wait_for(group.async_allocate(), 1)
+    assert chargers["a"].writes[-1] == {"targetCurrent": 10}
+    assert chargers["b"].writes[-1] == {"isChargingEnable": False}
+
+
+async def test_group_skips_unloaded_member(
+    hass: HomeAssistant, chargers: FakeChargers
+) -> None:
+    group = await _setup_group(hass)
+    entry_b = hass.config_entries.async_entries(DOMAIN)[1]
+    await hass.config_entries.async_unload(entry_b.entry_id)
+
+    await group._async_write(entry_b.entry_id, {"isChargingEnable": False}, True)
+    assert chargers["b"].writes == []
+
+
+async def test_group_does_not_resume_charger_switched_by_user(
+    hass: HomeAssistant, chargers: FakeChargers
+) -> None:
+    group = await _setup_group(hass)
+    await group.async_allocate()
+    assert chargers["b"].writes[-1] == {"isChargingEnable": False}
+
+    # Switched off by the user while paused: sent again, and a decision
+    entry_b = hass.config_entries.async_entries(DOMAIN)[1]
+    await entry_b.runtime_data.client.async_set_settings(
+        {"isChargingEnable": False}, user=True
+    )
+    await _set_connected(hass, chargers, "a", False)
+    await group.async_allocate()
+    assert chargers["b"].writes == [{"isChargingEnable": False}] * 2
+
+
+async def test_surplus_charger_only_capped(
+    hass: HomeAssistant, chargers: FakeChargers
+) -> None:
+    hass.states.async_set("sensor.grid_export", "unknown")  # controller idle
+    group = await _setup_group(hass, surplus_entity="sensor.grid_export")
+    entry_a = hass.config_entries.async_entries(DOMAIN)[0]
+    await _set_connected(hass, chargers, "b", False)
+    chargers["a"].writes.clear()
+
+    # The surplus controller set a lower current: the group leaves it alone
+    chargers["a"].sections["/settings"]["targetCurrent"] = 8
+    await entry_a.runtime_data.coordinator.async_refresh()
+    await group.async_allocate()
+    assert chargers["a"].writes == []
+    assert supply_cap(hass, entry_a) == 10
+
+    # Above the cap it is lowered
+    chargers["a"].sections["/settings"]["targetCurrent"] = 16
+    await entry_a.runtime_data.coordinator.async_refresh()
+    await group.async_allocate()
+    assert chargers["a"].writes == [{"targetCurrent": 10}]
+
+    # A surplus for more than the cap is only used up to the cap
+    chargers["a"].sections["/settings"]["targetCurrent"] = 6
+    await entry_a.runtime_data.coordinator.async_refresh()
+    hass.states.async_set("sensor.grid_export", "20000")
+    await hass.async_block_till_done()
+    await asyncio.sleep(0.01)  # the control loop is a background task
+    assert chargers["a"].writes[-1] == {
+        "isThreePhaseModeEnable": True,
+        "targetCurrent": 10,
+    }
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from custom_components.ecovolter.api import EcovolterApiClient
+from custom_components.ecovolter.governor import WriteBudget
+
+
+def test_write_budget() -> None:
+    budget = WriteBudget(burst=2, refill_seconds=60)
+    budget._updated = 0.0
+
+    assert budget.try_acquire(0.0)
+    assert budget.try_acquire(1.0)
+    assert not budget.try_acquire(2.0)
+    assert budget.retry_after(31.0) == pytest.approx(29.0)
+    assert budget.try_acquire(61.0)
+    assert not budget.try_acquire(62.0)
+
+    # A forced take goes into debt, bounded by one burst
+    for _ in range(5):
+        budget.take(62.0)
+    assert budget.retry_after(62.0) == pytest.approx(180.0, abs=2)
+
+
+async def test_noop_writes_are_dropped() -> None:
+    client = EcovolterApiClient("abc", "abc", None, AsyncMock())
+    with patch.object(
+        client, "_api_wrapper", return_value={"targetCurrent": 16}
+    ) as api:
+        await client.async_get_settings()
+        assert not await client.async_set_settings({"targetCurrent": 16})
+        assert await client.async_set_settings({"targetCurrent": 10, "boostTime": 0})
+        assert not await client.async_set_settings({"targetCurrent": 10})
+
+    patches = [
+        call.kwargs["data"]
+        for call in api.call_args_list
+        if call.kwargs["method"] == "patch"
+    ]
+    assert len(patches) == 1
+    assert patches[0]["targetCurrent"] == 10
+    assert client.governor.dropped == 2
+
+
+async def test_user_writes_are_not_dropped() -> None:
+    client = EcovolterApiClient("abc", "abc", None, AsyncMock())
+    with patch.object(
+        client, "_api_wrapper", return_value={"targetCurrent": 16}
+    ) as api:
+        await client.async_get_settings()
+        # Changed on the charger since, so the cached value is stale
+        assert await client.async_set_settings({"targetCurrent": 16}, user=True)
+
+    (patch_call,) = [
+        call for call in api.call_args_list if call.kwargs["method"] == "patch"
+    ]
+    assert patch_call.kwargs["data"]["targetCurrent"] == 16
+    assert client.governor.dropped == 0
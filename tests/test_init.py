@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from .common import FakeChargers, async_setup_charger
+
+
+@pytest.fixture(autouse=True)
+def verify_cleanup():
+    """Setting up the entry loads translations, see test_config_flow."""
+    yield
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"update_interval": 60, "max_concurrent_requests": 1, "request_timeout": 5},
+        {"update_interval": 60, "statistics_mode": ""},  # same as unset
+    ],
+)
+async def test_options_applied_without_reload(
+    hass: HomeAssistant, chargers: FakeChargers, options: dict[str, Any]
+) -> None:
+    entry = await async_setup_charger(hass)
+    runtime = entry.runtime_data
+
+    with patch.object(hass.config_entries, "async_reload") as reload:
+        hass.config_entries.async_update_entry(entry, options=options)
+        await hass.async_block_till_done()
+
+    reload.assert_not_called()
+    assert entry.runtime_data is runtime
+    assert runtime.applied_options == options
+    assert runtime.coordinator.update_interval == timedelta(seconds=60)
+    if "max_concurrent_requests" in options:
+        assert runtime.client.scheduler.max_concurrency == 1
+        assert runtime.client.timeout == 5
+
+
+@pytest.mark.parametrize(
+    ("data", "options"),
+    [
+        ({"base_uri": "http://charger.local"}, {}),  # connection details
+        ({}, {"telemetry": True}),  # an option in RELOAD_OPTIONS
+        ({}, {"supply_limit": 16}),  # joining a supply group
+    ],
+)
+async def test_options_reload(
+    hass: HomeAssistant,
+    chargers: FakeChargers,
+    data: dict[str, Any],
+    options: dict[str, Any],
+) -> None:
+    entry = await async_setup_charger(hass)
+
+    with patch.object(hass.config_entries, "async_reload") as reload:
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, **data}, options=options
+        )
+        await hass.async_block_till_done()
+
+    reload.assert_called_once_with(entry.entry_id)
+    assert entry.runtime_data.applied_options == {}
+
+
+async def test_remove_entry_deletes_stored_data(
+    hass: HomeAssistant,
+    chargers: FakeChargers,
+    hass_storage: dict[str, Any],
+    tmp_path: Path,
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    entry = await async_setup_charger(hass, statistics_mode=True)
+    keys = {f"ecovolter.{entry.entry_id}.{name}" for name in ("sessions", "statistics")}
+    rollup = tmp_path / ".storage" / f"ecovolter.{entry.entry_id}.rollup"
+
+    # Unloading stores the sessions, the running hour and its rollup
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert keys <= set(hass_storage)
+    assert rollup.exists()
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not keys & set(hass_storage)
+    assert not rollup.exists()
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from pytest_homeassistant_custom_component.common import (  # type: ignore[import-untyped]
+    MockConfigEntry,
+)
+
+from custom_components.ecovolter.api import (
+    EcovolterApiClient,
+    EcovolterApiClientAuthenticationError,
+    EcovolterApiClientCommunicationError,
+)
+from custom_components.ecovolter.const import DATA_IO_WORKER, DOMAIN
+from custom_components.ecovolter.io_worker import IoWorker
+
+
+@pytest.fixture(autouse=True)
+def verify_cleanup():
+    """Closing the worker session starts a resolver thread, see test_config_flow."""
+    yield
+
+
+@pytest.fixture
+async def worker(hass: HomeAssistant):
+    worker = IoWorker(hass)
+    worker.start()
+    yield worker
+    await worker.async_stop()
+
+
+async def test_runs_on_worker_thread(hass: HomeAssistant, worker: IoWorker) -> None:
+    async def _thread() -> int:
+        await asyncio.sleep(0)
+        return threading.get_ident()
+
+    assert await worker.async_run(_thread()) != threading.get_ident()
+
+    async def _fail() -> None:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await worker.async_run(_fail())
+
+
+async def test_results_delivered_in_batches(
+    hass: HomeAssistant, worker: IoWorker
+) -> None:
+    release = threading.Event()
+
+    async def _wait(i: int) -> int:
+        await asyncio.get_running_loop().run_in_executor(None, release.wait)
+        return i
+
+    tasks = [asyncio.ensure_future(worker.async_run(_wait(i))) for i in range(20)]
+    await asyncio.sleep(0.05)
+    release.set()
+    assert await asyncio.gather(*tasks) == list(range(20))
+    assert worker.requests == 20
+    assert worker.batches < 20
+
+
+async def test_cancel_reaches_worker(hass: HomeAssistant, worker: IoWorker) -> None:
+    cancelled = threading.Event()
+
+    async def _forever() -> None:
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    task = asyncio.ensure_future(worker.async_run(_forever()))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert await hass.async_add_executor_job(cancelled.wait, 5)
+
+
+async def test_client_requests_on_worker(
+    hass: HomeAssistant, worker: IoWorker, socket_enabled
+) -> None:
+    threads: list[int] = []
+
+    async def _status(request: web.Request) -> web.Response:
+        assert request.headers["Authorization"].startswith("HmacSHA256 ")
+        assert request.headers["User-Agent"] == SERVER_SOFTWARE
+        return web.json_response({"actualPower": 11.0})
+
+    async def _settings(_request: web.Request) -> web.Response:
+        return web.Response(status=401)
+
+    app = web.Application()
+    app.router.add_get("/api/v1/charger/status", _status)
+    app.router.add_get("/api/v1/charger/settings", _settings)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    try:
+        client = EcovolterApiClient(
+            "abc",
+            "secret",
+            str(server.make_url("")),
+            session=None,  # type: ignore[arg-type]
+            worker=worker,
+        )
+        original = client._async_request
+
+        async def _request(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return await original(*args, **kwargs)
+
+        client._async_request = _request  # type: ignore[method-assign]
+        assert await client.async_get_status() == {"actualPower": 11.0}
+        assert threads and threads[0] != threading.get_ident()
+        assert worker.session is not None
+
+        # Errors raised on the worker reach the caller as usual
+        with pytest.raises(EcovolterApiClientAuthenticationError):
+            await client.async_get_settings()
+    finally:
+        await server.close()
+
+
+async def test_shared_by_entries(hass: HomeAssistant, socket_enabled) -> None:
+    async def _status(_request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "actualPower": 0.0,
+                "isVehicleConnected": False,
+                "temperatures": {
+                    "internal": 30,
+                    "adapter": [25, 26, 27],
+                    "relay": [40, 41],
+                },
+            }
+        )
+
+    async def _section(_request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/charger/status", _status)
+    app.router.add_get("/api/v1/charger/{section}", _section)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    try:
+        entries = [
+            MockConfigEntry(
+                domain=DOMAIN,
+                data={
+                    "serial_number": serial,
+                    "secret_key": "abc",
+                    "base_uri": str(server.make_url("")),
+                },
+                options={"io_worker": True},
+            )
+            for serial in ("abc", "def")
+        ]
+        for entry in entries:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        worker = hass.data[DATA_IO_WORKER]
+        assert all(entry.runtime_data.client.worker is worker for entry in entries)
+        assert worker.users == {entry.entry_id for entry in entries}
+        assert worker.requests >= 2 * len(entries)
+
+        assert await hass.config_entries.async_unload(entries[0].entry_id)
+        assert hass.data[DATA_IO_WORKER] is worker
+        assert await hass.config_entries.async_unload(entries[1].entry_id)
+        await hass.async_block_till_done()
+        assert DATA_IO_WORKER not in hass.data
+        assert worker.session is None
+    finally:
+        await server.close()
+
+
+async def test_stop_is_idempotent(hass: HomeAssistant) -> None:
+    worker = IoWorker(hass)
+    worker.start()
+    await worker.async_stop()
+    await worker.async_stop()
+
+    async def _noop() -> None:
+        return None
+
+    with pytest.raises(EcovolterApiClientCommunicationError):
+        await worker.async_run(_noop())
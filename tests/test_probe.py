@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from custom_components.ecovolter.const import (
+    MAX_REQUEST_TIMEOUT_SECONDS,
+    MIN_REQUEST_TIMEOUT_SECONDS,
+    MIN_UPDATE_INTERVAL_SECONDS,
+)
+from custom_components.ecovolter.probe import probe_result
+
+FAST = {name: [0.05, 0.06, 0.05] for name in ("status", "settings", "diagnostics")}
+
+
+def test_fast_charger_gets_the_minimums() -> None:
+    result = probe_result(FAST, [0.1, 0.12, 0.1])
+    assert result.min_interval == MIN_UPDATE_INTERVAL_SECONDS
+    assert result.timeout == MIN_REQUEST_TIMEOUT_SECONDS
+    assert result.rtt["status"] == 0.05
+    assert result.placeholders()["poll"] == "100"
+
+
+def test_slow_jittery_charger() -> None:
+    rtts = {**FAST, "type": [0.5, 2.5, 0.6]}
+    result = probe_result(rtts, [1.0, 3.0, 1.0, 1.0])
+    # Busy for the median plus three standard deviations, at most half the time
+    assert result.poll == 1.0
+    assert round(result.jitter, 3) == 0.866
+    assert result.min_interval == 8  # ceil(2 * (1.0 + 3 * 0.866))
+    assert result.timeout == 13  # ceil(5 * 2.5)
+
+
+def test_timeout_is_capped() -> None:
+    result = probe_result({"status": [30.0]}, [30.0])
+    assert result.timeout == MAX_REQUEST_TIMEOUT_SECONDS
+    assert result.min_interval == 60
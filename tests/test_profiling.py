@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+import pstats
+
+import pytest
+
+from custom_components.ecovolter.profiling import RefreshProfile
+
+
+def profiled_work() -> int:
+    return sum(range(100))
+
+
+def other_work() -> int:
+    return sum(range(100))
+
+
+def _functions(profile: RefreshProfile) -> set[str]:
+    profile.profile.create_stats()
+    return set(pstats.Stats(profile.profile).get_stats_profile().func_profiles)
+
+
+async def test_records_only_the_profiled_coroutine() -> None:
+    profile = RefreshProfile()
+    release = asyncio.Event()
+
+    async def refresh() -> int:
+        await release.wait()  # other tasks run meanwhile
+        return profiled_work()
+
+    async def other() -> None:
+        other_work()
+        release.set()
+
+    task = asyncio.create_task(other())
+    assert await profile.async_run(refresh()) == 4950
+    await task
+
+    functions = _functions(profile)
+    assert "profiled_work" in functions
+    assert "other_work" not in functions
+
+
+async def test_errors_are_passed_on() -> None:
+    profile = RefreshProfile()
+
+    async def failing() -> None:
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await profile.async_run(failing())
+
+    # The profiler was switched off
+    with profile.running():
+        profiled_work()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.ecovolter.api import EcovolterApiClientCommunicationError
+from custom_components.ecovolter.replay import (
+    EcovolterReplayClient,
+    Recording,
+    load_recording,
+)
+from custom_components.ecovolter.telemetry import TELEMETRY_SUFFIX
+
+RECORDS = [
+    {
+        "ts": 0,
+        "status": {"actualPower": 0.0},
+        "settings": {"targetCurrent": 16, "maxCurrent": 16},
+        "diagnostics": {"totalChargedEnergy": 1.0},
+        "type_info": {"chargerType": 0},
+    },
+    {"ts": 5, "settings": {"targetCurrent": 10, "maxCurrent": 16}},  # status preempted
+    {"ts": 10, "status": {"actualPower": 7.0}},
+]
+
+
+async def test_replays_polls_in_order() -> None:
+    client = EcovolterReplayClient("abc", Recording.from_records(RECORDS), AsyncMock())
+
+    assert await client.async_get_type() == {"chargerType": 0}
+    assert await client.async_get_status() == {"actualPower": 0.0}
+    assert (await client.async_get_settings())["targetCurrent"] == 16
+    assert await client.async_get_status() == {"actualPower": 7.0}
+    assert (await client.async_get_settings())["targetCurrent"] == 10
+    assert await client.async_get_diagnostics() == {"totalChargedEnergy": 1.0}
+
+    # Writes stay on top of the recorded settings
+    assert await client.async_set_settings({"maxCurrent": 12}, user=True)
+    assert (await client.async_get_settings())["maxCurrent"] == 12
+
+    assert client.remaining == 0
+    with pytest.raises(EcovolterApiClientCommunicationError):
+        await client.async_get_status()
+
+
+def test_load_recording_streams_files(tmp_path: Path) -> None:
+    for name, part in (("b", RECORDS[2:]), ("a", RECORDS[:2])):
+        with gzip.open(tmp_path / f"{name}{TELEMETRY_SUFFIX}", "wb") as file:
+            file.writelines(json.dumps(record).encode() + b"\n" for record in part)
+
+    stream = load_recording(tmp_path)
+    assert next(stream) == RECORDS[0]
+    # The next file is only opened once the first one is read
+    (tmp_path / f"b{TELEMETRY_SUFFIX}").unlink()
+    assert next(stream) == RECORDS[1]
+    with pytest.raises(FileNotFoundError):
+        next(stream)
+
+    recording = Recording.from_records(
+        load_recording(tmp_path / f"a{TELEMETRY_SUFFIX}")
+    )
+    assert [ts for ts, *_ in recording.polls] == [0.0]
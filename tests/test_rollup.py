@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.ecovolter.rollup import (
+    ROLLUP_HEADER,
+    ROLLUP_RECORD,
+    HourlyRollup,
+    RollupFile,
+    RollupStore,
+)
+
+HOUR = 3600
+FIRST = 480000  # hours since the epoch
+
+
+def test_file_offsets_and_gaps(tmp_path: Path) -> None:
+    file = RollupFile(tmp_path / "rollup")
+    file.write(HourlyRollup(FIRST, 1, 2.5, 11.0, 0.75))
+    file.write(HourlyRollup(FIRST + 3, 0, 1.0, 3.7, 0.25))  # two hours missing
+    file.write(HourlyRollup(FIRST + 3, 0, 1.5, 3.7, 0.5))  # replaced
+    file.write(HourlyRollup(FIRST - 1))  # before the first hour
+
+    assert file.path.stat().st_size == ROLLUP_HEADER.size + 4 * ROLLUP_RECORD.size
+    assert [r.hour for r in file.read_range(0, FIRST + 100)] == [FIRST, FIRST + 3]
+    (rollup,) = file.read_range(FIRST + 1, FIRST + 4)
+    assert (rollup.hour, rollup.energy_kwh, rollup.cost) == (FIRST + 3, 1.5, 0.5)
+    assert file.read_range(FIRST + 4, FIRST + 10) == []
+    assert file.read_last() == rollup
+    assert RollupFile(tmp_path / "missing").read_range(0, FIRST) == []
+
+
+async def test_store_rolls_up_hours(hass: HomeAssistant, tmp_path: Path) -> None:
+    store = RollupStore(hass, "test")
+    store.file = RollupFile(tmp_path / "rollup")
+    start = FIRST * HOUR
+    store.add_sample(start + 10, 11.0, 0.5, 0.1, True)
+    store.add_sample(start + 20, 7.0, 0.5, 0.1, False)
+    store.add_sample(start + HOUR + 5, 3.0, 0.25, 0.05, True)  # next hour
+    await hass.async_block_till_done()
+
+    hours = await store.async_range(start, start + 2 * HOUR)
+    assert [(r.hour, r.sessions, r.energy_kwh, r.max_power_kw) for r in hours] == [
+        (FIRST, 1, 1.0, 11.0),
+        (FIRST + 1, 1, 0.25, 3.0),  # the running hour, not written yet
+    ]
+    # Hours are returned if they start in the range
+    assert len(await store.async_range(start + 1, start + 2 * HOUR)) == 1
+
+    await store.async_flush()
+    last = store.file.read_last()
+    assert last is not None
+    assert (last.hour, last.energy_kwh) == (FIRST + 1, 0.25)
+    assert last.cost == pytest.approx(0.05)  # stored as float32
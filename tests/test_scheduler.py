@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.ecovolter.scheduler import (
+    LANE_BACKGROUND,
+    LANE_SETTINGS,
+    LANE_STATUS,
+    LANE_WRITE,
+    RequestPreemptedError,
+    RequestScheduler,
+)
+
+
+async def _request(
+    scheduler: RequestScheduler,
+    lane: int,
+    order: list[int],
+    release: asyncio.Event,
+    preemptible: bool = True,
+) -> None:
+    async with scheduler.async_slot(lane, preemptible=preemptible):
+        order.append(lane)
+        await release.wait()
+
+
+async def test_lanes_by_priority() -> None:
+    scheduler = RequestScheduler(1)
+    order: list[int] = []
+    release = asyncio.Event()
+
+    running = asyncio.create_task(_request(scheduler, LANE_STATUS, order, release))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.create_task(_request(scheduler, lane, order, release, False))
+        for lane in (LANE_BACKGROUND, LANE_SETTINGS, LANE_STATUS)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(running, *queued)
+
+    assert order == [LANE_STATUS, LANE_STATUS, LANE_SETTINGS, LANE_BACKGROUND]
+
+
+async def test_write_preempts_queued_polls() -> None:
+    scheduler = RequestScheduler(1)
+    order: list[int] = []
+    release = asyncio.Event()
+
+    running = asyncio.create_task(_request(scheduler, LANE_BACKGROUND, order, release))
+    await asyncio.sleep(0)
+    poll = asyncio.create_task(_request(scheduler, LANE_SETTINGS, order, release))
+    await asyncio.sleep(0)
+    write = asyncio.create_task(
+        _request(scheduler, LANE_WRITE, order, release, preemptible=False)
+    )
+    await asyncio.sleep(0)
+
+    with pytest.raises(RequestPreemptedError):
+        await poll
+    release.set()
+    await asyncio.gather(running, write)
+
+    assert order == [LANE_BACKGROUND, LANE_WRITE]
+
+
+async def test_concurrency_limit() -> None:
+    scheduler = RequestScheduler(2)
+    order: list[int] = []
+    release = asyncio.Event()
+
+    tasks = [
+        asyncio.create_task(_request(scheduler, LANE_WRITE, order, release, False))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    assert len(order) == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert len(order) == 3
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import pstats
+from pathlib import Path
+from typing import Any
+
+import pytest
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.ecovolter.const import DOMAIN
+from custom_components.ecovolter.session import ChargingSession
+
+from .common import FakeChargers, async_setup_charger
+
+
+@pytest.fixture(autouse=True)
+def verify_cleanup():
+    """Setting up the entry loads translations, see test_config_flow."""
+    yield
+
+
+async def test_export_sessions(
+    hass: HomeAssistant, chargers: FakeChargers, tmp_path: Path
+) -> None:
+    entry = await async_setup_charger(hass)
+    tracker = entry.runtime_data.coordinator.sessions
+    tracker.sessions = [
+        ChargingSession(start=1000.0, end=2000.0, energy_kwh=5.0),
+        ChargingSession(start=3000.0, end=4000.0, energy_kwh=2.5),
+    ]
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+
+    path = tmp_path / "sessions.csv"
+    response = await hass.services.async_call(
+        DOMAIN,
+        "export_sessions",
+        {"filename": str(path), "start": "1970-01-01T00:40:00+00:00"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {"path": str(path), "sessions": 1}
+    with path.open(encoding="utf-8") as file:
+        (row,) = csv.DictReader(file)
+    assert (row["serial_number"], row["energy_kwh"]) == ("abc", "2.5")
+
+    # Without a file name, the export goes to the configuration directory
+    hass.config.config_dir = str(tmp_path / "config")
+    Path(hass.config.config_dir).mkdir()
+    response = await hass.services.async_call(
+        DOMAIN,
+        "export_sessions",
+        {"format": "jsonl"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response is not None
+    assert response["sessions"] == 2
+    exported = Path(str(response["path"]))
+    assert exported.parent == tmp_path / "config"
+    lines = exported.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["start"] for line in lines] == [
+        "1970-01-01T00:16:40+00:00",
+        "1970-01-01T00:50:00+00:00",
+    ]
+
+
+async def test_export_sessions_path_not_allowed(
+    hass: HomeAssistant, chargers: FakeChargers, tmp_path: Path
+) -> None:
+    await async_setup_charger(hass)
+    with pytest.raises(ServiceValidationError, match="allowlist_external_dirs"):
+        await hass.services.async_call(
+            DOMAIN,
+            "export_sessions",
+            {"filename": str(tmp_path / "sessions.csv")},
+            blocking=True,
+        )
+
+
+async def test_apply_settings_current_limits(
+    hass: HomeAssistant, chargers: FakeChargers
+) -> None:
+    chargers["a"].sections["/type"]["chargerType"] = 0  # 3x16 A
+    entry_a = await async_setup_charger(hass, "a")
+    entry_b = await async_setup_charger(hass, "b")
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "apply_settings",
+        {"settings": {"targetCurrent": 20}},
+        blocking=True,
+        return_response=True,
+    )
+    assert response is not None
+    results: Any = response["results"]
+    assert results[entry_a.entry_id] == {
+        "serial_number": "a",
+        "written": False,
+        "error": "targetCurrent 20 A is above the limit of this charger (16 A)",
+    }
+    assert results[entry_b.entry_id]["written"]
+    assert chargers["a"].writes == []
+    assert chargers["b"].writes == [{"targetCurrent": 20}]
+
+    # A maxCurrent written along limits the other currents
+    response = await hass.services.async_call(
+        DOMAIN,
+        "apply_settings",
+        {
+            "settings": {"maxCurrent": 10, "boostCurrent": 12},
+            "config_entry_id": entry_b.entry_id,
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert response is not None
+    results = response["results"]
+    assert results[entry_b.entry_id]["error"] == (
+        "boostCurrent 12 A is above the limit of this charger (10 A)"
+    )
+
+
+@pytest.mark.parametrize(
+    "settings", [{"boostTime": 86400}, {"kwhPrice": 1000}, {"maxCurrent": 33}]
+)
+async def test_apply_settings_out_of_range(
+    hass: HomeAssistant, chargers: FakeChargers, settings: dict[str, Any]
+) -> None:
+    await async_setup_charger(hass)
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN, "apply_settings", {"settings": settings}, blocking=True
+        )
+    assert chargers["abc"].writes == []
+
+
+async def test_profile(
+    hass: HomeAssistant, chargers: FakeChargers, tmp_path: Path
+) -> None:
+    entry = await async_setup_charger(hass)
+    hass.config.config_dir = str(tmp_path)
+
+    async def _refresh() -> None:
+        await asyncio.sleep(0)
+        await entry.runtime_data.coordinator.async_refresh()
+
+    # The default file goes to the configuration directory
+    task = hass.async_create_task(_refresh())
+    response = await hass.services.async_call(
+        DOMAIN, "profile", {"duration": 1}, blocking=True, return_response=True
+    )
+    await task
+    assert response is not None
+    path = Path(str(response["path"]))
+    assert path.parent == tmp_path
+    functions = pstats.Stats(str(path)).get_stats_profile().func_profiles
+    assert "_async_poll" in functions
+    assert entry.runtime_data.coordinator.profile is None
+
+    with pytest.raises(ServiceValidationError, match="allowlist_external_dirs"):
+        await hass.services.async_call(
+            DOMAIN,
+            "profile",
+            {"duration": 1, "filename": "/elsewhere/profile.prof"},
+            blocking=True,
+        )
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.ecovolter.const import ENERGY_MAX_GAP_SECONDS
+from custom_components.ecovolter.session import ChargingSessionTracker
+
+CHARGING = {"isVehicleConnected": True, "currentL1": 16.0, "currentL2": 10.0}
+ENABLED = {"isChargingEnable": True}
+UNPLUGGED = {"isVehicleConnected": False}
+
+
+async def test_session_aggregates(hass: HomeAssistant) -> None:
+    tracker = ChargingSessionTracker(hass, "test")
+    tracker.add_sample(100, CHARGING, ENABLED, 11.0, 0.0, 0.0)
+    tracker.add_sample(
+        110, {**CHARGING, "isBoostModeActive": True}, ENABLED, 7.0, 0.5, 0.1
+    )
+    tracker.add_sample(130, CHARGING, ENABLED, None, 0.25, 0.05)
+    assert tracker.active is not None
+    assert tracker.sessions == []
+
+    tracker.add_sample(140, UNPLUGGED, ENABLED, 0.0, 0.0, 0.0)
+    assert tracker.active is None
+    (session,) = tracker.sessions
+    assert (session.start, session.end) == (100, 140)
+    assert session.energy_kwh == 0.75
+    assert session.cost == pytest.approx(0.15)
+    assert session.peak_power_kw == 11.0
+    assert session.charging_seconds == 30
+    assert session.average_current == 16.0
+    assert session.boost_seconds == 20
+
+    # Samples outside a session do not start one
+    tracker.add_sample(150, CHARGING, {"isChargingEnable": False}, 0.0, 0.0, 0.0)
+    assert tracker.active is None
+
+
+async def test_iter_range(hass: HomeAssistant) -> None:
+    tracker = ChargingSessionTracker(hass, "test")
+    for start in (100, 200, 300):
+        tracker.add_sample(start, CHARGING, ENABLED, 11.0, 0.0, 0.0)
+        tracker.add_sample(start + 50, UNPLUGGED, ENABLED, 0.0, 0.0, 0.0)
+
+    assert [s.start for s in tracker.iter_range()] == [100, 200, 300]
+    assert [s.start for s in tracker.iter_range(150, 300)] == [200]
+    assert [s.start for s in tracker.iter_range(end=100)] == []
+
+
+async def test_restored_session_ends_at_last_sample(hass: HomeAssistant) -> None:
+    tracker = ChargingSessionTracker(hass, "test")
+    tracker.add_sample(100, CHARGING, ENABLED, 11.0, 0.0, 0.0)
+    tracker.add_sample(110, CHARGING, ENABLED, 11.0, 0.5, 0.0)
+    await tracker.async_flush()
+
+    # Unplugged while Home Assistant was down
+    restored = ChargingSessionTracker(hass, "test")
+    await restored.async_load()
+    assert restored.active is not None
+    restored.add_sample(5000, UNPLUGGED, ENABLED, 0.0, 0.0, 0.0)
+    (session,) = restored.sessions
+    assert (session.start, session.end, session.energy_kwh) == (100, 110, 0.5)
+
+
+async def test_restored_session_split_after_gap(hass: HomeAssistant) -> None:
+    tracker = ChargingSessionTracker(hass, "test")
+    tracker.add_sample(100, CHARGING, ENABLED, 11.0, 0.0, 0.0)
+    await tracker.async_flush()
+
+    restored = ChargingSessionTracker(hass, "test")
+    await restored.async_load()
+    restored.add_sample(110, CHARGING, ENABLED, 11.0, 0.5, 0.0)
+    assert restored.active is not None
+    assert restored.active.start == 100  # continued
+
+    restored._last_sample = None  # restarted again
+    later = 110 + ENERGY_MAX_GAP_SECONDS + 1
+    restored.add_sample(later, CHARGING, ENABLED, 11.0, 0.0, 0.0)
+    (session,) = restored.sessions
+    assert (session.start, session.end) == (100, 110)
+    assert restored.active is not None
+    assert restored.active.start == later
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from enum import IntEnum
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+
+from custom_components.ecovolter.const import STATISTICS_PENDING_MAX_HOURS
+from custom_components.ecovolter.statistics import HOUR_SECONDS, StatisticsAggregator
+
+START = 480000 * HOUR_SECONDS
+
+
+async def test_imports_finished_hours(hass: HomeAssistant) -> None:
+    hass.config.components.add("recorder")
+    aggregator = StatisticsAggregator(hass, "test", "SN 1")
+    with patch(
+        "custom_components.ecovolter.statistics.async_add_external_statistics"
+    ) as add:
+        aggregator.add_sample(START + 10, {"actualPower": 4.0}, 1.0)
+        aggregator.add_sample(START + 20, {"actualPower": 8.0, "currentL1": 16}, 2.0)
+        add.assert_not_called()
+        aggregator.add_sample(START + HOUR_SECONDS, {"actualPower": 1.0}, 3.0)
+
+    imported = {call.args[1]["statistic_id"]: call.args[2] for call in add.mock_calls}
+    assert set(imported) == {
+        "ecovolter:sn_1_actual_power",
+        "ecovolter:sn_1_current_l1",
+        "ecovolter:sn_1_integrated_energy",
+    }
+    (power,) = imported["ecovolter:sn_1_actual_power"]
+    assert (power["mean"], power["min"], power["max"]) == (6.0, 4.0, 8.0)
+    assert power["start"].timestamp() == START
+    (energy,) = imported["ecovolter:sn_1_integrated_energy"]
+    assert energy["sum"] == 2.0
+
+
+async def test_pending_hours_capped_without_recorder(hass: HomeAssistant) -> None:
+    aggregator = StatisticsAggregator(hass, "test", "abc")
+    for hour in range(STATISTICS_PENDING_MAX_HOURS + 10):
+        aggregator.add_sample(START + hour * HOUR_SECONDS, {"actualPower": 1.0}, 0.0)
+
+    pending = aggregator._pending
+    assert len(pending) == STATISTICS_PENDING_MAX_HOURS
+    assert (
+        pending[-1].start == START + (STATISTICS_PENDING_MAX_HOURS + 8) * HOUR_SECONDS
+    )
+
+
+@pytest.mark.parametrize(("later", "restored"), [(600, True), (HOUR_SECONDS, False)])
+async def test_running_hour_restored(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, later: int, restored: bool
+) -> None:
+    freezer.move_to("2025-01-06T10:10:00+00:00")
+    now = 1736158200
+    aggregator = StatisticsAggregator(hass, "test", "abc")
+    aggregator.add_sample(now, {"actualPower": 4.0}, 1.0)
+    await aggregator.async_flush()
+
+    freezer.tick(later)
+    aggregator = StatisticsAggregator(hass, "test", "abc")
+    await aggregator.async_load()
+    if restored:
+        aggregator.add_sample(now + later, {"actualPower": 8.0}, 2.0)
+        assert aggregator._hour is not None
+        assert aggregator._hour.buckets["actualPower"].mean == 6.0
+        assert aggregator._pending == []
+    else:
+        # The hour ended while stopped, it waits for the import
+        assert aggregator._hour is None
+        (hour,) = aggregator._pending
+        assert hour.buckets["actualPower"].count == 1
+
+
+class _MeanType(IntEnum):
+    NONE = 0
+    ARITHMETIC = 1
+
+
+@pytest.mark.parametrize("mean_type", [None, _MeanType])
+async def test_metadata_mean(hass: HomeAssistant, mean_type: Any) -> None:
+    hass.config.components.add("recorder")
+    aggregator = StatisticsAggregator(hass, "test", "abc")
+    with (
+        patch("custom_components.ecovolter.statistics.StatisticMeanType", mean_type),
+        patch(
+            "custom_components.ecovolter.statistics.async_add_external_statistics"
+        ) as add,
+    ):
+        aggregator.add_sample(START, {"actualPower": 4.0}, 1.0)
+        aggregator.add_sample(START + HOUR_SECONDS, {"actualPower": 1.0}, 3.0)
+
+    metadata = {call.args[1]["statistic_id"]: call.args[1] for call in add.mock_calls}
+    power = metadata["ecovolter:abc_actual_power"]
+    energy = metadata["ecovolter:abc_integrated_energy"]
+    assert (power["has_sum"], energy["has_sum"]) == (False, True)
+    if mean_type is None:  # before Home Assistant 2025.4
+        assert (power["has_mean"], energy["has_mean"]) == (True, False)
+    else:
+        assert "has_mean" not in power
+        assert (power["mean_type"], energy["mean_type"]) == (
+            _MeanType.ARITHMETIC,
+            _MeanType.NONE,
+        )
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from time import monotonic
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.ecovolter.api import EcovolterApiClientCommunicationError
+from custom_components.ecovolter.surplus import SurplusController, surplus_setpoint
+
+from .common import FakeChargers, async_setup_charger
+
+
+def test_setpoint_follows_surplus() -> None:
+    assert surplus_setpoint(2300, False, 16) == (10, False)
+    assert surplus_setpoint(1000, False, 16) == (None, False)
+    assert surplus_setpoint(20000, True, 16) == (16, True)
+
+
+def test_phase_switch_hysteresis() -> None:
+    # 3 x 230 V x 6 A = 4140 W is the three-phase minimum
+    assert surplus_setpoint(4300, False, 16) == (16, False)
+    assert surplus_setpoint(4700, False, 16) == (6, True)
+    assert surplus_setpoint(4300, True, 16) == (6, True)
+    assert surplus_setpoint(4000, True, 16) == (16, False)
+
+
+@pytest.fixture(autouse=True)
+def verify_cleanup():
+    """Setting up the entry loads translations, see test_config_flow."""
+    yield
+
+
+async def test_phase_dwell_pauses_instead_of_importing(
+    hass: HomeAssistant, chargers: FakeChargers
+) -> None:
+    # Three-phase at 6 A (4140 W) while only 3000 W are available
+    status = chargers["abc"].sections["/status"]
+    status.update(currentL1=6.0, currentL2=6.0, currentL3=6.0)
+    status.update(voltageL1=230.0, voltageL2=230.0, voltageL3=230.0)
+    chargers["abc"].sections["/settings"].update(
+        isThreePhaseModeEnable=True, targetCurrent=6
+    )
+    hass.states.async_set("sensor.grid_export", "-1140")
+    with patch("custom_components.ecovolter.SurplusController.async_start"):
+        entry = await async_setup_charger(hass, surplus_entity="sensor.grid_export")
+    controller = SurplusController(hass, entry)
+
+    # Single phase would fit, but the last phase switch was just now
+    controller._last_phase_switch = monotonic()
+    assert controller._evaluate() == {"isChargingEnable": False}
+
+    # Held as it is while pausing is not allowed yet either
+    controller._last_pause_change = monotonic()
+    assert controller._evaluate() is None
+
+    # Once the phase may switch, it does
+    controller._last_phase_switch = float("-inf")
+    assert controller._evaluate() == {
+        "isThreePhaseModeEnable": False,
+        "targetCurrent": 13,
+    }
+
+
+async def test_setpoint_capped_by_max_current(
+    hass: HomeAssistant, chargers: FakeChargers
+) -> None:
+    chargers["abc"].sections["/settings"].update(maxCurrent=10)
+    hass.states.async_set("sensor.grid_export", "20000")
+    with patch("custom_components.ecovolter.SurplusController.async_start"):
+        entry = await async_setup_charger(hass, surplus_entity="sensor.grid_export")
+    controller = SurplusController(hass, entry)
+
+    data = controller._evaluate()
+    assert data is not None
+    assert data["targetCurrent"] == 10
+
+
+async def test_only_sent_writes_count(
+    hass: HomeAssistant, chargers: FakeChargers
+) -> None:
+    with patch("custom_components.ecovolter.SurplusController.async_start"):
+        entry = await async_setup_charger(hass, surplus_entity="sensor.grid_export")
+    controller = SurplusController(hass, entry)
+    tokens = controller._budget._tokens
+
+    # Already set, so the governor drops the write
+    await controller._async_write({"isChargingEnable": True})
+    assert controller._budget._tokens == tokens
+    assert controller._last_pause_change == float("-inf")
+
+    # A failed write does not count either
+    chargers["abc"].error = EcovolterApiClientCommunicationError("down")
+    await controller._async_write({"isChargingEnable": False})
+    assert controller._budget._tokens == tokens
+    assert controller._last_pause_change == float("-inf")
+
+    chargers["abc"].error = None
+    await controller._async_write({"isChargingEnable": False})
+    assert controller._budget._tokens < tokens
+    assert controller._last_pause_change > float("-inf")
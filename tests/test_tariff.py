@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.ecovolter.tariff import (
+    InvalidTariffSchedule,
+    TariffEngine,
+    TariffSchedule,
+)
+
+SCHEDULE = """
+07:00=0.30
+22:00=0.12
+sat-sun 00:00=0.10
+"""
+
+
+def _ts(year: int, month: int, day: int, hour: int, minute: int) -> float:
+    return datetime(
+        year, month, day, hour, minute, tzinfo=dt_util.DEFAULT_TIME_ZONE
+    ).timestamp()
+
+
+def test_schedule_lookup() -> None:
+    schedule = TariffSchedule(SCHEDULE)
+
+    assert schedule.price_at(_ts(2025, 1, 6, 8, 0)) == 0.30  # Monday
+    assert schedule.price_at(_ts(2025, 1, 6, 23, 0)) == 0.12
+    assert schedule.price_at(_ts(2025, 1, 7, 6, 59)) == 0.12  # wraps from Monday night
+    assert schedule.price_at(_ts(2025, 1, 11, 12, 0)) == 0.10  # Saturday override
+    # Monday early morning continues the Sunday price (wraps around the week)
+    assert schedule.price_at(_ts(2025, 1, 13, 3, 0)) == 0.10
+    # Served from the cached interval
+    assert schedule.price_at(_ts(2025, 1, 13, 6, 0)) == 0.10
+    assert schedule.price_at(_ts(2025, 1, 13, 7, 0)) == 0.30
+
+
+def test_schedule_cache_across_dst() -> None:
+    schedule = TariffSchedule("07:00=0.30; 22:00=0.12")
+    default = dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(ZoneInfo("Europe/Prague"))
+    try:
+        # The night the clocks go forward, 30 March 2025 at 02:00
+        assert schedule.price_at(_ts(2025, 3, 29, 23, 0)) == 0.12
+        assert schedule.price_at(_ts(2025, 3, 30, 6, 30)) == 0.12
+        # 07:00 summer time is an hour before 07:00 winter time
+        assert schedule.price_at(_ts(2025, 3, 30, 7, 30)) == 0.30
+    finally:
+        dt_util.set_default_time_zone(default)
+
+
+@pytest.mark.parametrize("text", ["", "7=0.3", "25:00=0.1", "xyz 07:00=0.1"])
+def test_invalid_schedule(text: str) -> None:
+    with pytest.raises(InvalidTariffSchedule):
+        TariffSchedule(text)
+
+
+async def test_engine_precedence(hass: HomeAssistant) -> None:
+    settings = {"kwhPrice": 0.5}
+    ts = _ts(2025, 1, 6, 8, 0)
+
+    assert TariffEngine(hass).add_energy(ts, 2.0, settings) == pytest.approx(1.0)
+
+    engine = TariffEngine(hass, schedule=SCHEDULE, price_entity_id="sensor.price")
+    assert engine.add_energy(ts, 2.0, settings) == pytest.approx(0.6)
+
+    hass.states.async_set("sensor.price", "0.2")
+    assert engine.add_energy(ts, 2.0, settings) == pytest.approx(0.4)
+    assert engine.total_cost == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize(
+    ("unit", "price"),
+    [
+        (None, 200.0),
+        ("CZK/kWh", 200.0),
+        ("EUR/MWh", 0.2),
+        ("€ / Wh", 200000.0),
+        ("EUR", 0.3),  # not per energy: the schedule applies
+        ("W", 0.3),
+    ],
+)
+async def test_engine_price_unit(
+    hass: HomeAssistant, unit: str | None, price: float
+) -> None:
+    engine = TariffEngine(hass, schedule=SCHEDULE, price_entity_id="sensor.price")
+    hass.states.async_set(
+        "sensor.price", "200", {"unit_of_measurement": unit} if unit else {}
+    )
+    assert engine.price_at(_ts(2025, 1, 6, 8, 0), {}) == pytest.approx(price)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from custom_components.ecovolter.telemetry import (
+    TELEMETRY_SUFFIX,
+    TelemetryFiles,
+    read_telemetry,
+)
+
+
+def _batch(start: int, count: int) -> list[bytes]:
+    return [b'{"ts":%d,"status":{"actualPower":11.0}}\n' % ts for ts in range(start, start + count)]
+
+
+def test_batches_read_back_as_one_stream(tmp_path: Path) -> None:
+    files = TelemetryFiles(tmp_path)
+    files.append(_batch(0, 3), 1000.0)
+    files.append(_batch(3, 2), 1010.0)
+
+    (path,) = files.files()
+    assert [record["ts"] for record in read_telemetry(path)] == [0, 1, 2, 3, 4]
+
+    # A restart continues the newest file
+    TelemetryFiles(tmp_path).append(_batch(5, 1), 1020.0)
+    assert files.files() == [path]
+    assert len(list(read_telemetry(path))) == 6
+
+
+def test_rotation_by_age_size_and_count(tmp_path: Path) -> None:
+    files = TelemetryFiles(tmp_path, max_bytes=10**6, max_age=60, max_files=3)
+    files.append(_batch(0, 1), 1000.0)
+    files.append(_batch(1, 1), 1059.0)
+    files.append(_batch(2, 1), 1060.0)  # age
+    assert len(files.files()) == 2
+
+    files.max_bytes = 1
+    files.append(_batch(3, 1), 1061.0)  # size
+    files.append(_batch(4, 1), 1062.0)
+    paths = files.files()
+    assert [path.name for path in paths] == [
+        "0000001060.jsonl.gz",
+        "0000001061.jsonl.gz",
+        "0000001062.jsonl.gz",
+    ]
+    assert [record["ts"] for path in paths for record in read_telemetry(path)] == [2, 3, 4]
+
+
+def test_other_files_left_alone(tmp_path: Path) -> None:
+    other = tmp_path / f"backup{TELEMETRY_SUFFIX}"
+    other.write_bytes(b"")
+    files = TelemetryFiles(tmp_path, max_age=60, max_files=1)
+    files.append(_batch(0, 1), 1000.0)
+    files.append(_batch(1, 1), 2000.0)
+
+    assert [path.name for path in files.files()] == ["0000002000.jsonl.gz"]
+    assert other.exists()
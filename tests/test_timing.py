@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from custom_components.ecovolter.timing import EntityTimings
+
+
+def test_report_ranks_slowest_entities() -> None:
+    timings = EntityTimings()
+    for _ in range(2):
+        timings.refreshes += 1
+        timings.add("sensor.fast", "sensor", 0.0001)
+        timings.add("sensor.slow", "sensor", 0.002)
+        timings.add("switch.medium", "switch", 0.001)
+
+    report = timings.report(size=2)
+    assert report["refreshes"] == 2
+    assert report["ms_per_refresh"] == 3.1
+    assert report["platforms_ms_per_refresh"] == {"sensor": 2.1, "switch": 1.0}
+    assert [entity["entity_id"] for entity in report["slowest_entities"]] == [
+        "sensor.slow",
+        "switch.medium",
+    ]
+    assert report["slowest_entities"][0] == {
+        "entity_id": "sensor.slow",
+        "platform": "sensor",
+        "updates": 2,
+        "mean_ms": 2.0,
+        "max_ms": 2.0,
+    }
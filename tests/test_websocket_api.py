@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (  # type: ignore[import-untyped]
+    MockConfigEntry,
+)
+
+from custom_components.ecovolter.const import DOMAIN
+
+STATUS = {
+    "actualPower": 11.0,
+    "currentL1": 16.0,
+    "currentL2": 16.0,
+    "currentL3": 16.0,
+    "voltageL1": 230.0,
+    "voltageL2": 231.0,
+    "voltageL3": 229.0,
+    "temperatureCurrentLimit": 32,
+    "adapterMaxCurrent": 32,
+    "isCharging": True,
+    "isVehicleConnected": True,
+    "temperatures": {"internal": 30, "adapter": [25, 26, 27], "relay": [40, 41]},
+}
+SETTINGS = {"targetCurrent": 16, "isChargingEnable": True}
+
+
+@pytest.fixture(autouse=True)
+def verify_cleanup():
+    """Setting up the entry loads translations, see test_config_flow."""
+    yield
+
+
+async def test_samples_and_subscription(hass: HomeAssistant, hass_ws_client) -> None:
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={"serial_number": "abc", "secret_key": "abc"}
+    )
+    entry.add_to_hass(hass)
+
+    async def _api(method, path, data=None, headers=None):
+        return {"/status": dict(STATUS), "/settings": SETTINGS}.get(path, {})
+
+    with patch(
+        "custom_components.ecovolter.api.EcovolterApiClient._api_wrapper",
+        side_effect=_api,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        client = await hass_ws_client(hass)
+
+        await client.send_json_auto_id({"type": "ecovolter/samples"})
+        response = await client.receive_json()
+        samples = response["result"][entry.entry_id]["samples"]
+        assert samples["actualPower"] == [11.0]
+        assert samples["currentLimit"] == [16.0]
+
+        await client.send_json_auto_id(
+            {
+                "type": "ecovolter/subscribe_samples",
+                "config_entry_ids": [entry.entry_id],
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        subscription = response["id"]
+        await entry.runtime_data.coordinator.async_refresh()
+        event = (await client.receive_json())["event"]
+        assert event["entry_id"] == entry.entry_id
+        assert len(event["samples"]["ts"]) == 1
+        assert event["samples"]["ts"][0] > samples["ts"][0]
+
+        # Subscribing again does not add unload callbacks to the entry
+        callbacks = len(entry._on_unload)
+        for _ in range(3):
+            await client.send_json_auto_id({"type": "ecovolter/subscribe_samples"})
+            other = (await client.receive_json())["id"]
+            await client.send_json_auto_id(
+                {"type": "unsubscribe_events", "subscription": other}
+            )
+            assert (await client.receive_json())["success"]
+        assert len(entry._on_unload) == callbacks
+
+        # Only the rows of polls since the last push are sent
+        await entry.runtime_data.coordinator.async_refresh()
+        await entry.runtime_data.coordinator.async_refresh()
+        event = (await client.receive_json())["event"]
+        assert len(event["samples"]["ts"]) == 1
+        event = (await client.receive_json())["event"]
+        assert len(event["samples"]["ts"]) == 1
+
+        await client.send_json_auto_id(
+            {"type": "ecovolter/samples", "config_entry_ids": ["missing"]}
+        )
+        assert (await client.receive_json())["error"]["code"] == "not_found"
+
+        # Unloading ends the subscription
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        response = await client.receive_json()
+        assert response["id"] == subscription
+        assert response["error"]["code"] == "not_found"